@@ -3,20 +3,39 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 
+from app import aio, replica
+from app.commands import register_commands
+from app.compression import init_compression
 from app.config import Config
-from app.firebase import init_firebase
+from app.firebase import get_db, init_firebase
+from app.firestore_ops import init_firestore_accounting
+from app.json_provider import get_json_provider_class
+from app.log import init_request_logging
+from app.metrics import init_metrics
 from app.api.courses import courses_bp
 from app.api.modules import modules_bp
 from app.api.enrollments import enrollments_bp
 from app.api.progress import progress_bp
+from app.api.progress_async import progress_async_bp
+from app.api.students import students_bp
 from app.api.users import users_bp
 from app.api.assignments import assignments_bp
+from app.api.export import export_bp
+from app.api.imports import imports_bp
 
 
 def create_app() -> Flask:
     """Application factory for the Kampus backend."""
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = get_json_provider_class()(app)
+    # Registered first so its after_request hook runs last
+    init_request_logging(app)
+    init_metrics(app)
+    init_firestore_accounting(app)
+    if Config.ASYNC_MODE:
+        # Run async views on one long-lived loop instead of a loop per request
+        app.async_to_sync = aio.async_to_sync
     
     # Disable strict_slashes to prevent redirects that break CORS preflight
     app.url_map.strict_slashes = False
@@ -41,12 +60,6 @@ def create_app() -> Flask:
             response.headers.add("Access-Control-Max-Age", "3600")
             return response
     
-    # Add request logging
-    @app.before_request
-    def log_request():
-        """Log incoming requests."""
-        print(f"[{request.method}] {request.path} - Origin: {request.headers.get('Origin', 'None')}")
-    
     @app.after_request
     def add_cors_headers(response):
         """Ensure CORS headers are always present and override any conflicting values."""
@@ -59,15 +72,26 @@ def create_app() -> Flask:
 
     # Initialize Firebase Admin SDK
     init_firebase()
+    if Config.CATALOG_REPLICA:
+        replica.warm_up(get_db(), Config.CATALOG_REPLICA_WARMUP_TIMEOUT)
 
     # Register API blueprints (must be after CORS initialization)
     # All routes are prefixed with /api to match frontend expectations
     app.register_blueprint(courses_bp, url_prefix="/api/courses")
     app.register_blueprint(modules_bp, url_prefix="/api/modules")
     app.register_blueprint(enrollments_bp, url_prefix="/api/enrollments")
-    app.register_blueprint(progress_bp, url_prefix="/api/progress")
+    if Config.ASYNC_MODE:
+        app.register_blueprint(progress_async_bp, url_prefix="/api/progress")
+    else:
+        app.register_blueprint(progress_bp, url_prefix="/api/progress")
     app.register_blueprint(users_bp, url_prefix="/api/users")
+    app.register_blueprint(students_bp, url_prefix="/api/students")
     app.register_blueprint(assignments_bp, url_prefix="/api/assignments")
+    app.register_blueprint(export_bp, url_prefix="/api/export")
+    app.register_blueprint(imports_bp, url_prefix="/api/import")
+
+    register_commands(app)
+    init_compression(app)
 
     @app.get("/")
     def api_index():
@@ -84,12 +108,17 @@ def create_app() -> Flask:
                         "DELETE /api/users/<user_id>",
                         "/api/users/stats",
                     ],
+                    "students": [
+                        "/api/students/<student_id>/dashboard",
+                    ],
                     "courses": [
                         "/api/courses",
                         "/api/courses?teacher_id=<teacher_id>",
+                        "/api/courses/<course_id>/roster",
                     ],
                     "modules": [
                         "/api/modules/courses/<course_id>/modules",
+                        "/api/modules/cache",
                     ],
                     "enrollments": [
                         "/api/enrollments?student_id=<user_id>",
@@ -100,9 +129,11 @@ def create_app() -> Flask:
                         "POST /api/progress/access",
                         "POST /api/progress",
                         "POST /api/progress/complete",
+                        "POST /api/progress/batch",
                         "/api/progress/module/<user_id>/<course_id>/<module_id>",
                         "/api/progress/course/<user_id>/<course_id>",
                         "/api/progress/course/<user_id>/<course_id>/summary",
+                        "/api/progress/buffer",
                     ],
                     "assignments": [
                         "/api/assignments",
@@ -112,13 +143,36 @@ def create_app() -> Flask:
                         "PUT /api/assignments/<assignment_id>",
                         "DELETE /api/assignments/<assignment_id>",
                     ],
+                    "export": [
+                        "/api/export/<users|enrollments|user_progress|course_progress>.ndjson",
+                    ],
+                    "import": [
+                        "POST /api/import/<users|courses|course_modules|assignments>",
+                    ],
                 },
             }
         )
 
     @app.get("/health")
     def health_check():
-        """Health check endpoint."""
+        """Health check endpoint.
+
+        With ``CATALOG_REPLICA`` the process only reports healthy once its
+        catalog replica has loaded, so load balancers hold traffic back
+        while it warms up or while a dead listener is being restarted.
+        """
+        if Config.CATALOG_REPLICA:
+            listener_down = any(item.listener_down for item in replica.replicas.values())
+            # Restarts listeners whose stream has died, even when the load
+            # balancer sends this process no other traffic.
+            replica.ensure_replicas(get_db())
+            status = replica.replica_status()
+            if listener_down:
+                message = "Catalog replica listener is down, restarting it"
+                return jsonify({"status": "listener_down", "message": message, "replicas": status}), 503
+            if not all(item["ready"] for item in status.values()):
+                return jsonify({"status": "warming_up", "message": "Catalog replica is loading", "replicas": status}), 503
+            return jsonify({"status": "ok", "message": "API is running", "replicas": status}), 200
         return jsonify({"status": "ok", "message": "API is running"}), 200
 
     return app
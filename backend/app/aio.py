@@ -0,0 +1,70 @@
+"""Shared event loop for async views.
+
+Flask's default ``async_to_sync`` starts a fresh event loop for every async
+view call, which would also mean a fresh Firestore AsyncClient (and gRPC
+channel) per request. With ``Config.ASYNC_MODE`` the app instead hands async
+views to one long-lived loop per process, running on a background thread:
+request threads only wait for their coroutine, while all in-flight Firestore
+RPCs of the worker are multiplexed on that loop and its single AsyncClient.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+from typing import Any, Awaitable, Callable
+
+_loop_lock = threading.Lock()
+_loop: dict = {"pid": None, "loop": None}
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background loop, starting it (after any fork) if needed."""
+    with _loop_lock:
+        if _loop["pid"] != os.getpid():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-views", daemon=True).start()
+            _loop["loop"] = loop
+            _loop["pid"] = os.getpid()
+        return _loop["loop"]
+
+
+def run_sync(awaitable: Awaitable, timeout: float | None = None) -> Any:
+    """Run ``awaitable`` on the background loop and block until it finishes.
+
+    The caller's context variables (Flask's request and app context) are
+    carried over to the task.
+    """
+    loop = get_event_loop()
+    context = contextvars.copy_context()
+    result: concurrent.futures.Future = concurrent.futures.Future()
+
+    def start() -> None:
+        task = loop.create_task(awaitable, context=context)
+        task.add_done_callback(lambda done: _copy_result(done, result))
+
+    loop.call_soon_threadsafe(start)
+    return result.result(timeout)
+
+
+def _copy_result(task: asyncio.Task, result: concurrent.futures.Future) -> None:
+    if task.cancelled():
+        result.cancel()
+    elif task.exception() is not None:
+        result.set_exception(task.exception())
+    else:
+        result.set_result(task.result())
+
+
+def async_to_sync(func: Callable[..., Awaitable]) -> Callable[..., Any]:
+    """Drop-in replacement for ``Flask.async_to_sync`` using the shared loop."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return run_sync(func(*args, **kwargs))
+
+    return wrapper
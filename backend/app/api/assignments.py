@@ -1,40 +1,55 @@
 """Assignments API blueprint."""
 
+import logging
+
 from flask import Blueprint, jsonify, request
 
+from app.http_cache import conditional_json, set_cache_policy
+from app.pagination import page_response, parse_page_args
+from app.projection import resolve_fields
 from app.services.assignments_service import AssignmentsService
 
+logger = logging.getLogger(__name__)
+
 assignments_bp = Blueprint("assignments", __name__)
+set_cache_policy(assignments_bp, "private, max-age=30, must-revalidate")
 
 
 @assignments_bp.get("/")
 def list_assignments():
     """Return all assignments or filter by course_id."""
     course_id = request.args.get("course_id")
+    try:
+        limit, start_after, explicit = parse_page_args(request.args)
+        fields = resolve_fields("assignments", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
     service = AssignmentsService()
 
     try:
-        assignments = service.list_assignments(course_id)
-        return jsonify(assignments), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error fetching assignments: {exc}")
-        import traceback
-        traceback.print_exc()
+        assignments, next_after = service.list_assignments(course_id, limit, start_after, fields)
+        return page_response(assignments, next_after, explicit)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching assignments")
         return jsonify({"error": "Failed to fetch assignments"}), 500
 
 
 @assignments_bp.get("/<assignment_id>")
 def get_assignment(assignment_id: str):
     """Get an assignment by ID."""
+    try:
+        fields = resolve_fields("assignments", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
     service = AssignmentsService()
 
     try:
-        assignment = service.get_assignment(assignment_id)
+        assignment = service.get_assignment(assignment_id, fields)
         if not assignment:
             return jsonify({"error": "Assignment not found"}), 404
-        return jsonify(assignment), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error fetching assignment: {exc}")
+        return conditional_json(assignment)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching assignment")
         return jsonify({"error": "Failed to fetch assignment"}), 500
 
 
@@ -52,10 +67,8 @@ def create_assignment():
         return jsonify({"message": "Assignment created successfully", "id": assignment_id}), 201
     except ValueError as err:
         return jsonify({"error": str(err)}), 400
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error creating assignment: {exc}")
-        import traceback
-        traceback.print_exc()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error creating assignment")
         return jsonify({"error": "Failed to create assignment"}), 500
 
 
@@ -73,8 +86,8 @@ def update_assignment(assignment_id: str):
         return jsonify({"message": "Assignment updated successfully", "id": assignment_id}), 200
     except ValueError as err:
         return jsonify({"error": str(err)}), 404
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error updating assignment: {exc}")
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error updating assignment")
         return jsonify({"error": "Failed to update assignment"}), 500
 
 
@@ -88,7 +101,7 @@ def delete_assignment(assignment_id: str):
         return jsonify({"message": "Assignment deleted successfully", "id": assignment_id}), 200
     except ValueError as err:
         return jsonify({"error": str(err)}), 404
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error deleting assignment: {exc}")
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error deleting assignment")
         return jsonify({"error": "Failed to delete assignment"}), 500
 
@@ -1,119 +1,193 @@
 """Courses API blueprint."""
 
-from flask import Blueprint, jsonify, request
+import csv
+import io
+import logging
 
-from app.firebase import get_db
+from flask import Blueprint, Response, json, jsonify, request, stream_with_context
+
+from app.config import Config
+from app.http_cache import conditional_json, set_cache_policy
+from app.pagination import page_response, parse_page_args
+from app.projection import resolve_fields
+from app.services.courses_service import CoursesService
+from app.services.dashboard_service import DashboardService
+from app.services.enrollments_service import BULK_STATUSES, EnrollmentsService
+
+logger = logging.getLogger(__name__)
 
 courses_bp = Blueprint("courses", __name__)
+set_cache_policy(courses_bp, "public, max-age=60, must-revalidate")
 
 
 @courses_bp.get("/")
 def list_courses():
     """Return all courses or filter by teacher_id."""
-    print("DEBUG: list_courses endpoint called")
     teacher_id = request.args.get("teacher_id")
-    db = get_db()
+    try:
+        limit, start_after, explicit = parse_page_args(request.args)
+        fields = resolve_fields("courses", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    service = CoursesService()
 
     try:
-        if teacher_id:
-            query = (
-                db.collection("courses")
-                .where("teacher_id", "==", teacher_id)
-                .stream()
-            )
-        else:
-            query = db.collection("courses").stream()
-
-        courses = []
-        for doc in query:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            courses.append(data)
-
-        print(f"DEBUG: Returning {len(courses)} courses")
-        return jsonify(courses), 200
+        courses, next_after = service.list_courses(teacher_id, limit, start_after, fields)
+        return page_response(courses, next_after, explicit)
     except Exception as exc:  # pylint: disable=broad-except
-        print(f"ERROR: Error fetching courses: {exc}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching courses")
         return jsonify({"error": "Failed to fetch courses", "details": str(exc)}), 500
 
 
 @courses_bp.get("/<course_id>")
 def get_course(course_id: str):
     """Get a course by ID."""
-    db = get_db()
+    try:
+        fields = resolve_fields("courses", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    service = CoursesService()
 
     try:
-        doc = db.collection("courses").document(course_id).get()
-        if not doc.exists:
+        course = service.get_course(course_id, fields)
+        if not course:
             return jsonify({"error": "Course not found"}), 404
-        
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return jsonify(data), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error fetching course:", exc)
+        return conditional_json(course)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching course")
         return jsonify({"error": "Failed to fetch course"}), 500
 
 
+@courses_bp.get("/<course_id>/roster")
+def get_course_roster(course_id: str):
+    """Enrolled students with display profile and progress summary.
+
+    Supports ``limit``/``cursor`` pagination and ``sort=progress`` or
+    ``sort=-progress``.
+    """
+    sort = request.args.get("sort") or None
+    service = DashboardService()
+    try:
+        limit, start_after, explicit = parse_page_args(request.args)
+        roster, next_after = service.get_course_roster(course_id, limit, start_after, sort)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching roster for course %s", course_id)
+        return jsonify({"error": "Failed to fetch course roster"}), 500
+
+    response = page_response(roster, next_after, explicit)
+    # Student profiles and progress: never let shared caches keep them
+    # (the blueprint's public policy is for the catalog).
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 @courses_bp.put("/<course_id>")
 def update_course(course_id: str):
     """Update a course by ID."""
-    db = get_db()
     payload = request.get_json(force=True)
+    service = CoursesService()
 
     try:
-        doc_ref = db.collection("courses").document(course_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
+        course = service.update_course(course_id, payload)
+        if course is None:
             return jsonify({"error": "Course not found"}), 404
-
-        # Update the course with new data
-        update_data = {
-            **payload,
-            "updated_at": request.environ.get("_firestore_timestamp") or None
-        }
-        # Remove id from update data if present (it's in the document ID)
-        update_data.pop("id", None)
-        
-        # Use server timestamp for updated_at
-        from datetime import datetime
-        update_data["updated_at"] = datetime.utcnow().isoformat() + "Z"
-        
-        doc_ref.update(update_data)
-        
-        # Return updated course
-        updated_doc = doc_ref.get()
-        data = updated_doc.to_dict()
-        data["id"] = updated_doc.id
-        return jsonify(data), 200
+        return jsonify(course), 200
     except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error updating course: {exc}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error updating course")
         return jsonify({"error": "Failed to update course", "details": str(exc)}), 500
 
 
 @courses_bp.delete("/<course_id>")
 def delete_course(course_id: str):
     """Delete a course by ID."""
-    db = get_db()
+    service = CoursesService()
 
     try:
-        doc_ref = db.collection("courses").document(course_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
+        if not service.delete_course(course_id):
             return jsonify({"error": "Course not found"}), 404
-
-        # Delete the course
-        doc_ref.delete()
-        
         return jsonify({"message": "Course deleted successfully"}), 200
     except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error deleting course: {exc}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": "Failed to delete course", "details": str(exc)}), 500
\ No newline at end of file
+        logger.exception("Error deleting course")
+        return jsonify({"error": "Failed to delete course", "details": str(exc)}), 500
+
+
+def _read_student_ids() -> list:
+    """Student ids from a JSON array / ``{"student_ids": [...]}`` or a CSV body.
+
+    CSV uploads may carry a header row with a ``student_id`` column;
+    otherwise the first column is used. Raises ValueError on a malformed body.
+    """
+    if request.mimetype in ("text/csv", "application/csv"):
+        text = request.get_data(as_text=True).lstrip("\ufeff")
+        rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+        header = [cell.strip().lower() for cell in rows[0]] if rows else []
+        column = header.index("student_id") if "student_id" in header else None
+        if column is not None:
+            rows = rows[1:]
+        return [row[column or 0] if len(row) > (column or 0) else "" for row in rows]
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("student_ids")
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of student ids, {\"student_ids\": [...]} or a text/csv body")
+    return [item.get("student_id") if isinstance(item, dict) else item for item in payload]
+
+
+@courses_bp.post("/<course_id>/enrollments:bulk")
+def bulk_enroll(course_id: str):
+    """Enroll a cohort of students in a course.
+
+    Responds with per-row results and a summary. Clients that send
+    ``Accept: application/x-ndjson`` get the results streamed instead: one
+    line per row, a ``progress`` line after every chunk and a final
+    ``summary`` line, so large uploads report progress as they are written.
+    """
+    try:
+        student_ids = _read_student_ids()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    if not student_ids:
+        return jsonify({"error": "No student ids provided"}), 400
+    if len(student_ids) > Config.BULK_ENROLL_MAX_ROWS:
+        return jsonify({"error": f"At most {Config.BULK_ENROLL_MAX_ROWS} rows per upload"}), 413
+
+    try:
+        if CoursesService().get_course(course_id, ["title"]) is None:
+            return jsonify({"error": "Course not found"}), 404
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching course %s for bulk enrollment", course_id)
+        return jsonify({"error": "Failed to enroll students"}), 500
+
+    chunks = EnrollmentsService().bulk_enroll(course_id, student_ids)
+    summary = {"course_id": course_id, "total": len(student_ids), **{status: 0 for status in BULK_STATUSES}}
+
+    stream = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+    if stream == "application/x-ndjson":
+
+        def generate():
+            processed = 0
+            try:
+                for results in chunks:
+                    for result in results:
+                        summary[result["status"]] += 1
+                        yield json.dumps({"type": "row", **result}) + "\n"
+                    processed += len(results)
+                    yield json.dumps({"type": "progress", "processed": processed, "total": len(student_ids)}) + "\n"
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Bulk enrollment into %s failed after %d rows", course_id, processed)
+                yield json.dumps({"type": "error", "error": "Failed to enroll students", "processed": processed}) + "\n"
+            yield json.dumps({"type": "summary", **summary}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    try:
+        rows = [result for results in chunks for result in results]
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Bulk enrollment into %s failed", course_id)
+        return jsonify({"error": "Failed to enroll students"}), 500
+    for result in rows:
+        summary[result["status"]] += 1
+    return jsonify({"summary": summary, "results": rows}), 200
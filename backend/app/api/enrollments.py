@@ -1,10 +1,18 @@
 """Enrollments API blueprint."""
 
+import logging
+
 from flask import Blueprint, jsonify, request
 
+from app.http_cache import set_cache_policy
+from app.pagination import page_response, parse_page_args
+from app.projection import resolve_fields
 from app.services.enrollments_service import EnrollmentsService
 
+logger = logging.getLogger(__name__)
+
 enrollments_bp = Blueprint("enrollments", __name__)
+set_cache_policy(enrollments_bp, "private, no-cache")
 
 
 @enrollments_bp.get("/")
@@ -12,22 +20,25 @@ def list_enrollments():
     service = EnrollmentsService()
     student_id = request.args.get("student_id")
     course_id = request.args.get("course_id")
+    try:
+        limit, start_after, explicit = parse_page_args(request.args)
+        fields = resolve_fields("enrollments", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
 
     try:
         if student_id:
-            enrollments = service.list_by_student(student_id)
+            enrollments, next_after = service.list_by_student(student_id, limit, start_after, fields)
         elif course_id:
-            enrollments = service.list_by_course(course_id)
+            enrollments, next_after = service.list_by_course(course_id, limit, start_after, fields)
         else:
             # If no parameters, return empty array instead of error
             # This allows the frontend to work even if no filters are provided
-            return jsonify([]), 200
+            return page_response([], None, explicit)
 
-        return jsonify(enrollments), 200
+        return page_response(enrollments, next_after, explicit)
     except Exception as exc:  # pylint: disable=broad-except
-        print(f"Error fetching enrollments: {exc}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching enrollments")
         return jsonify({"error": "Failed to fetch enrollments", "details": str(exc)}), 500
 
 
@@ -48,6 +59,6 @@ def create_enrollment():
         return jsonify({"id": enrollment_id}), 201
     except ValueError as err:
         return jsonify({"error": str(err)}), 400
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error creating enrollment:", exc)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error creating enrollment")
         return jsonify({"error": "Failed to create enrollment"}), 500
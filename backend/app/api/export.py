@@ -0,0 +1,57 @@
+"""Streaming NDJSON export API blueprint (nightly warehouse pulls)."""
+
+import logging
+
+from flask import Blueprint, Response, json, jsonify, request, stream_with_context
+
+from app.http_cache import set_cache_policy
+from app.pagination import decode_cursor
+from app.projection import resolve_fields
+from app.services.export_service import EXPORTS, ExportService, parse_filters
+
+logger = logging.getLogger(__name__)
+
+export_bp = Blueprint("export", __name__)
+set_cache_policy(export_bp, "no-store")
+
+
+@export_bp.get("/<collection>.ndjson")
+def export_collection(collection: str):
+    """Stream a collection as NDJSON, one document per line, in document-id order.
+
+    Accepts the collection's equality filters (see ``EXPORTS``), ``fields``
+    projection, ``limit`` (maximum rows) and ``after`` (a document id, e.g.
+    the last one received) or ``cursor`` to resume. Only one Firestore page
+    is held in memory at a time.
+    """
+    if collection not in EXPORTS:
+        return jsonify({"error": f"Unknown export '{collection}'", "exports": sorted(EXPORTS)}), 404
+    try:
+        filters = parse_filters(collection, request.args)
+        fields = resolve_fields(collection, request.args.get("fields"))
+        start_after = request.args.get("after") or decode_cursor(request.args.get("cursor"))
+        limit = request.args.get("limit", type=int)
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be positive")
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    rows = ExportService().rows(collection, filters, fields, start_after, limit)
+
+    def generate():
+        last_id = start_after
+        try:
+            for row in rows:
+                last_id = row["id"]
+                yield json.dumps(row) + "\n"
+        except Exception:
+            # Re-raised so the response ends without its final chunk and the
+            # client sees an incomplete transfer; it resumes with after=<last id>.
+            logger.exception("Export of %s failed after id %s", collection, last_id)
+            raise
+
+    response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    response.headers["Content-Disposition"] = f'attachment; filename="{collection}.ndjson"'
+    # Ask reverse proxies not to buffer the stream.
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,69 @@
+"""Bulk import API blueprint."""
+
+import logging
+
+from flask import Blueprint, Response, json, jsonify, request, stream_with_context
+
+from app.importing import SCHEMAS, read_rows
+from app.repositories.import_repository import WRITE_MODES
+from app.services.import_service import ImportService
+
+logger = logging.getLogger(__name__)
+
+imports_bp = Blueprint("imports", __name__)
+
+# Rejected rows listed in a JSON (non-streamed) response.
+MAX_REPORTED_ERRORS = 100
+
+
+@imports_bp.post("/<collection>")
+def import_collection(collection: str):
+    """Import an NDJSON (``application/x-ndjson``) or CSV (``text/csv``) upload.
+
+    The body is read as a stream and written in chunks. Query parameters:
+    ``mode`` (``create``, ``set`` or ``merge``), ``dry_run`` and
+    ``start_line`` to resume an interrupted upload after the ``last_line``
+    it reported. With ``Accept: application/x-ndjson`` a progress line is
+    streamed after every chunk; otherwise the response is the final
+    counters plus the first rejected rows.
+    """
+    if collection not in SCHEMAS:
+        return jsonify({"error": f"Unknown collection '{collection}'", "collections": sorted(SCHEMAS)}), 404
+    if request.mimetype in ("text/csv", "application/csv"):
+        fmt = "csv"
+    elif request.mimetype in ("application/x-ndjson", "application/jsonl", "application/json"):
+        fmt = "ndjson"
+    else:
+        return jsonify({"error": "Send application/x-ndjson or text/csv"}), 415
+    mode = request.args.get("mode", "create")
+    if mode not in WRITE_MODES:
+        return jsonify({"error": f"mode must be one of {', '.join(WRITE_MODES)}"}), 400
+    start_line = request.args.get("start_line", 0, type=int)
+    dry_run = request.args.get("dry_run", "").lower() in ("1", "true")
+
+    progress = ImportService().run(
+        collection, read_rows(collection, request.stream, fmt, start_line), mode, dry_run=dry_run
+    )
+
+    stream = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+    if stream == "application/x-ndjson":
+
+        def generate():
+            try:
+                for stats in progress:
+                    yield json.dumps(stats) + "\n"
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Import into %s failed", collection)
+                yield json.dumps({"error": "Import failed"}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    stats = {"last_line": None}
+    errors = []
+    try:
+        for stats in progress:
+            errors.extend(stats.pop("errors")[: MAX_REPORTED_ERRORS - len(errors)])
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Import into %s failed", collection)
+        return jsonify({"error": "Import failed", "last_line": stats["last_line"]}), 500
+    return jsonify({**stats, "errors": errors}), 200
@@ -1,10 +1,17 @@
 """Modules API blueprint."""
 
+import logging
+
 from flask import Blueprint, jsonify
 
+from app.http_cache import conditional_json, set_cache_policy
+from app.repositories.modules_repository import module_list_cache
 from app.services.modules_service import ModulesService
 
+logger = logging.getLogger(__name__)
+
 modules_bp = Blueprint("modules", __name__)
+set_cache_policy(modules_bp, "public, max-age=60, must-revalidate")
 
 
 @modules_bp.get("/courses/<course_id>/modules")
@@ -12,7 +19,15 @@ def list_modules(course_id: str):
     service = ModulesService()
     try:
         modules = service.list_modules(course_id)
-        return jsonify(modules), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error fetching modules:", exc)
+        return conditional_json(modules)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching modules")
         return jsonify({"error": "Failed to fetch modules"}), 500
+
+
+@modules_bp.get("/cache")
+def get_cache_stats():
+    """Report module-list cache hit/miss counters."""
+    response = jsonify(module_list_cache.stats())
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -1,10 +1,47 @@
 """Progress API blueprint."""
 
+import logging
+
 from flask import Blueprint, jsonify, request
 
-from app.services.progress_service import ProgressService
+from app.config import Config
+from app.http_cache import conditional_json, set_cache_policy
+from app.services.progress_service import ProgressService, get_write_buffer
+
+logger = logging.getLogger(__name__)
 
 progress_bp = Blueprint("progress", __name__)
+set_cache_policy(progress_bp, "private, no-cache")
+
+BATCH_EVENT_TYPES = ("access", "progress", "complete")
+
+
+def _normalize_event(event: dict) -> dict:
+    """Map one batch event (snake_case or camelCase keys) to service format."""
+    event_type = event.get("type") or event.get("event")
+    if event_type not in BATCH_EVENT_TYPES:
+        raise ValueError(f"type must be one of: {', '.join(BATCH_EVENT_TYPES)}")
+
+    # Accept both formats: user_id/course_id/module_id or userId/courseId/moduleId
+    user_id = event.get("user_id") or event.get("userId")
+    course_id = event.get("course_id") or event.get("courseId")
+    module_id = event.get("module_id") or event.get("moduleId")
+    if not all([user_id, course_id, module_id]):
+        raise ValueError("user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required")
+
+    progress_data = event.get("progressData") or event.get("progress_data") or {}
+    if not isinstance(progress_data, dict):
+        raise ValueError("progress_data (or progressData) must be an object")
+
+    return {
+        "type": event_type,
+        "user_id": user_id,
+        "course_id": course_id,
+        "module_id": module_id,
+        "progress_percentage": event.get("progress_percentage") or event.get("progressPercentage"),
+        "progress_data": progress_data,
+        "timestamp": event.get("timestamp"),
+    }
 
 
 @progress_bp.post("/access")
@@ -19,12 +56,14 @@ def save_access():
     if not all([user_id, course_id, module_id]):
         return jsonify({"error": "user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required"}), 400
 
-    service = ProgressService()
+    service = ProgressService(write_buffer=get_write_buffer())
     try:
         service.save_module_access(user_id, course_id, module_id, progress_percentage)
+        if service.write_behind:
+            return jsonify({"message": "Module access queued"}), 202
         return jsonify({"message": "Module access saved"}), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error saving module access:", exc)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error saving module access")
         return jsonify({"error": "Failed to save module access"}), 500
 
 
@@ -40,12 +79,14 @@ def save_progress():
     if not all([user_id, course_id, module_id]):
         return jsonify({"error": "user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required"}), 400
 
-    service = ProgressService()
+    service = ProgressService(write_buffer=get_write_buffer())
     try:
         service.save_module_progress(user_id, course_id, module_id, progress_data)
+        if service.write_behind:
+            return jsonify({"message": "Module progress queued"}), 202
         return jsonify({"message": "Module progress saved"}), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error saving module progress:", exc)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error saving module progress")
         return jsonify({"error": "Failed to save module progress"}), 500
 
 
@@ -60,22 +101,73 @@ def mark_complete():
     if not all([user_id, course_id, module_id]):
         return jsonify({"error": "user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required"}), 400
 
-    service = ProgressService()
+    service = ProgressService(write_buffer=get_write_buffer())
     try:
         service.mark_module_complete(user_id, course_id, module_id)
+        if service.write_behind:
+            return jsonify({"message": "Module completion queued"}), 202
         return jsonify({"message": "Module marked complete"}), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error marking module complete:", exc)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error marking module complete")
         return jsonify({"error": "Failed to mark module complete"}), 500
 
 
+@progress_bp.post("/batch")
+def save_batch():
+    """Apply many access/progress/complete events in one request.
+
+    Body: a JSON array of events, or ``{"events": [...]}``. Invalid events
+    are reported by index and skipped; the rest are applied together.
+    """
+    payload = request.get_json(force=True)
+    events = payload.get("events") if isinstance(payload, dict) else payload
+    if not isinstance(events, list):
+        return jsonify({"error": "Expected a JSON array of events (or {\"events\": [...]})"}), 400
+    if len(events) > Config.PROGRESS_BATCH_MAX_EVENTS:
+        return jsonify({"error": f"At most {Config.PROGRESS_BATCH_MAX_EVENTS} events are allowed per batch"}), 413
+
+    normalized = []
+    rejected = []
+    for index, event in enumerate(events):
+        try:
+            if not isinstance(event, dict):
+                raise ValueError("event must be an object")
+            normalized.append(_normalize_event(event))
+        except ValueError as err:
+            rejected.append({"index": index, "error": str(err)})
+
+    service = ProgressService(write_buffer=get_write_buffer())
+    try:
+        modules_updated = service.ingest_events(normalized)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error saving progress batch")
+        return jsonify({"error": "Failed to save progress batch"}), 500
+
+    result = {
+        "accepted": len(normalized),
+        "rejected": rejected,
+        "modules_updated": modules_updated,
+    }
+    return jsonify(result), 202 if service.write_behind else 200
+
+
+@progress_bp.get("/buffer")
+def get_buffer_stats():
+    """Report write-behind queue depth and flush metrics."""
+    buffer = get_write_buffer()
+    stats = {"enabled": False} if buffer is None else {"enabled": True, **buffer.stats()}
+    response = jsonify(stats)
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
 @progress_bp.get("/module/<user_id>/<course_id>/<module_id>")
 def get_module_progress(user_id: str, course_id: str, module_id: str):
     service = ProgressService()
     progress = service.get_module_progress(user_id, course_id, module_id)
     if progress is None:
         return jsonify({"error": "Progress not found"}), 404
-    return jsonify(progress), 200
+    return conditional_json(progress)
 
 
 @progress_bp.get("/module/<course_id>/<module_id>")
@@ -89,14 +181,14 @@ def get_module_progress_without_user(course_id: str, module_id: str):
     progress = service.get_module_progress(user_id, course_id, module_id)
     if progress is None:
         return jsonify({"error": "Progress not found"}), 404
-    return jsonify(progress), 200
+    return conditional_json(progress)
 
 
 @progress_bp.get("/course/<user_id>/<course_id>")
 def list_course_progress(user_id: str, course_id: str):
     service = ProgressService()
     progress = service.list_course_module_progress(user_id, course_id)
-    return jsonify(progress), 200
+    return conditional_json(progress)
 
 
 @progress_bp.get("/course/<course_id>")
@@ -108,7 +200,7 @@ def list_course_progress_without_user(course_id: str):
     
     service = ProgressService()
     progress = service.list_course_module_progress(user_id, course_id)
-    return jsonify(progress), 200
+    return conditional_json(progress)
 
 
 @progress_bp.get("/course/<user_id>/<course_id>/summary")
@@ -116,8 +208,8 @@ def get_course_summary(user_id: str, course_id: str):
     service = ProgressService()
     summary = service.get_course_progress(user_id, course_id)
     if summary is None:
-        return jsonify({"user_id": user_id, "course_id": course_id, "total_modules": 0, "completed_modules": 0, "progress_percentage": 0}), 200
-    return jsonify(summary), 200
+        return conditional_json({"user_id": user_id, "course_id": course_id, "total_modules": 0, "completed_modules": 0, "progress_percentage": 0})
+    return conditional_json(summary)
 
 
 @progress_bp.get("/course/<course_id>/summary")
@@ -130,5 +222,5 @@ def get_course_summary_without_user(course_id: str):
     service = ProgressService()
     summary = service.get_course_progress(user_id, course_id)
     if summary is None:
-        return jsonify({"user_id": user_id, "course_id": course_id, "total_modules": 0, "completed_modules": 0, "progress_percentage": 0}), 200
-    return jsonify(summary), 200
+        return conditional_json({"user_id": user_id, "course_id": course_id, "total_modules": 0, "completed_modules": 0, "progress_percentage": 0})
+    return conditional_json(summary)
@@ -0,0 +1,147 @@
+"""Progress API blueprint with async views (``Config.ASYNC_MODE``).
+
+Serves the same URLs and responses as ``app.api.progress``. The per-heartbeat
+routes use ``AsyncProgressService``; batch ingestion and buffer stats keep
+their sync views, which are registered here unchanged.
+"""
+
+import logging
+
+from flask import Blueprint, jsonify, request
+
+from app.api import progress
+from app.http_cache import conditional_json, set_cache_policy
+from app.services.progress_async_service import AsyncProgressService
+from app.services.progress_service import get_write_buffer
+
+logger = logging.getLogger(__name__)
+
+progress_async_bp = Blueprint("progress", __name__)
+set_cache_policy(progress_async_bp, "private, no-cache")
+
+progress_async_bp.add_url_rule("/batch", view_func=progress.save_batch, methods=["POST"])
+progress_async_bp.add_url_rule("/buffer", view_func=progress.get_buffer_stats, methods=["GET"])
+
+
+def _module_keys(payload: dict) -> tuple:
+    # Accept both formats: user_id/course_id/module_id or userId/courseId/moduleId
+    return (
+        payload.get("user_id") or payload.get("userId"),
+        payload.get("course_id") or payload.get("courseId"),
+        payload.get("module_id") or payload.get("moduleId"),
+    )
+
+
+def _empty_summary(user_id: str, course_id: str) -> dict:
+    return {"user_id": user_id, "course_id": course_id, "total_modules": 0, "completed_modules": 0, "progress_percentage": 0}
+
+
+@progress_async_bp.post("/access")
+async def save_access():
+    payload = request.get_json(force=True) or {}
+    user_id, course_id, module_id = _module_keys(payload)
+    progress_percentage = payload.get("progress_percentage") or payload.get("progressPercentage")
+
+    if not all([user_id, course_id, module_id]):
+        return jsonify({"error": "user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required"}), 400
+
+    service = AsyncProgressService(write_buffer=get_write_buffer())
+    try:
+        await service.save_module_access(user_id, course_id, module_id, progress_percentage)
+        if service.write_behind:
+            return jsonify({"message": "Module access queued"}), 202
+        return jsonify({"message": "Module access saved"}), 200
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error saving module access")
+        return jsonify({"error": "Failed to save module access"}), 500
+
+
+@progress_async_bp.post("/")
+async def save_progress():
+    payload = request.get_json(force=True) or {}
+    user_id, course_id, module_id = _module_keys(payload)
+    progress_data = payload.get("progressData") or payload.get("progress_data") or {}
+
+    if not all([user_id, course_id, module_id]):
+        return jsonify({"error": "user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required"}), 400
+
+    service = AsyncProgressService(write_buffer=get_write_buffer())
+    try:
+        await service.save_module_progress(user_id, course_id, module_id, progress_data)
+        if service.write_behind:
+            return jsonify({"message": "Module progress queued"}), 202
+        return jsonify({"message": "Module progress saved"}), 200
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error saving module progress")
+        return jsonify({"error": "Failed to save module progress"}), 500
+
+
+@progress_async_bp.post("/complete")
+async def mark_complete():
+    payload = request.get_json(force=True) or {}
+    user_id, course_id, module_id = _module_keys(payload)
+
+    if not all([user_id, course_id, module_id]):
+        return jsonify({"error": "user_id (or userId), course_id (or courseId) and module_id (or moduleId) are required"}), 400
+
+    service = AsyncProgressService(write_buffer=get_write_buffer())
+    try:
+        await service.mark_module_complete(user_id, course_id, module_id)
+        if service.write_behind:
+            return jsonify({"message": "Module completion queued"}), 202
+        return jsonify({"message": "Module marked complete"}), 200
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error marking module complete")
+        return jsonify({"error": "Failed to mark module complete"}), 500
+
+
+@progress_async_bp.get("/module/<user_id>/<course_id>/<module_id>")
+async def get_module_progress(user_id: str, course_id: str, module_id: str):
+    service = AsyncProgressService()
+    progress_doc = await service.get_module_progress(user_id, course_id, module_id)
+    if progress_doc is None:
+        return jsonify({"error": "Progress not found"}), 404
+    return conditional_json(progress_doc)
+
+
+@progress_async_bp.get("/module/<course_id>/<module_id>")
+async def get_module_progress_without_user(course_id: str, module_id: str):
+    """Get module progress - userId from query parameter."""
+    user_id = request.args.get("userId") or request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "userId query parameter is required"}), 400
+    return await get_module_progress(user_id, course_id, module_id)
+
+
+@progress_async_bp.get("/course/<user_id>/<course_id>")
+async def list_course_progress(user_id: str, course_id: str):
+    service = AsyncProgressService()
+    progress_docs = await service.list_course_module_progress(user_id, course_id)
+    return conditional_json(progress_docs)
+
+
+@progress_async_bp.get("/course/<course_id>")
+async def list_course_progress_without_user(course_id: str):
+    """Get course progress - userId from query parameter."""
+    user_id = request.args.get("userId") or request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "userId query parameter is required"}), 400
+    return await list_course_progress(user_id, course_id)
+
+
+@progress_async_bp.get("/course/<user_id>/<course_id>/summary")
+async def get_course_summary(user_id: str, course_id: str):
+    service = AsyncProgressService()
+    summary = await service.get_course_progress(user_id, course_id)
+    if summary is None:
+        return conditional_json(_empty_summary(user_id, course_id))
+    return conditional_json(summary)
+
+
+@progress_async_bp.get("/course/<course_id>/summary")
+async def get_course_summary_without_user(course_id: str):
+    """Get course summary - userId from query parameter."""
+    user_id = request.args.get("userId") or request.args.get("user_id")
+    if not user_id:
+        return jsonify({"error": "userId query parameter is required"}), 400
+    return await get_course_summary(user_id, course_id)
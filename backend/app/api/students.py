@@ -0,0 +1,24 @@
+"""Students API blueprint."""
+
+import logging
+
+from flask import Blueprint, jsonify
+
+from app.http_cache import conditional_json, set_cache_policy
+from app.services.dashboard_service import DashboardService
+
+logger = logging.getLogger(__name__)
+
+students_bp = Blueprint("students", __name__)
+set_cache_policy(students_bp, "private, no-cache")
+
+
+@students_bp.get("/<student_id>/dashboard")
+def get_dashboard(student_id: str):
+    """Enrolled courses with their progress summaries, in one response."""
+    service = DashboardService()
+    try:
+        return conditional_json(service.get_student_dashboard(student_id))
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error building dashboard for student %s", student_id)
+        return jsonify({"error": "Failed to load dashboard"}), 500
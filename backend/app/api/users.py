@@ -1,38 +1,55 @@
 """Users API blueprint."""
 
+import logging
+
 from flask import Blueprint, jsonify, request
 
+from app.http_cache import conditional_json, set_cache_policy
+from app.pagination import page_response, parse_page_args
+from app.projection import resolve_fields
 from app.services.users_service import UsersService
 
+logger = logging.getLogger(__name__)
+
 users_bp = Blueprint("users", __name__)
+set_cache_policy(users_bp, "private, no-cache")
 
 
 @users_bp.get("/")
 def list_users():
     """Return all users or filter by role."""
     role = request.args.get("role")
+    try:
+        limit, start_after, explicit = parse_page_args(request.args)
+        fields = resolve_fields("users", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
     service = UsersService()
 
     try:
-        users = service.list_users(role)
-        return jsonify(users), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error fetching users:", exc)
+        users, next_after = service.list_users(role, limit, start_after, fields)
+        return page_response(users, next_after, explicit)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching users")
         return jsonify({"error": "Failed to fetch users"}), 500
 
 
 @users_bp.get("/<user_id>")
 def get_user(user_id: str):
     """Get a user by ID."""
+    try:
+        fields = resolve_fields("users", request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
     service = UsersService()
 
     try:
-        user = service.get_user(user_id)
+        user = service.get_user(user_id, fields)
         if not user:
             return jsonify({"error": "User not found"}), 404
-        return jsonify(user), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error fetching user:", exc)
+        return conditional_json(user)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching user")
         return jsonify({"error": "Failed to fetch user"}), 500
 
 
@@ -50,8 +67,8 @@ def update_user(user_id: str):
         return jsonify({"message": "User updated successfully", "id": user_id}), 200
     except ValueError as err:
         return jsonify({"error": str(err)}), 404
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error updating user:", exc)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error updating user")
         return jsonify({"error": "Failed to update user"}), 500
 
 
@@ -65,20 +82,28 @@ def delete_user(user_id: str):
         return jsonify({"message": "User deleted successfully", "id": user_id}), 200
     except ValueError as err:
         return jsonify({"error": str(err)}), 404
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error deleting user:", exc)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error deleting user")
         return jsonify({"error": "Failed to delete user"}), 500
 
 
 @users_bp.get("/stats")
 def get_user_stats():
-    """Get user statistics."""
+    """Get user statistics, optionally grouped (e.g. ?group_by=status,program&program=A,B)."""
+    group_by = [field for field in request.args.get("group_by", "").split(",") if field]
+    group_values = {
+        field: [value for value in request.args[field].split(",") if value]
+        for field in group_by
+        if request.args.get(field)
+    }
     service = UsersService()
 
     try:
-        stats = service.get_user_stats()
-        return jsonify(stats), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        print("Error fetching user stats:", exc)
+        stats = service.get_user_stats(group_by, group_values)
+        return conditional_json(stats)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Error fetching user stats")
         return jsonify({"error": "Failed to fetch user stats"}), 500
 
@@ -0,0 +1,242 @@
+"""Small in-process caches shared by the repositories."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+logger = logging.getLogger(__name__)
+
+# Returned by ``TTLCache.get`` on a miss, so ``None`` can be cached too.
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+
+    Args:
+        maxsize: Maximum number of entries; the least recently used entry is
+            evicted when full.
+        ttl: Default time-to-live in seconds. ``0`` disables caching.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if not self.enabled or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+class EntityCache:
+    """Read-through cache of one collection's documents, keyed by id.
+
+    Holds full documents (``Document``), so a cached entry also answers
+    requests for a subset of its fields, and remembers missing documents
+    for ``negative_ttl`` seconds so repeated 404s do not reach Firestore.
+    Writes made through the repositories invalidate the entry; with
+    ``watch()`` a snapshot listener also drops entries changed by other
+    processes.
+
+    Read-through callers take ``generation`` before reading Firestore and
+    pass it to ``set``, which drops the value if the document was
+    invalidated in between: the read may predate that write.
+
+    With ``requires_listener`` the cache is bypassed unless this process's
+    listener is running, for collections written outside the API.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        requires_listener: bool = False,
+    ) -> None:
+        self.collection = collection
+        self.negative_ttl = negative_ttl
+        self.requires_listener = requires_listener
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation_lock = threading.Lock()
+        self._generation = 0
+        # Doc id -> generation of its latest invalidation. Bounded: ids pushed
+        # out raise the floor, which then counts for every id not listed.
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._generation_floor = 0
+        self._listener_lock = threading.Lock()
+        self._listener: dict = {"pid": None, "watch": None}
+
+    @property
+    def enabled(self) -> bool:
+        if self.requires_listener and not self.listening:
+            return False
+        return self._entries.enabled
+
+    @property
+    def listening(self) -> bool:
+        """True while this process's snapshot listener is running."""
+        watch = self._listener["watch"]
+        return (
+            self._listener["pid"] == os.getpid()
+            and watch is not None
+            and getattr(watch, "is_active", True) is not False
+        )
+
+    @staticmethod
+    def project(document, fields: list[str] | None):
+        """Copy of ``document`` limited to ``fields`` (plus ``id``)."""
+        return document.project(fields) if document is not None else None
+
+    def get(self, doc_id: str, fields: list[str] | None = None) -> Any:
+        """Cached document (projected to ``fields``), ``None`` if known missing, else ``MISSING``."""
+        if not self.enabled:
+            return MISSING
+        document = self._entries.get(doc_id)
+        if document is MISSING:
+            return MISSING
+        return self.project(document, fields)
+
+    def get_many(self, doc_ids, fields: list[str] | None = None) -> tuple[dict, list]:
+        """Split ``doc_ids`` into cached documents (known-missing ones omitted) and ids to fetch."""
+        found, missing = {}, []
+        for doc_id in doc_ids:
+            document = self.get(doc_id, fields)
+            if document is MISSING:
+                missing.append(doc_id)
+            elif document is not None:
+                found[doc_id] = document
+        return found, missing
+
+    @property
+    def generation(self) -> int:
+        """Token to take before a Firestore read and hand to ``set``."""
+        with self._generation_lock:
+            return self._generation
+
+    def set(self, doc_id: str, document, generation: int) -> None:
+        """Cache a full document, or ``None`` for a missing one, read at ``generation``."""
+        if not self.enabled:
+            return
+        with self._generation_lock:
+            if self._invalidated.get(doc_id, self._generation_floor) > generation:
+                return
+            if document is None:
+                self._entries.set(doc_id, None, ttl=self.negative_ttl)
+            else:
+                self._entries.set(doc_id, document.copy())
+
+    def invalidate(self, doc_id: str) -> None:
+        with self._generation_lock:
+            self._generation += 1
+            self._invalidated[doc_id] = self._generation
+            self._invalidated.move_to_end(doc_id)
+            while len(self._invalidated) > max(self._entries.maxsize, 1):
+                _, self._generation_floor = self._invalidated.popitem(last=False)
+            self._entries.invalidate(doc_id)
+
+    def clear(self) -> None:
+        with self._generation_lock:
+            self._generation += 1
+            self._generation_floor = self._generation
+            self._invalidated.clear()
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "negative_ttl": self.negative_ttl, "listening": self.listening}
+
+    def watch(self, db) -> None:
+        """Invalidate on Firestore changes (one listener per process, after any fork).
+
+        The listener's initial snapshot reads the whole collection once. A
+        listener whose stream has given up is replaced and the cache cleared,
+        since changes made meanwhile were missed. Failures are logged; the
+        next call tries again.
+        """
+        if not self._entries.enabled:
+            return
+        with self._listener_lock:
+            if self.listening:
+                return
+            watch = self._listener["watch"]
+            if watch is not None and self._listener["pid"] == os.getpid():
+                logger.warning("Cache listener is down, restarting it", extra={"collection": self.collection})
+                try:
+                    watch.unsubscribe()
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Error closing cache listener", extra={"collection": self.collection})
+            self._listener = {"pid": None, "watch": None}
+            self.clear()
+            try:
+                watch = db.collection(self.collection).on_snapshot(self._on_snapshot)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Cache listener failed to start", extra={"collection": self.collection})
+                return
+            self._listener = {"pid": os.getpid(), "watch": watch}
+
+    def _on_snapshot(self, _snapshots, changes, _read_time) -> None:
+        for change in changes:
+            self.invalidate(change.document.id)
@@ -0,0 +1,99 @@
+"""Flask CLI commands (``flask --app run <command>``)."""
+
+import json
+
+import click
+from flask import Flask
+
+from app.importing import FORMATS, SCHEMAS, read_rows
+from app.migrations import enrollment_ids, progress_ids
+from app.migrations.checkpoint import load_checkpoint, save_checkpoint
+from app.repositories.import_repository import WRITE_MODES, ImportRepository
+from app.services.import_service import ImportService
+
+
+@click.command("migrate-progress-ids")
+@click.option(
+    "--collection",
+    type=click.Choice(sorted(progress_ids.COLLECTIONS)),
+    multiple=True,
+    help="Collection to migrate (default: all progress collections).",
+)
+@click.option("--batch-size", default=200, show_default=True, help="Documents per batch.")
+@click.option("--checkpoint", default=None, help="File used to resume an interrupted run.")
+@click.option("--dry-run", is_flag=True, help="Scan and report without writing.")
+def migrate_progress_ids_command(collection, batch_size, checkpoint, dry_run):
+    """Re-key auto-ID progress documents to deterministic ids."""
+    for name in collection or sorted(progress_ids.COLLECTIONS):
+        stats = progress_ids.migrate_collection(
+            name,
+            batch_size=batch_size,
+            checkpoint_path=checkpoint,
+            dry_run=dry_run,
+            log=click.echo,
+        )
+        click.echo(f"{name}: {stats}")
+
+
+@click.command("migrate-enrollment-ids")
+@click.option("--batch-size", default=200, show_default=True, help="Documents per batch.")
+@click.option("--checkpoint", default=None, help="File used to resume an interrupted run.")
+@click.option("--dry-run", is_flag=True, help="Scan and report without writing.")
+def migrate_enrollment_ids_command(batch_size, checkpoint, dry_run):
+    """Re-key auto-ID enrollments to student__course ids, merging duplicates."""
+    stats = enrollment_ids.migrate(
+        batch_size=batch_size,
+        checkpoint_path=checkpoint,
+        dry_run=dry_run,
+        log=click.echo,
+    )
+    click.echo(f"{enrollment_ids.COLLECTION}: {stats}")
+
+
+@click.command("import-data")
+@click.argument("collection", type=click.Choice(sorted(SCHEMAS)))
+@click.argument("source", type=click.File("rb"))
+@click.option("--format", "fmt", type=click.Choice(FORMATS), default=None, help="Default: from the file extension.")
+@click.option("--mode", type=click.Choice(WRITE_MODES), default="create", show_default=True,
+              help="'create' keeps existing documents, 'set' replaces them, 'merge' merges into them.")
+@click.option("--chunk-size", type=int, default=None, help="Rows per flush and checkpoint (IMPORT_CHUNK_SIZE).")
+@click.option("--rate", type=int, default=None, help="Initial writes per second (IMPORT_INITIAL_OPS_PER_SECOND).")
+@click.option("--max-rate", type=int, default=None, help="Writes per second to ramp up to (IMPORT_MAX_OPS_PER_SECOND).")
+@click.option("--max-attempts", type=int, default=None, help="Attempts per document on transient errors.")
+@click.option("--checkpoint", default=None, help="File used to resume an interrupted import.")
+@click.option("--errors", "errors_file", type=click.File("w"), default=None, help="Write rejected rows here (NDJSON).")
+@click.option("--dry-run", is_flag=True, help="Validate without writing.")
+def import_data_command(collection, source, fmt, mode, chunk_size, rate, max_rate, max_attempts, checkpoint,
+                        errors_file, dry_run):
+    """Bulk-import COLLECTION from an NDJSON or CSV file ('-' for stdin)."""
+    fmt = fmt or ("csv" if source.name.lower().endswith(".csv") else "ndjson")
+    state = load_checkpoint(checkpoint)
+    start_line = state.get(collection, 0)
+    if start_line:
+        click.echo(f"{collection}: resuming after line {start_line}")
+
+    repository = None if dry_run else ImportRepository(rate, max_rate, max_attempts)
+    stats = {}
+    for stats in ImportService(repository).run(
+        collection, read_rows(collection, source, fmt, start_line), mode, chunk_size, dry_run
+    ):
+        for error in stats.pop("errors"):
+            if errors_file is not None:
+                errors_file.write(json.dumps(error) + "\n")
+            else:
+                click.echo(f"{collection}: line {error['line']}: {error['error']}", err=True)
+        if not dry_run:
+            state[collection] = stats["last_line"]
+            save_checkpoint(checkpoint, state)
+        click.echo(
+            f"{collection}: line={stats['last_line']} written={stats['written']} existing={stats['existing']} "
+            f"invalid={stats['invalid']} failed={stats['failed']}"
+        )
+    click.echo(f"{collection}: {stats}" if stats else f"{collection}: nothing to import after line {start_line}")
+
+
+def register_commands(app: Flask) -> None:
+    """Attach CLI commands to the application."""
+    app.cli.add_command(migrate_progress_ids_command)
+    app.cli.add_command(migrate_enrollment_ids_command)
+    app.cli.add_command(import_data_command)
@@ -0,0 +1,74 @@
+"""Negotiated response compression (brotli / gzip).
+
+JSON bodies larger than ``Config.COMPRESS_MIN_SIZE`` bytes are compressed
+with the best encoding the client accepts: brotli when the optional
+``brotli`` package is installed, gzip otherwise. Smaller bodies, streamed
+responses and already-encoded responses are sent as they are.
+"""
+
+from __future__ import annotations
+
+import gzip
+
+from flask import Flask, Response, request
+
+from app.config import Config
+from app.log import timed
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson", "text/plain", "text/csv", "text/html"}
+
+
+def choose_encoding(accept_encodings) -> str | None:
+    """Pick the preferred supported encoding from an ``Accept-Encoding`` header."""
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = accept_encodings.best_match(candidates)
+    if best is None or accept_encodings[best] <= 0:
+        return None
+    return best
+
+
+def compress_response(response: Response) -> Response:
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    if len(body) < Config.COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    with timed("compress"):
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=Config.COMPRESS_BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(body, compresslevel=Config.COMPRESS_GZIP_LEVEL)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    # The encoded bytes differ from the identity representation, so the
+    # ETag can no longer be strong (If-None-Match compares weakly).
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    if Config.COMPRESS_MIN_SIZE <= 0:
+        return
+    app.after_request(compress_response)
@@ -6,6 +6,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _env_flag(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
 class Config:
     """Base configuration for Flask app."""
 
@@ -13,3 +17,67 @@ class Config:
     FIREBASE_CREDENTIALS_PATH = os.getenv(
         "FIREBASE_CREDENTIALS_PATH", "firebase-service-account.json"
     )
+
+    # Write-behind buffering of progress heartbeats (see services/progress_buffer.py)
+    PROGRESS_WRITE_BEHIND = _env_flag("PROGRESS_WRITE_BEHIND")
+    PROGRESS_FLUSH_INTERVAL = float(os.getenv("PROGRESS_FLUSH_INTERVAL", "2.0"))
+    PROGRESS_BUFFER_MAX_KEYS = int(os.getenv("PROGRESS_BUFFER_MAX_KEYS", "5000"))
+    PROGRESS_BATCH_MAX_EVENTS = int(os.getenv("PROGRESS_BATCH_MAX_EVENTS", "1000"))
+
+    # Serve the progress routes with async views on a shared event loop (see aio.py)
+    ASYNC_MODE = _env_flag("ASYNC_MODE")
+
+    # Process-wide cache of module lists per course (see repositories/modules_repository.py)
+    MODULES_CACHE_TTL = float(os.getenv("MODULES_CACHE_TTL", "300"))
+    MODULES_CACHE_SIZE = int(os.getenv("MODULES_CACHE_SIZE", "1024"))
+    MODULES_CACHE_LISTENER = _env_flag("MODULES_CACHE_LISTENER")
+
+    # Per-collection cache of course, user and assignment documents (see cache.py);
+    # misses (404s) are remembered for ENTITY_CACHE_NEGATIVE_TTL seconds
+    ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "60"))
+    ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+    ENTITY_CACHE_NEGATIVE_TTL = float(os.getenv("ENTITY_CACHE_NEGATIVE_TTL", "5"))
+    ENTITY_CACHE_LISTENER = _env_flag("ENTITY_CACHE_LISTENER")
+
+    # Mirror courses and course_modules in memory with snapshot listeners (see replica.py);
+    # create_app waits up to CATALOG_REPLICA_WARMUP_TIMEOUT seconds for the initial snapshots
+    CATALOG_REPLICA = _env_flag("CATALOG_REPLICA")
+    CATALOG_REPLICA_WARMUP_TIMEOUT = float(os.getenv("CATALOG_REPLICA_WARMUP_TIMEOUT", "10"))
+
+    # Documents fetched per Firestore query by the NDJSON export (see api/export.py)
+    EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+
+    # Bulk imports (flask import-data / POST /api/import/<collection>): rows per
+    # BulkWriter flush and checkpoint, write rate ramp and attempts per document
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "500"))
+    IMPORT_INITIAL_OPS_PER_SECOND = int(os.getenv("IMPORT_INITIAL_OPS_PER_SECOND", "500"))
+    IMPORT_MAX_OPS_PER_SECOND = int(os.getenv("IMPORT_MAX_OPS_PER_SECOND", "10000"))
+    IMPORT_MAX_ATTEMPTS = int(os.getenv("IMPORT_MAX_ATTEMPTS", "5"))
+
+    # Bulk enrollment uploads (POST /api/courses/<id>/enrollments:bulk); BulkWriter
+    # starts at the initial rate and ramps up towards the max (ops per second)
+    BULK_ENROLL_MAX_ROWS = int(os.getenv("BULK_ENROLL_MAX_ROWS", "10000"))
+    BULK_WRITER_INITIAL_OPS_PER_SECOND = int(os.getenv("BULK_WRITER_INITIAL_OPS_PER_SECOND", "100"))
+    BULK_WRITER_MAX_OPS_PER_SECOND = int(os.getenv("BULK_WRITER_MAX_OPS_PER_SECOND", "500"))
+
+    # Server-enforced upper bound for list endpoint pages (see pagination.py)
+    MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "500"))
+
+    # Response compression (see compression.py); 0 disables it
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+
+    # Structured request logging (see log.py)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+    LOG_ROUTE_SAMPLE_RATES = os.getenv("LOG_ROUTE_SAMPLE_RATES", "")
+    LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", "500"))
+
+    # Per-endpoint Firestore operation budgets (see firestore_ops.py), e.g.
+    # "progress.save_access=reads:4,writes:2;*=reads:5000"; mode is log or reject
+    FIRESTORE_BUDGETS = os.getenv("FIRESTORE_BUDGETS", "")
+    FIRESTORE_BUDGET_MODE = os.getenv("FIRESTORE_BUDGET_MODE", "log").strip().lower()
+
+    # Seconds GET /api/users/stats results are reused
+    USER_STATS_CACHE_TTL = float(os.getenv("USER_STATS_CACHE_TTL", "30"))
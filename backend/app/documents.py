@@ -0,0 +1,38 @@
+"""Document values returned by the repositories."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class Document(dict):
+    """A Firestore document's data (plus ``id``) that remembers its version.
+
+    Behaves exactly like the plain dicts the repositories used to return;
+    ``update_time`` is kept on the side so the API can derive ETags from it
+    without hashing the serialized body (see ``app.http_cache``).
+    """
+
+    __slots__ = ("update_time",)
+
+    def __init__(self, data: Any = (), update_time: Any = None) -> None:
+        super().__init__(data)
+        self.update_time = update_time
+
+    def copy(self) -> Document:
+        return Document(self, self.update_time)
+
+    def project(self, fields: list[str] | None) -> Document:
+        """Copy limited to ``fields`` (plus ``id``); a full copy when no fields are given."""
+        if not fields:
+            return self.copy()
+        projected = Document({key: self[key] for key in fields if key in self}, self.update_time)
+        if "id" in self:
+            projected["id"] = self["id"]
+        return projected
+
+    @classmethod
+    def from_snapshot(cls, doc) -> Document:
+        data = cls(doc.to_dict() or {}, getattr(doc, "update_time", None))
+        data["id"] = doc.id
+        return data
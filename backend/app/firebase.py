@@ -1,11 +1,34 @@
 """Firebase Admin SDK helpers."""
 
+import asyncio
+import contextvars
 import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import Iterable
 
 import firebase_admin
 from firebase_admin import credentials, firestore
 
+from app.firestore_ops import InstrumentedClient, instrument_client
+
+# References per BatchGetDocuments call when point-reading many documents.
+GET_ALL_CHUNK_SIZE = 300
+GET_ALL_MAX_WORKERS = 4
+
+# gRPC status codes BulkWriter reports to its error callback.
+ALREADY_EXISTS = 6
+# Transient failures worth another attempt (BulkWriter backs off between them):
+# UNKNOWN, DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE.
+RETRYABLE_CODES = frozenset({2, 4, 8, 10, 13, 14})
+
+# AsyncClient channels are bound to the event loop that first uses them, so
+# async clients are kept per loop.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, InstrumentedClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 @lru_cache()
 def init_firebase():
@@ -18,7 +41,47 @@ def init_firebase():
     return firebase_admin.initialize_app(cred)
 
 
-def get_db() -> firestore.Client:
-    """Return a Firestore client."""
+def get_db() -> InstrumentedClient:
+    """Return the Firestore client, wrapped for per-request operation counting."""
     init_firebase()
-    return firestore.client()
+    return instrument_client(firestore.client())
+
+
+def get_all_chunked(
+    db: firestore.Client,
+    refs: Iterable,
+    field_paths: list[str] | None = None,
+    chunk_size: int = GET_ALL_CHUNK_SIZE,
+) -> list:
+    """Point-read ``refs`` with ``get_all``, ``chunk_size`` references per call.
+
+    Chunks are fetched concurrently. Snapshots come back in no particular
+    order (match them on ``snapshot.id``); missing documents are included
+    with ``exists == False``.
+    """
+    refs = list(refs)
+    chunks = [refs[i:i + chunk_size] for i in range(0, len(refs), chunk_size)]
+    if len(chunks) <= 1:
+        return [snapshot for chunk in chunks for snapshot in db.get_all(chunk, field_paths=field_paths)]
+
+    def fetch(chunk: list) -> list:
+        return list(db.get_all(chunk, field_paths=field_paths))
+
+    # Each worker runs in a copy of the caller's context so reads are charged
+    # to the current request (see firestore_ops.py).
+    with ThreadPoolExecutor(max_workers=min(len(chunks), GET_ALL_MAX_WORKERS)) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fetch, chunk) for chunk in chunks]
+        return [snapshot for future in futures for snapshot in future.result()]
+
+
+def get_async_db() -> InstrumentedClient:
+    """Return a Firestore AsyncClient for the running event loop (instrumented)."""
+    app = init_firebase()
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = instrument_client(
+            firestore.AsyncClient(credentials=app.credential.get_credential(), project=app.project_id)
+        )
+        _async_clients[loop] = client
+    return client
@@ -0,0 +1,466 @@
+"""Per-request accounting of billed Firestore operations.
+
+``get_db()`` / ``get_async_db()`` hand out an ``InstrumentedClient``: a thin
+proxy around the Firestore client (and the references, queries, batches and
+transactions it creates) that counts, for the request being served,
+
+* documents read: one per document returned by a query (at least one per
+  query), one per ``get`` / ``get_all`` reference and one per 1000 index
+  entries counted by an aggregation;
+* documents written: ``set`` / ``update`` / ``create``, also inside batches,
+  transactions and bulk writers (counted when they commit);
+* documents deleted.
+
+Totals are returned in ``X-Firestore-Ops`` and ``Server-Timing`` headers and
+in the access log. ``FIRESTORE_BUDGETS`` sets per-endpoint limits; requests
+going over them are logged (``FIRESTORE_BUDGET_MODE=log``) or stopped and
+answered with 503 (``reject``).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import inspect
+import logging
+import math
+import threading
+from typing import Any
+
+from flask import Flask, Response, g, jsonify, request
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("reads", "writes", "deletes")
+
+_usage: contextvars.ContextVar[FirestoreUsage | None] = contextvars.ContextVar("firestore_usage", default=None)
+
+
+class FirestoreBudgetExceeded(RuntimeError):
+    """Raised (in ``reject`` mode) when a request goes over its budget."""
+
+
+class FirestoreUsage:
+    """Operation counters for one request; shared by its worker threads."""
+
+    def __init__(self, budget: dict[str, int] | None = None, reject: bool = False) -> None:
+        self.counts = dict.fromkeys(OPERATIONS, 0)
+        self.budget = budget or {}
+        self.reject = reject
+        self.exceeded: list[str] = []
+        self._lock = threading.Lock()
+
+    def add(self, operation: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[operation] += amount
+            limit = self.budget.get(operation)
+            newly_exceeded = limit is not None and self.counts[operation] > limit and operation not in self.exceeded
+            if newly_exceeded:
+                self.exceeded.append(operation)
+        if newly_exceeded and self.reject:
+            raise FirestoreBudgetExceeded(f"Firestore {operation} budget of {limit} exceeded")
+
+
+def _charge(operation: str, amount: int = 1) -> None:
+    usage = _usage.get()
+    if usage is not None and amount:
+        usage.add(operation, amount)
+
+
+def current_usage() -> FirestoreUsage | None:
+    return _usage.get()
+
+
+# ----------------------------------------------------------------------
+# Client proxies
+# ----------------------------------------------------------------------
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, _Proxy):
+        return value._target
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    return value
+
+
+def _unwrap_kwargs(kwargs: dict) -> dict:
+    return {key: _unwrap(value) for key, value in kwargs.items()}
+
+
+def _then(result: Any, callback) -> Any:
+    """Run ``callback(result)`` now, or once ``result`` is awaited (async client)."""
+    if inspect.isawaitable(result):
+
+        async def await_then():
+            value = await result
+            callback(value)
+            return value
+
+        return await_then()
+    callback(result)
+    return result
+
+
+def _count_stream(stream: Any) -> Any:
+    """Charge one read per streamed document, and at least one per query."""
+    if inspect.isasyncgen(stream) or hasattr(stream, "__aiter__"):
+
+        async def counted_async():
+            returned = 0
+            async for doc in stream:
+                returned += 1
+                _charge("reads")
+                yield doc
+            if not returned:
+                _charge("reads")
+
+        return counted_async()
+
+    def counted():
+        returned = 0
+        for doc in stream:
+            returned += 1
+            _charge("reads")
+            yield doc
+        if not returned:
+            _charge("reads")
+
+    return counted()
+
+
+def _charge_aggregation(results) -> None:
+    entries = 0
+    for result in results or []:
+        for aggregation in result:
+            if isinstance(aggregation.value, (int, float)):
+                entries = max(entries, int(aggregation.value))
+    _charge("reads", max(1, math.ceil(entries / 1000)))
+
+
+class _Proxy:
+    __slots__ = ("_target",)
+
+    def __init__(self, target: Any) -> None:
+        object.__setattr__(self, "_target", target)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+    def __eq__(self, other: Any) -> bool:
+        return self._target == _unwrap(other)
+
+    def __hash__(self) -> int:
+        return hash(self._target)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._target!r})"
+
+
+class InstrumentedClient(_Proxy):
+    """Counting proxy for ``firestore.Client`` / ``firestore.AsyncClient``."""
+
+    __slots__ = ()
+
+    def collection(self, *path: str) -> InstrumentedQuery:
+        return InstrumentedQuery(self._target.collection(*path))
+
+    def collection_group(self, collection_id: str) -> InstrumentedQuery:
+        return InstrumentedQuery(self._target.collection_group(collection_id))
+
+    def document(self, *path: str) -> InstrumentedDocument:
+        return InstrumentedDocument(self._target.document(*path))
+
+    def get_all(self, references, *args, **kwargs):
+        references = _unwrap(list(references))
+        _charge("reads", len(references))
+        return self._target.get_all(references, *_unwrap(args), **_unwrap_kwargs(kwargs))
+
+    def batch(self) -> InstrumentedWriteBatch:
+        return InstrumentedWriteBatch(self._target.batch())
+
+    def transaction(self, **kwargs) -> InstrumentedTransaction:
+        return InstrumentedTransaction(self._target.transaction(**kwargs))
+
+    def bulk_writer(self, *args, **kwargs) -> InstrumentedWriteBatch:
+        return InstrumentedWriteBatch(self._target.bulk_writer(*args, **kwargs))
+
+
+class InstrumentedQuery(_Proxy):
+    """Counting proxy for collection references and queries."""
+
+    __slots__ = ()
+
+    def _chain(self, name: str, *args, **kwargs) -> InstrumentedQuery:
+        return InstrumentedQuery(getattr(self._target, name)(*_unwrap(args), **_unwrap_kwargs(kwargs)))
+
+    def where(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("where", *args, **kwargs)
+
+    def select(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("select", *args, **kwargs)
+
+    def order_by(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("order_by", *args, **kwargs)
+
+    def limit(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("limit", *args, **kwargs)
+
+    def limit_to_last(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("limit_to_last", *args, **kwargs)
+
+    def offset(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("offset", *args, **kwargs)
+
+    def start_at(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("start_at", *args, **kwargs)
+
+    def start_after(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("start_after", *args, **kwargs)
+
+    def end_at(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("end_at", *args, **kwargs)
+
+    def end_before(self, *args, **kwargs) -> InstrumentedQuery:
+        return self._chain("end_before", *args, **kwargs)
+
+    def document(self, *args, **kwargs) -> InstrumentedDocument:
+        return InstrumentedDocument(self._target.document(*args, **kwargs))
+
+    def add(self, *args, **kwargs):
+        _charge("writes")
+        return self._target.add(*args, **kwargs)
+
+    def stream(self, *args, **kwargs):
+        return _count_stream(self._target.stream(*_unwrap(args), **_unwrap_kwargs(kwargs)))
+
+    def get(self, *args, **kwargs):
+        result = self._target.get(*_unwrap(args), **_unwrap_kwargs(kwargs))
+
+        def charge(docs) -> None:
+            _charge("reads", max(1, len(docs)))
+
+        return _then(result, charge)
+
+    def count(self, *args, **kwargs) -> InstrumentedAggregation:
+        return InstrumentedAggregation(self._target.count(*args, **kwargs))
+
+    def sum(self, *args, **kwargs) -> InstrumentedAggregation:
+        return InstrumentedAggregation(self._target.sum(*args, **kwargs))
+
+    def avg(self, *args, **kwargs) -> InstrumentedAggregation:
+        return InstrumentedAggregation(self._target.avg(*args, **kwargs))
+
+
+class InstrumentedAggregation(_Proxy):
+    __slots__ = ()
+
+    def get(self, *args, **kwargs):
+        return _then(self._target.get(*_unwrap(args), **_unwrap_kwargs(kwargs)), _charge_aggregation)
+
+
+class InstrumentedDocument(_Proxy):
+    """Counting proxy for document references."""
+
+    __slots__ = ()
+
+    def get(self, *args, **kwargs):
+        _charge("reads")
+        return self._target.get(*args, **_unwrap_kwargs(kwargs))
+
+    def set(self, *args, **kwargs):
+        _charge("writes")
+        return self._target.set(*args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        _charge("writes")
+        return self._target.update(*args, **kwargs)
+
+    def create(self, *args, **kwargs):
+        _charge("writes")
+        return self._target.create(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        _charge("deletes")
+        return self._target.delete(*args, **kwargs)
+
+    def collection(self, *args, **kwargs) -> InstrumentedQuery:
+        return InstrumentedQuery(self._target.collection(*args, **kwargs))
+
+
+class InstrumentedWriteBatch(_Proxy):
+    """Counting proxy for write batches and bulk writers.
+
+    Queued operations are charged just before the batch commits (bulk
+    writers: when they are flushed or closed), so a rejecting budget stops
+    the commit.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self, target: Any) -> None:
+        super().__init__(target)
+        object.__setattr__(self, "_pending", [])
+
+    def _queue(self, operation: str, name: str, reference, *args, **kwargs):
+        result = getattr(self._target, name)(_unwrap(reference), *args, **kwargs)
+        self._pending.append(operation)
+        return result
+
+    def set(self, reference, *args, **kwargs):
+        return self._queue("writes", "set", reference, *args, **kwargs)
+
+    def update(self, reference, *args, **kwargs):
+        return self._queue("writes", "update", reference, *args, **kwargs)
+
+    def create(self, reference, *args, **kwargs):
+        return self._queue("writes", "create", reference, *args, **kwargs)
+
+    def delete(self, reference, *args, **kwargs):
+        return self._queue("deletes", "delete", reference, *args, **kwargs)
+
+    def _charge_pending(self) -> None:
+        pending = list(self._pending)
+        self._pending.clear()
+        for operation in OPERATIONS:
+            _charge(operation, pending.count(operation))
+
+    def commit(self, *args, **kwargs):
+        self._charge_pending()
+        return self._target.commit(*args, **kwargs)
+
+    def flush(self, *args, **kwargs):
+        self._charge_pending()
+        return self._target.flush(*args, **kwargs)
+
+    def close(self, *args, **kwargs):
+        self._charge_pending()
+        return self._target.close(*args, **kwargs)
+
+    def __enter__(self):
+        self._target.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self._charge_pending()
+        return self._target.__exit__(exc_type, exc_value, traceback)
+
+
+class InstrumentedTransaction(InstrumentedWriteBatch):
+    """Counting proxy for transactions (usable with ``@firestore.transactional``).
+
+    Writes are charged once the commit succeeds, so attempts that are
+    retried or rolled back are not counted.
+    """
+
+    __slots__ = ()
+
+    def get(self, ref_or_query, *args, **kwargs):
+        target = _unwrap(ref_or_query)
+        if isinstance(ref_or_query, InstrumentedDocument):
+            _charge("reads")
+            return self._target.get(target, *args, **kwargs)
+        result = self._target.get(target, *args, **kwargs)
+        if isinstance(ref_or_query, InstrumentedAggregation):
+            return _then(result, _charge_aggregation)
+        if inspect.isawaitable(result):
+
+            async def counted():
+                return _count_stream(await result)
+
+            return counted()
+        return _count_stream(result)
+
+    def get_all(self, references, *args, **kwargs):
+        references = _unwrap(list(references))
+        _charge("reads", len(references))
+        return self._target.get_all(references, *args, **kwargs)
+
+    def _clean_up(self) -> None:
+        self._pending.clear()
+        self._target._clean_up()
+
+    def _rollback(self, *args, **kwargs):
+        self._pending.clear()
+        return self._target._rollback(*args, **kwargs)
+
+    def _commit(self, *args, **kwargs):
+        return _then(self._target._commit(*args, **kwargs), lambda _result: self._charge_pending())
+
+
+def instrument_client(client: Any) -> InstrumentedClient:
+    return client if isinstance(client, InstrumentedClient) else InstrumentedClient(client)
+
+
+# ----------------------------------------------------------------------
+# Request integration
+# ----------------------------------------------------------------------
+
+
+def parse_budgets(raw: str) -> dict[str, dict[str, int]]:
+    """Parse ``"progress.save_access=reads:4,writes:2;*=reads:5000"``."""
+    budgets: dict[str, dict[str, int]] = {}
+    for entry in (part.strip() for part in raw.split(";")):
+        if not entry:
+            continue
+        endpoint, _, limits = entry.partition("=")
+        budget = {}
+        for limit in (part.strip() for part in limits.split(",")):
+            if not limit:
+                continue
+            operation, _, value = limit.partition(":")
+            if operation not in OPERATIONS:
+                raise ValueError(f"Unknown Firestore budget operation: {operation}")
+            budget[operation] = int(value)
+        budgets[endpoint.strip()] = budget
+    return budgets
+
+
+def init_firestore_accounting(app: Flask) -> None:
+    """Count Firestore operations per request and enforce budgets."""
+    budgets = parse_budgets(Config.FIRESTORE_BUDGETS)
+    reject = Config.FIRESTORE_BUDGET_MODE == "reject"
+
+    @app.before_request
+    def start_firestore_accounting() -> None:
+        budget = budgets.get(request.endpoint or "", budgets.get("*"))
+        g.firestore_usage_token = _usage.set(FirestoreUsage(budget, reject))
+
+    @app.after_request
+    def report_firestore_usage(response: Response) -> Response:
+        usage = _usage.get()
+        if usage is None:
+            return response
+
+        counts = dict(usage.counts)
+        g.firestore_ops = counts
+        if usage.exceeded:
+            logger.warning(
+                "Firestore budget exceeded",
+                extra={"firestore_ops": counts, "firestore_budget": usage.budget, "rejected": usage.reject},
+            )
+            if usage.reject:
+                response = jsonify(
+                    {"error": "Request exceeded its Firestore budget", "exceeded": usage.exceeded, "firestore_ops": counts}
+                )
+                response.status_code = 503
+
+        response.headers["X-Firestore-Ops"] = ", ".join(f"{op}={counts[op]}" for op in OPERATIONS)
+        description = " ".join(f"{op}={counts[op]}" for op in OPERATIONS)
+        firestore_ms = getattr(g, "timings", {}).get("firestore")
+        duration = f";dur={firestore_ms:.2f}" if firestore_ms is not None else ""
+        response.headers.add("Server-Timing", f'firestore{duration};desc="{description}"')
+        return response
+
+    @app.teardown_request
+    def finish_firestore_accounting(_exc) -> None:
+        token = g.pop("firestore_usage_token", None)
+        if token is not None:
+            _usage.reset(token)
@@ -0,0 +1,87 @@
+"""Conditional GET support: ETags, ``If-None-Match`` and Cache-Control.
+
+Responses built from repository ``Document`` values get a strong ETag derived
+from the documents' Firestore ``update_time`` (and the request path, so
+different projections or pages of the same documents never share a tag).
+That tag is known before anything is serialized, so a matching
+``If-None-Match`` is answered with ``304 Not Modified`` straight away. Other
+payloads fall back to an ETag hashed from the serialized body.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from flask import Blueprint, Response, jsonify, request
+
+from app.documents import Document
+from app.log import timed
+
+
+def version_etag(payload, *extra) -> str | None:
+    """ETag for a Document or a list of Documents, None if not versioned.
+
+    ``extra`` values that also shape the response (e.g. the next cursor)
+    are folded into the tag.
+    """
+    if isinstance(payload, Document):
+        documents = [payload]
+    elif isinstance(payload, list) and all(isinstance(item, Document) for item in payload):
+        documents = payload
+    else:
+        return None
+    if any(document.update_time is None for document in documents):
+        return None
+
+    digest = hashlib.blake2b(request.full_path.encode(), digest_size=16)
+    for value in extra:
+        digest.update(b"\0" + str(value).encode())
+    for document in documents:
+        digest.update(b"\0" + str(document.get("id")).encode())
+        digest.update(b"\0" + _version(document.update_time).encode())
+    return digest.hexdigest()
+
+
+def _version(update_time) -> str:
+    rfc3339 = getattr(update_time, "rfc3339", None)
+    return rfc3339() if rfc3339 else update_time.isoformat()
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def conditional_json(payload, etag: str | None = None) -> Response:
+    """``jsonify(payload)`` honouring ``If-None-Match``.
+
+    ``etag`` defaults to ``version_etag(payload)``; when it matches the
+    request the body is never serialized. Unversioned payloads get a
+    content-hash ETag and are compared after serialization.
+    """
+    etag = etag or version_etag(payload)
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+
+    with timed("serialize"):
+        response = jsonify(payload)
+    if etag is not None:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    return response.make_conditional(request)
+
+
+def set_cache_policy(blueprint: Blueprint, cache_control: str) -> None:
+    """Send ``cache_control`` on the blueprint's successful GET responses."""
+
+    @blueprint.after_request
+    def apply_cache_policy(response: Response) -> Response:
+        if (
+            request.method in ("GET", "HEAD")
+            and response.status_code in (200, 304)
+            and "Cache-Control" not in response.headers
+        ):
+            response.headers["Cache-Control"] = cache_control
+        return response
@@ -0,0 +1,68 @@
+"""JSON provider for API responses.
+
+Uses orjson when it is installed (several times faster than the stdlib
+encoder on large lists of documents) and falls back to Flask's default
+provider otherwise. Both variants serialize the Firestore value types that
+documents can contain: timestamps become RFC 3339 strings, GeoPoints become
+``{"latitude", "longitude"}`` and DocumentReferences their document path.
+"""
+
+from __future__ import annotations
+
+import typing as t
+from datetime import date, datetime
+
+from flask.json.provider import DefaultJSONProvider
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.cloud.firestore_v1 import DocumentReference, GeoPoint
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def firestore_default(value: t.Any) -> t.Any:
+    """Encode values the JSON encoders do not handle themselves."""
+    if isinstance(value, DatetimeWithNanoseconds):
+        return value.rfc3339()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, GeoPoint):
+        return {"latitude": value.latitude, "longitude": value.longitude}
+    if isinstance(value, DocumentReference):
+        return value.path
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FirestoreJSONProvider(DefaultJSONProvider):
+    """Flask's default provider, with Firestore-aware ``default``."""
+
+    default = staticmethod(firestore_default)
+
+
+class OrjsonProvider(FirestoreJSONProvider):
+    """orjson-backed provider; ``loads`` stays on the stdlib decoder path."""
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        return self._dumps_bytes(obj).decode()
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
+
+    def _dumps_bytes(self, obj: t.Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+def get_json_provider_class() -> type[DefaultJSONProvider]:
+    return OrjsonProvider if orjson is not None else FirestoreJSONProvider
@@ -0,0 +1,216 @@
+"""Structured, non-blocking logging.
+
+Every record is rendered as one JSON line. Request threads only format the
+record and put it on an in-memory queue (``QueueHandler``); a background
+``QueueListener`` thread writes the lines to stdout, so slow or contended
+output never stalls a request.
+
+Each request gets an id (taken from ``X-Request-ID`` or generated) that is
+attached to every record logged while handling it and echoed back in the
+response. One access record per request is emitted, sampled per endpoint
+through ``LOG_ROUTE_SAMPLE_RATES``; errors and requests slower than
+``LOG_SLOW_REQUEST_MS`` are always logged, together with the timing
+breakdown collected with ``timed()`` / ``record_timing()``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator
+
+from flask import Flask, Response, g, has_request_context, request
+
+from app.config import Config
+
+# Parent of every ``logging.getLogger(__name__)`` in the package and of
+# Flask's ``app.logger``.
+logger = logging.getLogger("app")
+access_logger = logging.getLogger("app.access")
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener_lock = threading.Lock()
+_listener: dict = {"pid": None, "listener": None, "hooks": False}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record, its ``extra`` fields and any traceback as JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class RequestContextFilter(logging.Filter):
+    """Stamp records logged during a request with its id and route."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if has_request_context() and not hasattr(record, "request_id"):
+            record.request_id = getattr(g, "request_id", None)
+            record.endpoint = request.endpoint
+        return True
+
+
+class _PreformattedQueueHandler(logging.handlers.QueueHandler):
+    """Queue the already-rendered JSON line instead of the live record."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        line = self.format(record)
+        return logging.makeLogRecord({"msg": line, "levelno": record.levelno, "levelname": record.levelname})
+
+
+def configure_logging() -> None:
+    """Route the ``app`` loggers through the queue (once per process)."""
+    with _listener_lock:
+        if _listener["pid"] == os.getpid():
+            return
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        queue_handler = _PreformattedQueueHandler(log_queue)
+        queue_handler.setFormatter(JsonFormatter())
+        queue_handler.addFilter(RequestContextFilter())
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("%(message)s"))
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        listener.start()
+
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        logger.setLevel(Config.LOG_LEVEL)
+        logger.propagate = False
+
+        if not _listener["hooks"]:
+            atexit.register(_stop_listener)
+            os.register_at_fork(after_in_child=_reset_after_fork)
+            _listener["hooks"] = True
+        _listener.update(pid=os.getpid(), listener=listener)
+
+
+def _stop_listener() -> None:
+    listener = _listener.get("listener")
+    if listener is not None and _listener["pid"] == os.getpid():
+        listener.stop()
+
+
+def _reset_after_fork() -> None:
+    # Neither the writer thread nor a lock held by another thread survives
+    # fork(); start over in the child.
+    global _listener_lock
+    _listener_lock = threading.Lock()
+    if _listener["pid"] is not None:
+        configure_logging()
+
+
+# ----------------------------------------------------------------------
+# Timing breakdown
+# ----------------------------------------------------------------------
+
+
+def record_timing(name: str, elapsed_ms: float) -> None:
+    """Add ``elapsed_ms`` to the current request's ``name`` timing."""
+    if not has_request_context():
+        return
+    timings = g.setdefault("timings", {})
+    timings[name] = timings.get(name, 0.0) + elapsed_ms
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, (time.perf_counter() - started) * 1000)
+
+
+# ----------------------------------------------------------------------
+# Request logging
+# ----------------------------------------------------------------------
+
+
+def parse_sample_rates(raw: str) -> dict[str, float]:
+    """Parse ``"progress.save_access=0.01,users.get_user=0.5"``."""
+    rates = {}
+    for item in (part.strip() for part in raw.split(",")):
+        if not item:
+            continue
+        endpoint, _, rate = item.partition("=")
+        rates[endpoint.strip()] = float(rate)
+    return rates
+
+
+def init_request_logging(app: Flask) -> None:
+    """Assign request ids and emit one sampled access record per request.
+
+    Call before other ``after_request`` hooks are registered so the access
+    record is written last and its duration covers them.
+    """
+    configure_logging()
+    sample_rates = parse_sample_rates(Config.LOG_ROUTE_SAMPLE_RATES)
+
+    @app.before_request
+    def start_request_log() -> None:
+        g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def write_access_log(response: Response) -> Response:
+        request_id = getattr(g, "request_id", None)
+        if request_id:
+            response.headers["X-Request-ID"] = request_id
+
+        started = getattr(g, "request_started", None)
+        if started is None:
+            return response
+        duration_ms = (time.perf_counter() - started) * 1000
+        slow = duration_ms >= Config.LOG_SLOW_REQUEST_MS
+        failed = response.status_code >= 500
+        rate = sample_rates.get(request.endpoint or "", Config.LOG_SAMPLE_RATE)
+        if not (slow or failed or random.random() < rate):
+            return response
+
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "origin": request.headers.get("Origin"),
+        }
+        firestore_ops = getattr(g, "firestore_ops", None)
+        if firestore_ops:
+            fields["firestore_ops"] = firestore_ops
+        if slow:
+            fields["timings_ms"] = {
+                name: round(value, 2) for name, value in getattr(g, "timings", {}).items()
+            }
+        if rate < 1.0 and not (slow or failed):
+            fields["sample_rate"] = rate
+        level = logging.ERROR if failed else logging.WARNING if slow else logging.INFO
+        access_logger.log(level, "slow request" if slow else "request", extra=fields)
+        return response
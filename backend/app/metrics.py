@@ -0,0 +1,206 @@
+"""Prometheus metrics exposed on ``GET /metrics``.
+
+Tracks, per Flask endpoint, request counts and latency plus the number of
+in-flight requests; and, per repository method (``@instrument_repository``),
+call counts and latency of the Firestore work behind it.
+
+Under a preforking server set ``PROMETHEUS_MULTIPROC_DIR`` to an empty,
+writable directory: every worker then records into memory-mapped files in
+it and ``/metrics`` aggregates all of them. Call ``mark_process_dead(pid)``
+from the server's worker-exit hook (see README) so dead workers' live
+gauges are dropped. Without ``prometheus_client`` installed everything here
+is a no-op and ``/metrics`` answers 503.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import os
+import time
+
+from flask import Flask, Response, g, jsonify, request
+
+from app.log import record_timing
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+# Repository call nesting, so only the outermost call feeds the request's
+# "firestore" timing (inner calls are already part of it).
+_repository_depth: contextvars.ContextVar[int] = contextvars.ContextVar("repository_depth", default=0)
+
+if prometheus_client is not None:
+    HTTP_REQUESTS = Counter(
+        "kampus_http_requests_total",
+        "HTTP requests handled.",
+        ["method", "endpoint", "status"],
+    )
+    HTTP_LATENCY = Histogram(
+        "kampus_http_request_duration_seconds",
+        "HTTP request latency.",
+        ["method", "endpoint", "status"],
+    )
+    HTTP_IN_FLIGHT = Gauge(
+        "kampus_http_requests_in_flight",
+        "HTTP requests currently being handled.",
+        ["endpoint"],
+        multiprocess_mode="livesum",
+    )
+    FIRESTORE_CALLS = Counter(
+        "kampus_firestore_calls_total",
+        "Repository method calls (Firestore access).",
+        ["method", "outcome"],
+    )
+    FIRESTORE_LATENCY = Histogram(
+        "kampus_firestore_call_duration_seconds",
+        "Repository method latency, including every Firestore RPC it issues.",
+        ["method"],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    )
+    REPLICA_LAG = Gauge(
+        "kampus_replica_lag_seconds",
+        "Delay between a catalog change's read time and its arrival in the replica.",
+        ["collection"],
+        multiprocess_mode="livemax",
+    )
+    REPLICA_DOCUMENTS = Gauge(
+        "kampus_replica_documents",
+        "Documents held by the catalog replica.",
+        ["collection"],
+        multiprocess_mode="livemax",
+    )
+    REPLICA_READY = Gauge(
+        "kampus_replica_ready",
+        "1 once the catalog replica has its initial snapshot (minimum across workers).",
+        ["collection"],
+        multiprocess_mode="livemin",
+    )
+    REPLICA_UPDATES = Counter(
+        "kampus_replica_updates_total",
+        "Snapshot updates applied to the catalog replica.",
+        ["collection"],
+    )
+
+
+def _observe_call(name: str, started: float, outcome: str, outermost: bool) -> None:
+    elapsed = time.perf_counter() - started
+    if prometheus_client is not None:
+        FIRESTORE_CALLS.labels(name, outcome).inc()
+        FIRESTORE_LATENCY.labels(name).observe(elapsed)
+    if outermost:
+        record_timing("firestore", elapsed * 1000)
+
+
+def observe_replica(collection: str, lag_seconds: float | None, documents: int, ready: bool) -> None:
+    if prometheus_client is None:
+        return
+    if lag_seconds is not None:
+        REPLICA_LAG.labels(collection).set(lag_seconds)
+    REPLICA_DOCUMENTS.labels(collection).set(documents)
+    REPLICA_READY.labels(collection).set(1 if ready else 0)
+    REPLICA_UPDATES.labels(collection).inc()
+
+
+def _instrument(name: str, func):
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _repository_depth.set(_repository_depth.get() + 1)
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                _repository_depth.reset(token)
+                _observe_call(name, started, outcome, _repository_depth.get() == 0)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _repository_depth.set(_repository_depth.get() + 1)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = func(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            _repository_depth.reset(token)
+            _observe_call(name, started, outcome, _repository_depth.get() == 0)
+
+    return wrapper
+
+
+def instrument_repository(cls):
+    """Class decorator timing every public instance method of a repository.
+
+    Metrics are labelled ``"<Class>.<method>"``. Static and class methods
+    (pure helpers such as id builders) are left alone.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value):
+            continue
+        setattr(cls, attr, _instrument(f"{cls.__name__}.{attr}", value))
+    return cls
+
+
+def _endpoint_label() -> str:
+    # Unmatched URLs share one label to keep cardinality bounded.
+    return request.endpoint or "unmatched"
+
+
+def init_metrics(app: Flask) -> None:
+    """Record request metrics and register ``GET /metrics``."""
+
+    @app.get("/metrics")
+    def metrics():
+        """Prometheus scrape endpoint."""
+        if prometheus_client is None:
+            return jsonify({"error": "prometheus_client is not installed"}), 503
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = prometheus_client.REGISTRY
+        response = Response(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    if prometheus_client is None:
+        return
+
+    @app.before_request
+    def start_request_metrics() -> None:
+        g.metrics_started = time.perf_counter()
+        g.metrics_endpoint = _endpoint_label()
+        HTTP_IN_FLIGHT.labels(g.metrics_endpoint).inc()
+
+    @app.after_request
+    def record_request_metrics(response: Response) -> Response:
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            status = str(response.status_code)
+            HTTP_REQUESTS.labels(request.method, g.metrics_endpoint, status).inc()
+            HTTP_LATENCY.labels(request.method, g.metrics_endpoint, status).observe(time.perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(_exc) -> None:
+        endpoint = g.pop("metrics_endpoint", None)
+        if endpoint is not None:
+            HTTP_IN_FLIGHT.labels(endpoint).dec()
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (multiprocess mode only)."""
+    if prometheus_client is not None and os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
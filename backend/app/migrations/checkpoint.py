@@ -0,0 +1,22 @@
+"""File-backed checkpoints so long-running migrations can resume."""
+
+import json
+import os
+
+
+def load_checkpoint(path: str | None) -> dict:
+    """Return the saved checkpoint state, or an empty dict."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save_checkpoint(path: str | None, state: dict) -> None:
+    """Atomically persist checkpoint state (no-op without a path)."""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(state, handle)
+    os.replace(tmp_path, path)
@@ -0,0 +1,47 @@
+"""Rewrite auto-ID enrollments to ``student_id__course_id`` ids.
+
+Enrollments used to be created with ``collection.document()`` after a
+query checked that the student was not enrolled yet, which let concurrent
+requests create duplicates. The repository now derives the id from the
+pair and creates it with a precondition, so this migration moves every
+legacy enrollment to ``EnrollmentsRepository.enrollment_id`` and folds
+duplicate enrollments of the same student in the same course into one.
+"""
+
+from typing import Callable
+
+from app.migrations.rekey import rekey_collection
+from app.repositories.enrollments_repository import EnrollmentsRepository
+
+COLLECTION = "enrollments"
+
+
+def _target_id(data: dict) -> str | None:
+    keys = (data.get("student_id"), data.get("course_id"))
+    if not all(keys):
+        return None
+    return EnrollmentsRepository.enrollment_id(*keys)
+
+
+def _merge_enrollments(current: dict, legacy: dict) -> dict:
+    """Fold two enrollments of the same student in the same course together."""
+    merged = {**legacy, **current}
+    merged["progress"] = max(current.get("progress", 0), legacy.get("progress", 0))
+    if "active" in (current.get("status"), legacy.get("status")):
+        merged["status"] = "active"
+    values = [item["enrolled_at"] for item in (current, legacy) if item.get("enrolled_at")]
+    if values:
+        merged["enrolled_at"] = min(values)
+    return merged
+
+
+def migrate(
+    batch_size: int = 200,
+    checkpoint_path: str | None = None,
+    dry_run: bool = False,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Migrate and deduplicate the enrollments collection; returns counters."""
+    return rekey_collection(
+        COLLECTION, _target_id, _merge_enrollments, batch_size, checkpoint_path, dry_run, log
+    )
@@ -0,0 +1,72 @@
+"""Rewrite auto-ID progress documents to their deterministic ids.
+
+Legacy ``user_progress`` and ``course_progress`` documents were created with
+``collection.document()`` and located through multi-field queries. The
+repository now addresses them by id, so this migration copies every legacy
+document to ``ProgressRepository.module_progress_id`` /
+``course_progress_id`` and deletes the original. Duplicates that map to the
+same id are folded together.
+
+The migration walks each collection in document-id order and is idempotent:
+already-migrated documents are skipped, so it can be re-run or resumed from
+the checkpoint file after an interruption.
+"""
+
+from typing import Callable
+
+from app.migrations.rekey import rekey_collection
+from app.repositories.progress_repository import ProgressRepository
+
+
+def _module_target_id(data: dict) -> str | None:
+    keys = (data.get("user_id"), data.get("course_id"), data.get("module_id"))
+    if not all(keys):
+        return None
+    return ProgressRepository.module_progress_id(*keys)
+
+
+def _course_target_id(data: dict) -> str | None:
+    keys = (data.get("user_id"), data.get("course_id"))
+    if not all(keys):
+        return None
+    return ProgressRepository.course_progress_id(*keys)
+
+
+def _merge_module_progress(current: dict, legacy: dict) -> dict:
+    """Fold two user_progress documents for the same module together."""
+    merged = {**legacy, **current}
+    merged["times_accessed"] = current.get("times_accessed", 0) + legacy.get("times_accessed", 0)
+    merged["progress_percentage"] = max(
+        current.get("progress_percentage", 0), legacy.get("progress_percentage", 0)
+    )
+    merged["completed"] = bool(current.get("completed") or legacy.get("completed"))
+    for field in ("last_accessed_at", "completed_at"):
+        values = [item[field] for item in (current, legacy) if item.get(field)]
+        if values:
+            merged[field] = max(values)
+    return merged
+
+
+def _merge_course_progress(current: dict, legacy: dict) -> dict:
+    """Keep the most recently updated course_progress document."""
+    if legacy.get("updated_at", "") > current.get("updated_at", ""):
+        return {**current, **legacy}
+    return {**legacy, **current}
+
+
+COLLECTIONS = {
+    "user_progress": (_module_target_id, _merge_module_progress),
+    "course_progress": (_course_target_id, _merge_course_progress),
+}
+
+
+def migrate_collection(
+    collection_name: str,
+    batch_size: int = 200,
+    checkpoint_path: str | None = None,
+    dry_run: bool = False,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Migrate one progress collection and return counters."""
+    target_id_for, merge = COLLECTIONS[collection_name]
+    return rekey_collection(collection_name, target_id_for, merge, batch_size, checkpoint_path, dry_run, log)
@@ -0,0 +1,110 @@
+"""Shared loop for migrations that re-key documents to deterministic ids.
+
+The collection is walked in document-id order, one batch at a time; each
+batch reads the target documents it maps onto, folds duplicates together
+and commits the copies and the deletes of the originals atomically. Runs
+are idempotent (documents already at their target id are skipped) and
+resume from the checkpoint file after an interruption.
+
+Targets that did not exist when the batch was read are written with
+``create``: if the live code creates one meanwhile, the batch fails instead
+of overwriting it, and is read again so that document is folded in.
+"""
+
+from collections import Counter
+from typing import Callable
+
+from google.api_core import exceptions
+
+from app.firebase import get_db
+from app.migrations.checkpoint import load_checkpoint, save_checkpoint
+
+# Each migrated document costs two batched writes (create/set + delete) and
+# a batch holds at most 500 operations.
+MAX_BATCH_SIZE = 250
+
+
+def rekey_collection(
+    collection_name: str,
+    target_id_for: Callable[[dict], str | None],
+    merge: Callable[[dict, dict], dict],
+    batch_size: int = 200,
+    checkpoint_path: str | None = None,
+    dry_run: bool = False,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Move every document of ``collection_name`` to ``target_id_for(data)``.
+
+    Documents whose target already exists (or that share a target) are
+    folded together with ``merge(current, legacy)``. Documents without a
+    target id are counted as invalid and left alone. Returns counters.
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    db = get_db()
+    collection = db.collection(collection_name)
+
+    state = load_checkpoint(checkpoint_path)
+    cursor = state.get(collection_name)
+    stats = {"scanned": 0, "migrated": 0, "merged": 0, "skipped": 0, "invalid": 0}
+
+    while True:
+        query = collection.order_by("__name__").limit(batch_size)
+        if cursor:
+            query = query.start_after({"__name__": cursor})
+        docs = list(query.stream())
+        if not docs:
+            break
+
+        # Group legacy documents by their deterministic target id.
+        counts: Counter = Counter()
+        pending: dict[str, list] = {}
+        for doc in docs:
+            counts["scanned"] += 1
+            target_id = target_id_for(doc.to_dict())
+            if target_id is None:
+                counts["invalid"] += 1
+            elif target_id == doc.id:
+                counts["skipped"] += 1
+            else:
+                pending.setdefault(target_id, []).append(doc)
+
+        if pending:
+            target_refs = [collection.document(target_id) for target_id in pending]
+            existing = {snap.id: snap.to_dict() for snap in db.get_all(target_refs) if snap.exists}
+
+            batch = db.batch()
+            for target_id, legacy_docs in pending.items():
+                merged = existing.get(target_id)
+                for legacy in legacy_docs:
+                    data = legacy.to_dict()
+                    if merged is None:
+                        merged = data
+                    else:
+                        merged = merge(merged, data)
+                        counts["merged"] += 1
+                    batch.delete(legacy.reference)
+                    counts["migrated"] += 1
+                if target_id in existing:
+                    batch.set(collection.document(target_id), merged)
+                else:
+                    batch.create(collection.document(target_id), merged)
+
+            if not dry_run:
+                try:
+                    batch.commit()
+                except exceptions.Conflict:
+                    log(f"{collection_name}: a target was created concurrently, re-reading the batch")
+                    continue
+
+        for key, value in counts.items():
+            stats[key] += value
+        cursor = docs[-1].id
+        if not dry_run:
+            state[collection_name] = cursor
+            save_checkpoint(checkpoint_path, state)
+        log(f"{collection_name}: scanned={stats['scanned']} migrated={stats['migrated']} last_id={cursor}")
+
+        if len(docs) < batch_size:
+            break
+
+    return stats
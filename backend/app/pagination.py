@@ -0,0 +1,109 @@
+"""Cursor-based pagination shared by the list endpoints.
+
+Repositories page through Firestore in document-id order with
+``order_by("__name__")`` + ``start_after``; the API exposes the last document
+id of a page as an opaque, URL-safe ``cursor`` token.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+
+from flask import Response
+
+from app.config import Config
+from app.http_cache import conditional_json, version_etag
+
+
+def encode_cursor(doc_id: str | None) -> str | None:
+    if doc_id is None:
+        return None
+    raw = json.dumps({"after": doc_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> str | None:
+    """Return the document id encoded in ``token``; raises ValueError if invalid."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return str(data["after"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as err:
+        raise ValueError("Invalid cursor") from err
+
+
+def parse_page_args(args) -> tuple[int, str | None, bool]:
+    """Read ``limit``/``cursor`` query parameters.
+
+    Returns ``(limit, start_after, explicit)`` where ``limit`` is clamped to
+    ``Config.MAX_PAGE_SIZE`` and ``explicit`` tells whether the client asked
+    for pagination (and therefore gets the ``{"items", "next_cursor"}`` body).
+    Raises ValueError on malformed input.
+    """
+    raw_limit = args.get("limit")
+    raw_cursor = args.get("cursor")
+
+    limit = Config.MAX_PAGE_SIZE
+    if raw_limit is not None:
+        try:
+            limit = int(raw_limit)
+        except ValueError as err:
+            raise ValueError("limit must be an integer") from err
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        limit = min(limit, Config.MAX_PAGE_SIZE)
+
+    explicit = raw_limit is not None or raw_cursor is not None
+    return limit, decode_cursor(raw_cursor), explicit
+
+
+def fetch_page(query, limit: int | None = None, start_after: str | None = None) -> tuple[list, str | None]:
+    """Run ``query`` one page at a time in document-id order.
+
+    Returns the page's snapshots and the id to resume after, or None when
+    this was the last page. ``limit=None`` streams everything (internal use).
+    """
+    query = query.order_by("__name__")
+    if start_after:
+        query = query.start_after({"__name__": start_after})
+    if limit is None:
+        return list(query.stream()), None
+
+    docs = list(query.limit(limit + 1).stream())
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, docs[-1].id
+    return docs, None
+
+
+def page_documents(documents: list, limit: int | None = None, start_after: str | None = None) -> tuple[list, str | None]:
+    """``fetch_page`` over documents already in memory, sorted by ``id``."""
+    if start_after:
+        documents = [document for document in documents if document["id"] > start_after]
+    if limit is None or len(documents) <= limit:
+        return documents, None
+    documents = documents[:limit]
+    return documents, documents[-1]["id"]
+
+
+def page_response(items: list, next_after: str | None, explicit: bool) -> Response:
+    """Build the JSON response for one page.
+
+    Clients that sent ``limit``/``cursor`` get ``{"items", "next_cursor"}``;
+    legacy clients keep receiving a bare array. Both get ``X-Next-Cursor``
+    when more results exist, and an ETag built from the page's document
+    versions (``304`` on a matching ``If-None-Match``).
+    """
+    next_cursor = encode_cursor(next_after)
+    etag = version_etag(items, next_cursor, explicit)
+    if explicit:
+        response = conditional_json({"items": items, "next_cursor": next_cursor}, etag)
+    else:
+        response = conditional_json(items, etag)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
@@ -0,0 +1,91 @@
+"""Field projection (``?fields=``) for list and get endpoints.
+
+Clients may ask for a subset of a document's fields, either by name
+(``fields=title,teacher_id``) or through a named preset (``fields=summary``).
+Only allowlisted fields can be requested; the resolved list is pushed down to
+Firestore ``select()`` / ``get(field_paths=...)`` by the repositories, so the
+omitted profile and content blobs are never transferred or decoded.
+"""
+
+from __future__ import annotations
+
+PROJECTIONS: dict[str, dict] = {
+    "users": {
+        "allowed": {
+            "name", "email", "role", "status", "photo_url", "phone",
+            "created_at", "updated_at", "last_login", "email_verified", "preferences",
+            "student_id", "program", "semester", "academic_level", "enrollment_year",
+            "employee_id", "department", "position", "admin_level",
+            "bio", "office_location", "specializations", "subjects_taught", "stats",
+        },
+        "presets": {
+            "summary": ["name", "email", "role", "status", "photo_url"],
+            "display": ["name", "email", "photo_url"],
+        },
+    },
+    "courses": {
+        "allowed": {
+            "title", "description", "teacher_id", "status", "category",
+            "image_url", "created_at", "updated_at",
+        },
+        "presets": {
+            "summary": ["title", "teacher_id", "status", "updated_at"],
+        },
+    },
+    "assignments": {
+        "allowed": {
+            "course_id", "title", "description", "instructions", "due_date",
+            "max_points", "attachments", "created_at", "updated_at",
+        },
+        "presets": {
+            "summary": ["course_id", "title", "due_date", "max_points"],
+        },
+    },
+    "enrollments": {
+        "allowed": {"student_id", "course_id", "progress", "status", "enrolled_at"},
+        "presets": {
+            "summary": ["student_id", "course_id", "progress", "status"],
+        },
+    },
+    "user_progress": {
+        "allowed": {
+            "user_id", "course_id", "module_id", "progress_percentage", "completed",
+            "completed_at", "times_accessed", "last_accessed_at",
+        },
+        "presets": {
+            "summary": ["user_id", "course_id", "module_id", "progress_percentage", "completed"],
+        },
+    },
+    "course_progress": {
+        "allowed": {
+            "user_id", "course_id", "total_modules", "completed_modules",
+            "progress_percentage", "updated_at",
+        },
+        "presets": {
+            "summary": ["user_id", "course_id", "progress_percentage"],
+        },
+    },
+}
+
+
+def resolve_fields(collection: str, raw: str | None) -> list[str] | None:
+    """Turn a ``fields`` query value into the field list to select.
+
+    Returns None (all fields) when ``raw`` is empty. Presets and explicit
+    names can be mixed. Raises ValueError for fields outside the allowlist.
+    """
+    if not raw:
+        return None
+
+    projection = PROJECTIONS[collection]
+    fields: list[str] = []
+    for name in (part.strip() for part in raw.split(",")):
+        if not name or name == "id":
+            continue
+        expanded = projection["presets"].get(name, [name])
+        for field in expanded:
+            if field not in projection["allowed"]:
+                raise ValueError(f"Field '{field}' cannot be selected on {collection}")
+            if field not in fields:
+                fields.append(field)
+    return fields or None
@@ -0,0 +1,212 @@
+"""In-process replica of the course catalog (opt-in, ``CATALOG_REPLICA``).
+
+``courses`` and ``course_modules`` are small, read-heavy and rarely change,
+so each process can mirror them in memory with Firestore ``on_snapshot``
+listeners and answer catalog reads without touching Firestore. A replica
+becomes *ready* once its listener has delivered the initial snapshot;
+until then (and whenever the listener is down) the repositories fall back
+to querying Firestore and ``/health`` reports the process as warming up.
+
+Listeners are threads, which do not survive ``fork()``: ``ensure_replicas``
+is called from the repositories and restarts them once per process.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from app.config import Config
+from app.documents import Document
+from app.metrics import observe_replica
+
+logger = logging.getLogger(__name__)
+
+CATALOG_COLLECTIONS = ("courses", "course_modules")
+
+
+class CollectionReplica:
+    """Mirror of one collection, kept current by a snapshot listener."""
+
+    def __init__(self, collection: str) -> None:
+        self.collection = collection
+        self._documents: dict[str, Document] = {}
+        self._sorted_ids: list[str] | None = None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._watch = None
+        self._pid: int | None = None
+        self._updates = 0
+        self._lag_seconds: float | None = None
+        self._last_update: float | None = None
+
+    # --- Lifecycle ---
+
+    def start(self, db) -> None:
+        """Start the listener in this process (no-op if it already runs here).
+
+        A listener whose stream has given up is replaced, reloading the
+        mirror from a fresh initial snapshot.
+        """
+        with self._start_lock:
+            if self._pid == os.getpid() and not self.listener_down:
+                return
+            if self.listener_down:
+                logger.warning("Replica listener is down, restarting it", extra={"collection": self.collection})
+                try:
+                    self._watch.unsubscribe()
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Error closing replica listener", extra={"collection": self.collection})
+                self._watch = None
+                self._pid = None
+            with self._lock:
+                # Anything inherited from a parent process (or delivered by
+                # a dead listener) is stale.
+                self._documents = {}
+                self._sorted_ids = None
+                self._ready.clear()
+            # Claimed only once the listener exists, so a failed start is
+            # retried by the next ensure_replicas() call.
+            self._watch = db.collection(self.collection).on_snapshot(self._on_snapshot)
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        watch, self._watch = self._watch, None
+        if watch is not None:
+            watch.unsubscribe()
+        with self._lock:
+            self._pid = None
+            self._ready.clear()
+
+    def wait_ready(self, timeout: float) -> bool:
+        return self._ready.wait(timeout)
+
+    @property
+    def listener_down(self) -> bool:
+        """True when this process's listener exists but its stream has given up."""
+        # google-cloud-firestore's Watch exposes is_active; it turns False
+        # when the stream gives up, after which the mirror is stale.
+        return (
+            self._pid == os.getpid()
+            and self._watch is not None
+            and getattr(self._watch, "is_active", True) is False
+        )
+
+    @property
+    def ready(self) -> bool:
+        if not self._ready.is_set() or self._pid != os.getpid():
+            return False
+        return not self.listener_down
+
+    def _on_snapshot(self, _snapshots, changes, read_time) -> None:
+        with self._lock:
+            for change in changes:
+                doc = change.document
+                if change.type.name == "REMOVED":
+                    self._documents.pop(doc.id, None)
+                else:
+                    self._documents[doc.id] = Document.from_snapshot(doc)
+            if changes:
+                self._sorted_ids = None
+            self._updates += 1
+            self._last_update = time.monotonic()
+            if read_time is not None:
+                self._lag_seconds = max(0.0, (datetime.now(timezone.utc) - read_time).total_seconds())
+            documents = len(self._documents)
+        if not self._ready.is_set():
+            logger.info("Replica ready", extra={"collection": self.collection, "documents": documents})
+        self._ready.set()
+        observe_replica(self.collection, self._lag_seconds, documents, True)
+
+    def write_through(self, doc_id: str, document: Document | None) -> None:
+        """Apply this process's own write before its snapshot arrives.
+
+        ``document`` is the version read back after the write (None once
+        deleted); a newer version already delivered by the listener wins.
+        """
+        with self._lock:
+            if not self._ready.is_set():
+                return
+            current = self._documents.get(doc_id)
+            if document is None:
+                if current is not None:
+                    del self._documents[doc_id]
+                    self._sorted_ids = None
+                return
+            if (
+                current is not None
+                and current.update_time is not None
+                and document.update_time is not None
+                and current.update_time > document.update_time
+            ):
+                return
+            if current is None:
+                self._sorted_ids = None
+            self._documents[doc_id] = document.copy()
+
+    # --- Reads ---
+
+    def get(self, doc_id: str) -> Document | None:
+        with self._lock:
+            document = self._documents.get(doc_id)
+        return document.copy() if document is not None else None
+
+    def select(self, predicate: Callable[[Document], bool] | None = None) -> list[Document]:
+        """Copies of the matching documents, in document-id order."""
+        with self._lock:
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self._documents)
+            documents = [self._documents[doc_id] for doc_id in self._sorted_ids]
+        return [document.copy() for document in documents if predicate is None or predicate(document)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            age = time.monotonic() - self._last_update if self._last_update is not None else None
+            return {
+                "ready": self.ready,
+                "listener_down": self.listener_down,
+                "documents": len(self._documents),
+                "updates": self._updates,
+                "lag_seconds": round(self._lag_seconds, 3) if self._lag_seconds is not None else None,
+                "seconds_since_update": round(age, 1) if age is not None else None,
+            }
+
+
+replicas = {name: CollectionReplica(name) for name in CATALOG_COLLECTIONS}
+
+
+def ensure_replicas(db) -> None:
+    if Config.CATALOG_REPLICA:
+        for replica in replicas.values():
+            try:
+                replica.start(db)
+            except Exception:  # pylint: disable=broad-except
+                # Reads fall back to Firestore; the next call tries again.
+                logger.exception("Replica listener failed to start", extra={"collection": replica.collection})
+
+
+def get_replica(collection: str) -> CollectionReplica | None:
+    """The collection's replica if it can serve reads right now, else None."""
+    if not Config.CATALOG_REPLICA:
+        return None
+    replica = replicas.get(collection)
+    return replica if replica is not None and replica.ready else None
+
+
+def warm_up(db, timeout: float) -> bool:
+    """Start the listeners and wait up to ``timeout`` seconds for every initial snapshot."""
+    ensure_replicas(db)
+    deadline = time.monotonic() + timeout
+    ready = all(replica.wait_ready(max(0.0, deadline - time.monotonic())) for replica in replicas.values())
+    if not ready:
+        logger.warning("Catalog replica not ready after warm-up", extra={"timeout_s": timeout})
+    return ready
+
+
+def replica_status() -> dict:
+    return {name: replica.stats() for name, replica in replicas.items()}
@@ -1,33 +1,59 @@
 """Assignments repository for Firestore access."""
 
+from __future__ import annotations
+
+from google.api_core import exceptions
+
+from app.cache import MISSING, EntityCache
+from app.config import Config
+from app.documents import Document
 from app.firebase import get_db
+from app.metrics import instrument_repository
+from app.pagination import fetch_page
+
+assignment_cache = EntityCache(
+    "assignments", Config.ENTITY_CACHE_SIZE, Config.ENTITY_CACHE_TTL, Config.ENTITY_CACHE_NEGATIVE_TTL
+)
 
 
+@instrument_repository
 class AssignmentsRepository:
     """Data access layer for assignments collection."""
 
     def __init__(self) -> None:
         self._db = get_db()
+        if Config.ENTITY_CACHE_LISTENER:
+            assignment_cache.watch(self._db)
 
-    def list(self, course_id: str | None = None) -> list[dict]:
-        """List all assignments, optionally filtered by course_id."""
+    def list(
+        self,
+        course_id: str | None = None,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """List assignments one page at a time, optionally filtered by course_id."""
+        query = self._db.collection("assignments")
         if course_id:
-            query = (
-                self._db.collection("assignments")
-                .where("course_id", "==", course_id)
-                .stream()
-            )
-        else:
-            query = self._db.collection("assignments").stream()
+            query = query.where("course_id", "==", course_id)
+        if fields:
+            query = query.select(fields)
+
+        docs, next_after = fetch_page(query, limit, start_after)
+        return [self._doc_to_dict(doc) for doc in docs], next_after
 
-        return [self._doc_to_dict(doc) for doc in query]
+    def get(self, assignment_id: str, fields: list[str] | None = None) -> dict | None:
+        """Get an assignment by ID (read through ``assignment_cache``)."""
+        cached = assignment_cache.get(assignment_id, fields)
+        if cached is not MISSING:
+            return cached
 
-    def get(self, assignment_id: str) -> dict | None:
-        """Get an assignment by ID."""
-        doc = self._db.collection("assignments").document(assignment_id).get()
-        if not doc.exists:
-            return None
-        return self._doc_to_dict(doc)
+        generation = assignment_cache.generation
+        field_paths = None if assignment_cache.enabled else fields
+        doc = self._db.collection("assignments").document(assignment_id).get(field_paths=field_paths)
+        assignment = self._doc_to_dict(doc) if doc.exists else None
+        assignment_cache.set(assignment_id, assignment, generation)
+        return assignment_cache.project(assignment, fields)
 
     def create(self, assignment_data: dict) -> str:
         """Create a new assignment."""
@@ -38,20 +64,32 @@ class AssignmentsRepository:
         doc_ref.set(assignment_data)
         return doc_ref.id
 
-    def update(self, assignment_id: str, updates: dict) -> None:
-        """Update an assignment document."""
+    def update(self, assignment_id: str, updates: dict) -> bool:
+        """Update an assignment document; returns False if it does not exist."""
         from datetime import datetime
         updates["updated_at"] = datetime.utcnow().isoformat() + "Z"
-        self._db.collection("assignments").document(assignment_id).update(updates)
+        try:
+            self._db.collection("assignments").document(assignment_id).update(updates)
+        except exceptions.NotFound:
+            return False
+        finally:
+            assignment_cache.invalidate(assignment_id)
+        return True
 
-    def delete(self, assignment_id: str) -> None:
-        """Delete an assignment document."""
-        self._db.collection("assignments").document(assignment_id).delete()
+    def delete(self, assignment_id: str) -> bool:
+        """Delete an assignment document; returns False if it does not exist."""
+        try:
+            self._db.collection("assignments").document(assignment_id).delete(
+                option=self._db.write_option(exists=True)
+            )
+        except exceptions.NotFound:
+            return False
+        finally:
+            assignment_cache.invalidate(assignment_id)
+        return True
 
     @staticmethod
-    def _doc_to_dict(doc) -> dict:
+    def _doc_to_dict(doc) -> Document:
         """Convert Firestore document to dict with id."""
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return data
+        return Document.from_snapshot(doc)
 
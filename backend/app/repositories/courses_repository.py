@@ -1,34 +1,133 @@
 """Courses repository for Firestore access."""
 
-from app.firebase import get_db
+from __future__ import annotations
 
+from google.api_core import exceptions
 
+from app.cache import MISSING, EntityCache
+from app.config import Config
+from app.documents import Document
+from app.firebase import get_all_chunked, get_db
+from app.metrics import instrument_repository
+from app.pagination import fetch_page, page_documents
+from app.replica import ensure_replicas, get_replica
+
+# Hot course documents are read on most requests; see EntityCache.
+course_cache = EntityCache(
+    "courses", Config.ENTITY_CACHE_SIZE, Config.ENTITY_CACHE_TTL, Config.ENTITY_CACHE_NEGATIVE_TTL
+)
+
+
+@instrument_repository
 class CoursesRepository:
     """Data access layer for courses collection."""
 
     def __init__(self) -> None:
         self._db = get_db()
+        ensure_replicas(self._db)
+        if Config.ENTITY_CACHE_LISTENER:
+            course_cache.watch(self._db)
+
+    def list(
+        self,
+        teacher_id: str | None = None,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        replica = get_replica("courses")
+        if replica is not None:
+            courses = replica.select(lambda course: course.get("teacher_id") == teacher_id if teacher_id else True)
+            page, next_after = page_documents(courses, limit, start_after)
+            return [course.project(fields) for course in page], next_after
 
-    def list(self, teacher_id: str | None = None) -> list[dict]:
+        query = self._db.collection("courses")
         if teacher_id:
-            query = (
-                self._db.collection("courses")
-                .where("teacher_id", "==", teacher_id)
-                .stream()
-            )
-        else:
-            query = self._db.collection("courses").stream()
-
-        return [self._doc_to_dict(doc) for doc in query]
-
-    def get(self, course_id: str) -> dict | None:
-        doc = self._db.collection("courses").document(course_id).get()
-        if not doc.exists:
-            return None
-        return self._doc_to_dict(doc)
+            query = query.where("teacher_id", "==", teacher_id)
+        if fields:
+            query = query.select(fields)
+
+        docs, next_after = fetch_page(query, limit, start_after)
+        return [self._doc_to_dict(doc) for doc in docs], next_after
+
+    def get(self, course_id: str, fields: list[str] | None = None, fresh: bool = False) -> dict | None:
+        """Get a course by id, from the replica or cache when possible.
+
+        ``fresh`` reads Firestore itself (e.g. right after a write, which the
+        replica and the listener-fed cache may not reflect yet) and passes the
+        result on to both.
+        """
+        replica = get_replica("courses")
+        if fresh:
+            generation = course_cache.generation
+            doc = self._db.collection("courses").document(course_id).get()
+            course = self._doc_to_dict(doc) if doc.exists else None
+            course_cache.set(course_id, course, generation)
+            if replica is not None:
+                replica.write_through(course_id, course)
+            return course_cache.project(course, fields)
+
+        if replica is not None:
+            course = replica.get(course_id)
+            return course.project(fields) if course is not None else None
+
+        cached = course_cache.get(course_id, fields)
+        if cached is not MISSING:
+            return cached
+
+        # Full documents are fetched so the cached entry serves any projection.
+        generation = course_cache.generation
+        field_paths = None if course_cache.enabled else fields
+        doc = self._db.collection("courses").document(course_id).get(field_paths=field_paths)
+        course = self._doc_to_dict(doc) if doc.exists else None
+        course_cache.set(course_id, course, generation)
+        return course_cache.project(course, fields)
+
+    def get_many(self, course_ids: list[str], fields: list[str] | None = None) -> dict[str, dict]:
+        """Batch-get courses by id; returns a dict keyed by id, missing ids omitted."""
+        replica = get_replica("courses")
+        if replica is not None:
+            found = {course_id: replica.get(course_id) for course_id in dict.fromkeys(course_ids)}
+            return {course_id: course.project(fields) for course_id, course in found.items() if course is not None}
+
+        courses, missing = course_cache.get_many(dict.fromkeys(course_ids), fields)
+        if not missing:
+            return courses
+
+        collection = self._db.collection("courses")
+        generation = course_cache.generation
+        field_paths = None if course_cache.enabled else fields
+        snapshots = get_all_chunked(self._db, [collection.document(course_id) for course_id in missing], field_paths)
+        for doc in snapshots:
+            course = self._doc_to_dict(doc) if doc.exists else None
+            course_cache.set(doc.id, course, generation)
+            if course is not None:
+                courses[doc.id] = course_cache.project(course, fields)
+        return courses
+
+    def update(self, course_id: str, updates: dict) -> bool:
+        """Update a course; returns False if it does not exist."""
+        try:
+            self._db.collection("courses").document(course_id).update(updates)
+        except exceptions.NotFound:
+            return False
+        finally:
+            course_cache.invalidate(course_id)
+        return True
+
+    def delete(self, course_id: str) -> bool:
+        """Delete a course; returns False if it does not exist."""
+        try:
+            self._db.collection("courses").document(course_id).delete(option=self._db.write_option(exists=True))
+        except exceptions.NotFound:
+            return False
+        finally:
+            course_cache.invalidate(course_id)
+        replica = get_replica("courses")
+        if replica is not None:
+            replica.write_through(course_id, None)
+        return True
 
     @staticmethod
-    def _doc_to_dict(doc) -> dict:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return data
+    def _doc_to_dict(doc) -> Document:
+        return Document.from_snapshot(doc)
@@ -1,57 +1,131 @@
 """Enrollments repository for Firestore access."""
 
-from app.firebase import get_db
+from __future__ import annotations
 
+import threading
 
+from google.api_core import exceptions
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+
+from app.config import Config
+from app.documents import Document
+from app.firebase import ALREADY_EXISTS, RETRYABLE_CODES, get_all_chunked, get_db
+from app.metrics import instrument_repository
+from app.pagination import fetch_page
+
+# Attempts per bulk write before a transient error is reported for the row.
+BULK_MAX_ATTEMPTS = 5
+
+
+@instrument_repository
 class EnrollmentsRepository:
-    """Data access layer for enrollments collection."""
+    """Data access layer for enrollments collection.
+
+    An enrollment's id is derived from its student and course, so creating
+    it with a precondition is what keeps a student from being enrolled in
+    the same course twice.
+    """
 
     def __init__(self) -> None:
         self._db = get_db()
 
-    def list_by_student(self, student_id: str) -> list[dict]:
-        query = (
-            self._db.collection("enrollments")
-            .where("student_id", "==", student_id)
-            .stream()
-        )
-        return [self._doc_to_dict(doc) for doc in query]
+    @staticmethod
+    def enrollment_id(student_id: str, course_id: str) -> str:
+        return f"{student_id}__{course_id}"
 
-    def list_by_course(self, course_id: str) -> list[dict]:
-        query = (
-            self._db.collection("enrollments")
-            .where("course_id", "==", course_id)
-            .stream()
-        )
-        return [self._doc_to_dict(doc) for doc in query]
-
-    def create(self, student_id: str, course_id: str, progress: int = 0) -> str:
-        doc_ref = self._db.collection("enrollments").document()
-        doc_ref.set(
-            {
-                "student_id": student_id,
-                "course_id": course_id,
-                "progress": progress,
-                "status": "active",
-            }
-        )
+    def list_by_student(
+        self,
+        student_id: str,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        query = self._db.collection("enrollments").where("student_id", "==", student_id)
+        if fields:
+            query = query.select(fields)
+        docs, next_after = fetch_page(query, limit, start_after)
+        return [self._doc_to_dict(doc) for doc in docs], next_after
+
+    def list_by_course(
+        self,
+        course_id: str,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        query = self._db.collection("enrollments").where("course_id", "==", course_id)
+        if fields:
+            query = query.select(fields)
+        docs, next_after = fetch_page(query, limit, start_after)
+        return [self._doc_to_dict(doc) for doc in docs], next_after
+
+    def create(self, student_id: str, course_id: str, progress: int = 0) -> str | None:
+        """Create the enrollment in one write; None if it already exists."""
+        doc_ref = self._db.collection("enrollments").document(self.enrollment_id(student_id, course_id))
+        try:
+            doc_ref.create(
+                {
+                    "student_id": student_id,
+                    "course_id": course_id,
+                    "progress": progress,
+                    "status": "active",
+                }
+            )
+        except exceptions.Conflict:
+            return None
         return doc_ref.id
 
-    def delete(self, enrollment_id: str) -> None:
-        self._db.collection("enrollments").document(enrollment_id).delete()
+    def enrolled_students(self, course_id: str, student_ids: list[str]) -> set[str]:
+        """The subset of ``student_ids`` already enrolled in the course (batched point reads)."""
+        collection = self._db.collection("enrollments")
+        by_doc_id = {self.enrollment_id(student_id, course_id): student_id for student_id in student_ids}
+        refs = [collection.document(doc_id) for doc_id in by_doc_id]
+        snapshots = get_all_chunked(self._db, refs, field_paths=["student_id"])
+        return {by_doc_id[snapshot.id] for snapshot in snapshots if snapshot.exists}
+
+    def create_many(self, course_id: str, student_ids: list[str], progress: int = 0) -> dict[str, str | None]:
+        """Create enrollments through a throttled ``BulkWriter``.
+
+        Returns, per student id, None when the enrollment was created,
+        ``"already_enrolled"`` when it existed by the time the write landed,
+        or the error message of a write that failed after retries.
+        """
+        collection = self._db.collection("enrollments")
+        by_doc_id = {self.enrollment_id(student_id, course_id): student_id for student_id in student_ids}
+        results: dict[str, str | None] = {}
+        lock = threading.Lock()
 
-    def exists(self, student_id: str, course_id: str) -> bool:
-        snapshot = (
-            self._db.collection("enrollments")
-            .where("student_id", "==", student_id)
-            .where("course_id", "==", course_id)
-            .limit(1)
-            .stream()
+        def on_result(reference, _result, _writer) -> None:
+            with lock:
+                results[by_doc_id[reference.id]] = None
+
+        def on_error(failure, _writer) -> bool:
+            if failure.code in RETRYABLE_CODES and failure.attempts + 1 < BULK_MAX_ATTEMPTS:
+                return True
+            with lock:
+                student_id = by_doc_id[failure.operation.reference.id]
+                results[student_id] = "already_enrolled" if failure.code == ALREADY_EXISTS else failure.message
+            return False
+
+        writer = self._db.bulk_writer(
+            options=BulkWriterOptions(
+                initial_ops_per_second=Config.BULK_WRITER_INITIAL_OPS_PER_SECOND,
+                max_ops_per_second=Config.BULK_WRITER_MAX_OPS_PER_SECOND,
+            )
         )
-        return any(snapshot)
+        writer.on_write_result(on_result)
+        writer.on_write_error(on_error)
+        for doc_id, student_id in by_doc_id.items():
+            writer.create(
+                collection.document(doc_id),
+                {"student_id": student_id, "course_id": course_id, "progress": progress, "status": "active"},
+            )
+        writer.close()
+        return results
+
+    def delete(self, enrollment_id: str) -> None:
+        self._db.collection("enrollments").document(enrollment_id).delete()
 
     @staticmethod
-    def _doc_to_dict(doc) -> dict:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return data
+    def _doc_to_dict(doc) -> Document:
+        return Document.from_snapshot(doc)
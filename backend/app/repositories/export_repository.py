@@ -0,0 +1,33 @@
+"""Export repository: filtered, projected pages of whole collections."""
+
+from __future__ import annotations
+
+from app.documents import Document
+from app.firebase import get_db
+from app.metrics import instrument_repository
+from app.pagination import fetch_page
+
+
+@instrument_repository
+class ExportRepository:
+    """Pages through an exportable collection in document-id order."""
+
+    def __init__(self) -> None:
+        self._db = get_db()
+
+    def page(
+        self,
+        collection: str,
+        filters: dict[str, object],
+        fields: list[str] | None,
+        limit: int,
+        start_after: str | None = None,
+    ) -> tuple[list[Document], str | None]:
+        """One page of ``collection`` matching the equality ``filters``."""
+        query = self._db.collection(collection)
+        for field, value in filters.items():
+            query = query.where(field, "==", value)
+        if fields:
+            query = query.select(fields)
+        docs, next_after = fetch_page(query, limit, start_after)
+        return [Document.from_snapshot(doc) for doc in docs], next_after
@@ -0,0 +1,79 @@
+"""Bulk import repository: throttled, retried BulkWriter writes."""
+
+from __future__ import annotations
+
+import threading
+
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+
+from app.config import Config
+from app.firebase import ALREADY_EXISTS, RETRYABLE_CODES, get_db
+from app.metrics import instrument_repository
+
+WRITE_MODES = ("create", "set", "merge")
+
+
+@instrument_repository
+class ImportRepository:
+    """Writes imported documents through one ``BulkWriter`` per import.
+
+    The writer is kept open across chunks so its rate limiter keeps ramping
+    up from ``initial_ops_per_second`` towards ``max_ops_per_second`` (the
+    500/50/5 rule) instead of starting over for every chunk.
+    """
+
+    def __init__(
+        self,
+        initial_ops_per_second: int | None = None,
+        max_ops_per_second: int | None = None,
+        max_attempts: int | None = None,
+    ) -> None:
+        self._db = get_db()
+        initial_ops_per_second = initial_ops_per_second or Config.IMPORT_INITIAL_OPS_PER_SECOND
+        max_ops_per_second = max_ops_per_second or Config.IMPORT_MAX_OPS_PER_SECOND
+        self._max_attempts = max_attempts or Config.IMPORT_MAX_ATTEMPTS
+        self._outcomes: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        self._writer = self._db.bulk_writer(
+            options=BulkWriterOptions(
+                initial_ops_per_second=initial_ops_per_second,
+                max_ops_per_second=max(initial_ops_per_second, max_ops_per_second),
+            )
+        )
+        self._writer.on_write_result(self._on_result)
+        self._writer.on_write_error(self._on_error)
+
+    def _on_result(self, reference, _result, _writer) -> None:
+        with self._lock:
+            self._outcomes[reference.id] = None
+
+    def _on_error(self, failure, _writer) -> bool:
+        if failure.code in RETRYABLE_CODES and failure.attempts + 1 < self._max_attempts:
+            return True
+        with self._lock:
+            self._outcomes[failure.operation.reference.id] = (
+                "already_exists" if failure.code == ALREADY_EXISTS else failure.message
+            )
+        return False
+
+    def write(self, collection: str, documents: list[tuple[str, dict]], mode: str = "create") -> dict[str, str | None]:
+        """Write one chunk and wait for it.
+
+        Returns, per document id, None when it was written, ``"already_exists"``
+        when ``mode="create"`` found it in place, or the error message of a
+        write that failed after retries.
+        """
+        collection_ref = self._db.collection(collection)
+        for doc_id, data in documents:
+            reference = collection_ref.document(doc_id)
+            if mode == "create":
+                self._writer.create(reference, data)
+            else:
+                self._writer.set(reference, data, merge=mode == "merge")
+        self._writer.flush()
+        with self._lock:
+            outcomes, self._outcomes = self._outcomes, {}
+        return outcomes
+
+    def close(self) -> None:
+        self._writer.close()
@@ -1,15 +1,73 @@
 """Modules repository for Firestore access."""
 
-from app.firebase import get_db
+import os
+import threading
 
+from app.cache import MISSING, TTLCache
+from app.config import Config
+from app.documents import Document
+from app.firebase import get_async_db, get_db
+from app.metrics import instrument_repository
+from app.replica import ensure_replicas, get_replica
 
+# Course modules change rarely but are read on every progress write, so module
+# lists are cached process-wide. Entries expire after MODULES_CACHE_TTL and,
+# when MODULES_CACHE_LISTENER is on, are dropped as soon as Firestore reports a
+# change to one of the course's modules.
+module_list_cache = TTLCache(maxsize=Config.MODULES_CACHE_SIZE, ttl=Config.MODULES_CACHE_TTL)
+
+_listener_lock = threading.Lock()
+_listener: dict = {"pid": None, "watch": None}
+
+
+def _on_modules_snapshot(_snapshots, changes, _read_time) -> None:
+    for change in changes:
+        data = change.document.to_dict() or {}
+        if data.get("course_id"):
+            module_list_cache.invalidate(data["course_id"])
+        else:
+            module_list_cache.clear()
+
+
+def ensure_modules_listener(db) -> None:
+    """Start the invalidation listener once per process (after any fork)."""
+    if not Config.MODULES_CACHE_LISTENER or not module_list_cache.enabled:
+        return
+    with _listener_lock:
+        if _listener["pid"] == os.getpid():
+            return
+        _listener["watch"] = db.collection("course_modules").on_snapshot(_on_modules_snapshot)
+        _listener["pid"] = os.getpid()
+
+
+def _replica_modules(course_id: str) -> list[dict] | None:
+    """The course's modules in order from the catalog replica, if it is serving."""
+    replica = get_replica("course_modules")
+    if replica is None:
+        return None
+    modules = replica.select(lambda module: module.get("course_id") == course_id)
+    modules.sort(key=lambda m: m.get("order", 0))
+    return modules
+
+
+@instrument_repository
 class ModulesRepository:
     """Data access layer for course modules."""
 
     def __init__(self) -> None:
         self._db = get_db()
+        ensure_modules_listener(self._db)
+        ensure_replicas(self._db)
 
     def list_by_course(self, course_id: str) -> list[dict]:
+        modules = _replica_modules(course_id)
+        if modules is not None:
+            return modules
+
+        cached = module_list_cache.get(course_id)
+        if cached is not MISSING:
+            return [module.copy() for module in cached]
+
         collection = self._db.collection("course_modules")
         try:
             query = collection.where("course_id", "==", course_id).order_by("order").stream()
@@ -18,10 +76,57 @@ class ModulesRepository:
 
         modules = [self._doc_to_dict(doc) for doc in query]
         modules.sort(key=lambda m: m.get("order", 0))
-        return modules
+        module_list_cache.set(course_id, modules)
+        return [module.copy() for module in modules]
+
+    def count_by_course(self, course_id: str) -> int:
+        """Count a course's modules.
+
+        Served from the catalog replica or the module-list cache when either is
+        enabled; otherwise an aggregation query counts them instead of fetching
+        them.
+        """
+        if module_list_cache.enabled or get_replica("course_modules") is not None:
+            return len(self.list_by_course(course_id))
+
+        query = self._db.collection("course_modules").where("course_id", "==", course_id)
+        result = query.count(alias="total").get()
+        return int(result[0][0].value)
 
     @staticmethod
-    def _doc_to_dict(doc) -> dict:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return data
+    def _doc_to_dict(doc) -> Document:
+        return Document.from_snapshot(doc)
+
+
+@instrument_repository
+class AsyncModulesRepository:
+    """``ModulesRepository`` counterpart built on the Firestore AsyncClient.
+
+    Shares the process-wide module-list cache with the sync repository.
+    """
+
+    def __init__(self) -> None:
+        self._db = get_async_db()
+
+    async def list_by_course(self, course_id: str) -> list[dict]:
+        modules = _replica_modules(course_id)
+        if modules is not None:
+            return modules
+
+        cached = module_list_cache.get(course_id)
+        if cached is not MISSING:
+            return [module.copy() for module in cached]
+
+        query = self._db.collection("course_modules").where("course_id", "==", course_id)
+        modules = [ModulesRepository._doc_to_dict(doc) async for doc in query.stream()]
+        modules.sort(key=lambda m: m.get("order", 0))
+        module_list_cache.set(course_id, modules)
+        return [module.copy() for module in modules]
+
+    async def count_by_course(self, course_id: str) -> int:
+        if module_list_cache.enabled or get_replica("course_modules") is not None:
+            return len(await self.list_by_course(course_id))
+
+        query = self._db.collection("course_modules").where("course_id", "==", course_id)
+        result = await query.count(alias="total").get()
+        return int(result[0][0].value)
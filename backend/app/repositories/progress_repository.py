@@ -1,30 +1,91 @@
 """Progress repository for Firestore access."""
 
-from app.firebase import get_db
+from typing import Callable
 
+from firebase_admin import firestore
 
+from app.documents import Document
+from app.firebase import get_all_chunked, get_async_db, get_db
+from app.metrics import instrument_repository
+
+# Firestore accepts at most 500 writes per batch commit.
+BATCH_WRITE_LIMIT = 500
+
+
+class PartialWriteError(Exception):
+    """A batch commit failed after ``committed`` updates had been written.
+
+    Updates are committed in order, so exactly the first ``committed`` ones
+    are stored; retrying those would apply their increments twice.
+    """
+
+    def __init__(self, committed: int) -> None:
+        super().__init__(f"Batch commit failed after {committed} updates were written")
+        self.committed = committed
+
+
+def _merge_monotonic_payload(previous: dict | None, payload: dict) -> dict:
+    """Return ``payload`` with progress_percentage never below the stored value."""
+    merged = dict(payload)
+    if previous and "progress_percentage" in merged:
+        merged["progress_percentage"] = max(
+            previous.get("progress_percentage", 0), merged["progress_percentage"]
+        )
+    return merged
+
+
+def _needs_transaction(payload: dict) -> bool:
+    """Percentage and completion writes must see the stored document."""
+    if payload.get("progress_percentage") is None:
+        payload.pop("progress_percentage", None)
+        return "completed" in payload
+    return True
+
+
+@instrument_repository
 class ProgressRepository:
-    """Data access for user_progress and course_progress collections."""
+    """Data access for user_progress and course_progress collections.
+
+    Documents are keyed deterministically from their owning ids so every
+    lookup is a point read and no write has to query for its target first.
+    """
 
     def __init__(self) -> None:
         self._db = get_db()
 
+    # --- Document ids ---
+
+    @staticmethod
+    def module_progress_id(user_id: str, course_id: str, module_id: str) -> str:
+        return f"{user_id}__{course_id}__{module_id}"
+
+    @staticmethod
+    def course_progress_id(user_id: str, course_id: str) -> str:
+        return f"{user_id}__{course_id}"
+
     # --- User progress ---
 
     def get_module_progress(self, user_id: str, course_id: str, module_id: str) -> dict | None:
-        query = (
-            self._db.collection("user_progress")
-            .where("user_id", "==", user_id)
-            .where("course_id", "==", course_id)
-            .where("module_id", "==", module_id)
-            .limit(1)
-            .stream()
-        )
-        doc = next(iter(query), None)
-        if doc is None:
+        doc = self._module_progress_ref(user_id, course_id, module_id).get()
+        if not doc.exists:
             return None
         return self._doc_to_dict(doc)
 
+    def get_module_progress_many(
+        self, keys: list[tuple[str, str, str]]
+    ) -> dict[tuple[str, str, str], dict]:
+        """Point-read many module progress documents in one ``get_all`` call.
+
+        Returns a dict keyed by (user_id, course_id, module_id); missing
+        documents are omitted.
+        """
+        if not keys:
+            return {}
+        refs = {self.module_progress_id(*key): key for key in keys}
+        collection = self._db.collection("user_progress")
+        snapshots = get_all_chunked(self._db, [collection.document(doc_id) for doc_id in refs])
+        return {refs[doc.id]: self._doc_to_dict(doc) for doc in snapshots if doc.exists}
+
     def list_module_progress(self, user_id: str, course_id: str) -> list[dict]:
         query = (
             self._db.collection("user_progress")
@@ -34,53 +95,285 @@ class ProgressRepository:
         )
         return [self._doc_to_dict(doc) for doc in query]
 
-    def save_module_progress(self, user_id: str, course_id: str, module_id: str, payload: dict) -> None:
-        existing = self.get_module_progress(user_id, course_id, module_id)
-        collection = self._db.collection("user_progress")
-        if existing:
-            doc_ref = collection.document(existing["id"])
-            doc_ref.update(payload)
-        else:
-            doc_ref = collection.document()
-            payload = {
+    def save_module_progress(
+        self, user_id: str, course_id: str, module_id: str, payload: dict
+    ) -> dict | None:
+        """Merge ``payload`` into the module progress document.
+
+        Without a ``progress_percentage`` or ``completed`` flag this is a single
+        blind write. Otherwise it runs in a transaction so the stored
+        percentage never decreases and the caller learns the previous state;
+        the previous document (or None) is returned.
+        """
+        doc_ref = self._module_progress_ref(user_id, course_id, module_id)
+        payload = {
+            **payload,
+            "user_id": user_id,
+            "course_id": course_id,
+            "module_id": module_id,
+        }
+        if not _needs_transaction(payload):
+            doc_ref.set(payload, merge=True)
+            return None
+        return self._merge_monotonic(doc_ref, payload)
+
+    def record_module_access(
+        self,
+        user_id: str,
+        course_id: str,
+        module_id: str,
+        accessed_at: str,
+        progress_percentage: int | None = None,
+    ) -> None:
+        """Count one access to a module without reading it first.
+
+        ``times_accessed`` is bumped with a server-side increment, so only a
+        supplied ``progress_percentage`` needs the transactional path.
+        """
+        payload = {
+            "last_accessed_at": accessed_at,
+            "times_accessed": firestore.Increment(1),
+        }
+        if progress_percentage is not None:
+            payload["progress_percentage"] = progress_percentage
+        self.save_module_progress(user_id, course_id, module_id, payload)
+
+    def write_module_updates(self, updates: list[dict]) -> None:
+        """Apply coalesced module updates with chunked batched writes.
+
+        Each update names its ``user_id``/``course_id``/``module_id``.
+        ``times_accessed`` is applied as a server-side increment and
+        ``progress_percentage`` as a server-side maximum, so no reads are
+        needed; every other field is merged as-is.
+
+        Raises:
+            PartialWriteError: A commit failed; ``committed`` tells how many
+                of the leading updates were written before it.
+        """
+        batch = self._db.batch()
+        pending = 0
+        committed = 0
+        for update in updates:
+            fields = dict(update)
+            times_accessed = fields.pop("times_accessed", 0)
+            progress_percentage = fields.pop("progress_percentage", None)
+            if times_accessed:
+                fields["times_accessed"] = firestore.Increment(times_accessed)
+            if progress_percentage is not None:
+                fields["progress_percentage"] = firestore.Maximum(progress_percentage)
+
+            doc_ref = self._module_progress_ref(
+                fields["user_id"], fields["course_id"], fields["module_id"]
+            )
+            batch.set(doc_ref, fields, merge=True)
+            pending += 1
+            if pending == BATCH_WRITE_LIMIT:
+                committed = self._commit_batch(batch, committed, pending)
+                batch = self._db.batch()
+                pending = 0
+        if pending:
+            self._commit_batch(batch, committed, pending)
+
+    @staticmethod
+    def _commit_batch(batch, committed: int, pending: int) -> int:
+        try:
+            batch.commit()
+        except Exception as exc:
+            raise PartialWriteError(committed) from exc
+        return committed + pending
+
+    def _module_progress_ref(self, user_id: str, course_id: str, module_id: str):
+        doc_id = self.module_progress_id(user_id, course_id, module_id)
+        return self._db.collection("user_progress").document(doc_id)
+
+    def _merge_monotonic(self, doc_ref, payload: dict) -> dict | None:
+        @firestore.transactional
+        def apply(transaction) -> dict | None:
+            snapshot = doc_ref.get(transaction=transaction)
+            previous = snapshot.to_dict() if snapshot.exists else None
+            transaction.set(doc_ref, _merge_monotonic_payload(previous, payload), merge=True)
+            return previous
+
+        return apply(self._db.transaction())
+
+    # --- Course progress ---
+
+    def get_course_progress(self, user_id: str, course_id: str) -> dict | None:
+        doc_id = self.course_progress_id(user_id, course_id)
+        doc = self._db.collection("course_progress").document(doc_id).get()
+        if not doc.exists:
+            return None
+        return self._doc_to_dict(doc)
+
+    def get_course_progress_many(self, keys: list[tuple[str, str]]) -> dict[tuple[str, str], dict]:
+        """Point-read many course summaries with chunked ``get_all`` calls.
+
+        Returns a dict keyed by (user_id, course_id); missing summaries are
+        omitted.
+        """
+        if not keys:
+            return {}
+        refs = {self.course_progress_id(*key): key for key in keys}
+        collection = self._db.collection("course_progress")
+        snapshots = get_all_chunked(self._db, [collection.document(doc_id) for doc_id in refs])
+        return {refs[doc.id]: self._doc_to_dict(doc) for doc in snapshots if doc.exists}
+
+    def save_course_progress(self, user_id: str, course_id: str, payload: dict) -> None:
+        doc_id = self.course_progress_id(user_id, course_id)
+        self._db.collection("course_progress").document(doc_id).set(
+            {
                 **payload,
                 "user_id": user_id,
                 "course_id": course_id,
-                "module_id": module_id,
-            }
-            doc_ref.set(payload)
+            },
+            merge=True,
+        )
 
-    # --- Course progress ---
+    def update_course_progress(
+        self,
+        user_id: str,
+        course_id: str,
+        apply: Callable[[dict | None], dict | None],
+    ) -> dict | None:
+        """Read-modify-write the course summary in a transaction.
 
-    def get_course_progress(self, user_id: str, course_id: str) -> dict | None:
+        ``apply`` receives the current document (or None) and returns the
+        fields to merge, or None to leave it untouched. Returns the merged
+        fields.
+        """
+        doc_id = self.course_progress_id(user_id, course_id)
+        doc_ref = self._db.collection("course_progress").document(doc_id)
+
+        @firestore.transactional
+        def run(transaction) -> dict | None:
+            snapshot = doc_ref.get(transaction=transaction)
+            updates = apply(snapshot.to_dict() if snapshot.exists else None)
+            if updates is not None:
+                transaction.set(
+                    doc_ref,
+                    {**updates, "user_id": user_id, "course_id": course_id},
+                    merge=True,
+                )
+            return updates
+
+        return run(self._db.transaction())
+
+    @staticmethod
+    def _doc_to_dict(doc) -> Document:
+        return Document.from_snapshot(doc)
+
+
+@instrument_repository
+class AsyncProgressRepository:
+    """``ProgressRepository`` counterpart built on the Firestore AsyncClient.
+
+    Uses the same deterministic document ids and write rules, so documents
+    written by either variant are interchangeable.
+    """
+
+    def __init__(self) -> None:
+        self._db = get_async_db()
+
+    # --- User progress ---
+
+    async def get_module_progress(self, user_id: str, course_id: str, module_id: str) -> dict | None:
+        doc = await self._module_progress_ref(user_id, course_id, module_id).get()
+        if not doc.exists:
+            return None
+        return ProgressRepository._doc_to_dict(doc)
+
+    async def list_module_progress(self, user_id: str, course_id: str) -> list[dict]:
         query = (
-            self._db.collection("course_progress")
+            self._db.collection("user_progress")
             .where("user_id", "==", user_id)
             .where("course_id", "==", course_id)
-            .limit(1)
-            .stream()
         )
-        doc = next(iter(query), None)
-        if doc is None:
+        return [ProgressRepository._doc_to_dict(doc) async for doc in query.stream()]
+
+    async def save_module_progress(
+        self, user_id: str, course_id: str, module_id: str, payload: dict
+    ) -> dict | None:
+        """Async ``ProgressRepository.save_module_progress``."""
+        doc_ref = self._module_progress_ref(user_id, course_id, module_id)
+        payload = {
+            **payload,
+            "user_id": user_id,
+            "course_id": course_id,
+            "module_id": module_id,
+        }
+        if not _needs_transaction(payload):
+            await doc_ref.set(payload, merge=True)
             return None
-        return self._doc_to_dict(doc)
 
-    def save_course_progress(self, user_id: str, course_id: str, payload: dict) -> None:
-        existing = self.get_course_progress(user_id, course_id)
-        collection = self._db.collection("course_progress")
-        if existing:
-            collection.document(existing["id"]).update(payload)
-        else:
-            doc_ref = collection.document()
-            payload = {
+        @firestore.async_transactional
+        async def apply(transaction) -> dict | None:
+            snapshot = await doc_ref.get(transaction=transaction)
+            previous = snapshot.to_dict() if snapshot.exists else None
+            transaction.set(doc_ref, _merge_monotonic_payload(previous, payload), merge=True)
+            return previous
+
+        return await apply(self._db.transaction())
+
+    async def record_module_access(
+        self,
+        user_id: str,
+        course_id: str,
+        module_id: str,
+        accessed_at: str,
+        progress_percentage: int | None = None,
+    ) -> None:
+        payload = {
+            "last_accessed_at": accessed_at,
+            "times_accessed": firestore.Increment(1),
+        }
+        if progress_percentage is not None:
+            payload["progress_percentage"] = progress_percentage
+        await self.save_module_progress(user_id, course_id, module_id, payload)
+
+    def _module_progress_ref(self, user_id: str, course_id: str, module_id: str):
+        doc_id = ProgressRepository.module_progress_id(user_id, course_id, module_id)
+        return self._db.collection("user_progress").document(doc_id)
+
+    # --- Course progress ---
+
+    async def get_course_progress(self, user_id: str, course_id: str) -> dict | None:
+        doc_id = ProgressRepository.course_progress_id(user_id, course_id)
+        doc = await self._db.collection("course_progress").document(doc_id).get()
+        if not doc.exists:
+            return None
+        return ProgressRepository._doc_to_dict(doc)
+
+    async def save_course_progress(self, user_id: str, course_id: str, payload: dict) -> None:
+        doc_id = ProgressRepository.course_progress_id(user_id, course_id)
+        await self._db.collection("course_progress").document(doc_id).set(
+            {
                 **payload,
                 "user_id": user_id,
                 "course_id": course_id,
-            }
-            doc_ref.set(payload)
+            },
+            merge=True,
+        )
 
-    @staticmethod
-    def _doc_to_dict(doc) -> dict:
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return data
+    async def update_course_progress(
+        self,
+        user_id: str,
+        course_id: str,
+        apply: Callable[[dict | None], dict | None],
+    ) -> dict | None:
+        """Async ``ProgressRepository.update_course_progress``."""
+        doc_id = ProgressRepository.course_progress_id(user_id, course_id)
+        doc_ref = self._db.collection("course_progress").document(doc_id)
+
+        @firestore.async_transactional
+        async def run(transaction) -> dict | None:
+            snapshot = await doc_ref.get(transaction=transaction)
+            updates = apply(snapshot.to_dict() if snapshot.exists else None)
+            if updates is not None:
+                transaction.set(
+                    doc_ref,
+                    {**updates, "user_id": user_id, "course_id": course_id},
+                    merge=True,
+                )
+            return updates
+
+        return await run(self._db.transaction())
@@ -1,65 +1,159 @@
 """Users repository for Firestore access."""
 
-from app.firebase import get_db
+from __future__ import annotations
 
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
+from google.api_core import exceptions
+
+from app.cache import MISSING, EntityCache
+from app.config import Config
+from app.documents import Document
+from app.firebase import get_all_chunked, get_db
+from app.metrics import instrument_repository
+from app.pagination import fetch_page
+
+# Profiles are read on nearly every request; see EntityCache. The frontend
+# writes users directly to Firestore (signup, profile edits), bypassing the
+# API's invalidation, so profiles are only cached while the listener keeps
+# the cache in step with those writes.
+user_cache = EntityCache(
+    "users",
+    Config.ENTITY_CACHE_SIZE,
+    Config.ENTITY_CACHE_TTL,
+    Config.ENTITY_CACHE_NEGATIVE_TTL,
+    requires_listener=True,
+)
+
+# Stats key -> role value counted for it. Users without a role are students,
+# so ``students`` is what remains of the total (see get_stats).
+ROLE_STATS = {"teachers": "teacher", "admins": "admin"}
+STATS_MAX_WORKERS = 8
+
+
+@instrument_repository
 class UsersRepository:
     """Data access layer for users collection."""
 
     def __init__(self) -> None:
         self._db = get_db()
+        if Config.ENTITY_CACHE_LISTENER:
+            user_cache.watch(self._db)
 
-    def list(self, role: str | None = None) -> list[dict]:
-        """List all users, optionally filtered by role."""
+    def list(
+        self,
+        role: str | None = None,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """List users one page at a time, optionally filtered by role.
+
+        Returns the page and the id to pass as ``start_after`` for the next
+        one (None on the last page).
+        """
+        query = self._db.collection("users")
         if role:
-            query = (
-                self._db.collection("users")
-                .where("role", "==", role)
-                .stream()
-            )
-        else:
-            query = self._db.collection("users").stream()
-
-        return [self._doc_to_dict(doc) for doc in query]
-
-    def get(self, user_id: str) -> dict | None:
-        """Get a user by ID."""
-        doc = self._db.collection("users").document(user_id).get()
-        if not doc.exists:
-            return None
-        return self._doc_to_dict(doc)
-
-    def update(self, user_id: str, updates: dict) -> None:
-        """Update a user document."""
-        self._db.collection("users").document(user_id).update(updates)
-
-    def delete(self, user_id: str) -> None:
-        """Delete a user document."""
-        self._db.collection("users").document(user_id).delete()
-
-    def get_stats(self) -> dict:
-        """Get user statistics by role."""
-        users = self.list()
+            query = query.where("role", "==", role)
+        if fields:
+            query = query.select(fields)
+
+        docs, next_after = fetch_page(query, limit, start_after)
+        return [self._doc_to_dict(doc) for doc in docs], next_after
+
+    def get(self, user_id: str, fields: list[str] | None = None) -> dict | None:
+        """Get a user by ID (read through ``user_cache``)."""
+        cached = user_cache.get(user_id, fields)
+        if cached is not MISSING:
+            return cached
+
+        generation = user_cache.generation
+        field_paths = None if user_cache.enabled else fields
+        doc = self._db.collection("users").document(user_id).get(field_paths=field_paths)
+        user = self._doc_to_dict(doc) if doc.exists else None
+        user_cache.set(user_id, user, generation)
+        return user_cache.project(user, fields)
+
+    def get_many(self, user_ids: list[str], fields: list[str] | None = None) -> dict[str, dict]:
+        """Batch-get users by id; returns a dict keyed by id, missing ids omitted."""
+        users, missing = user_cache.get_many(dict.fromkeys(user_ids), fields)
+        if not missing:
+            return users
+
+        collection = self._db.collection("users")
+        generation = user_cache.generation
+        field_paths = None if user_cache.enabled else fields
+        snapshots = get_all_chunked(self._db, [collection.document(user_id) for user_id in missing], field_paths)
+        for doc in snapshots:
+            user = self._doc_to_dict(doc) if doc.exists else None
+            user_cache.set(doc.id, user, generation)
+            if user is not None:
+                users[doc.id] = user_cache.project(user, fields)
+        return users
+
+    def update(self, user_id: str, updates: dict) -> bool:
+        """Update a user document; returns False if it does not exist."""
+        try:
+            self._db.collection("users").document(user_id).update(updates)
+        except exceptions.NotFound:
+            return False
+        finally:
+            user_cache.invalidate(user_id)
+        return True
+
+    def delete(self, user_id: str) -> bool:
+        """Delete a user document; returns False if it does not exist."""
+        try:
+            self._db.collection("users").document(user_id).delete(option=self._db.write_option(exists=True))
+        except exceptions.NotFound:
+            return False
+        finally:
+            user_cache.invalidate(user_id)
+        return True
+
+    def count(self, filters: dict | None = None) -> int:
+        """Count users matching equality ``filters`` with a count() aggregation."""
+        query = self._db.collection("users")
+        for field, value in (filters or {}).items():
+            query = query.where(field, "==", value)
+        result = query.count(alias="total").get()
+        return int(result[0][0].value)
+
+    def get_stats(self, group_by: dict[str, list] | None = None) -> dict:
+        """Get user statistics by role.
+
+        Every figure is a server-side count() aggregation and they run
+        concurrently, so no user documents are downloaded. ``group_by`` maps
+        extra fields to the values to count, e.g. ``{"status": ["active"]}``;
+        results are returned under ``"groups"``.
+        """
+        counts: dict = {"total": {}, **{key: {"role": role} for key, role in ROLE_STATS.items()}}
+        for field, values in (group_by or {}).items():
+            for value in values:
+                counts[(field, value)] = {field: value}
+
+        with ThreadPoolExecutor(max_workers=min(len(counts), STATS_MAX_WORKERS)) as pool:
+            futures = {
+                key: pool.submit(contextvars.copy_context().run, self.count, filters)
+                for key, filters in counts.items()
+            }
+            results = {key: future.result() for key, future in futures.items()}
+
         stats = {
-            "total": len(users),
-            "students": 0,
-            "teachers": 0,
-            "admins": 0,
+            "total": results["total"],
+            "students": results["total"] - sum(results[key] for key in ROLE_STATS),
+            **{key: results[key] for key in ROLE_STATS},
         }
-        for user in users:
-            role = user.get("role", "student")
-            if role == "student":
-                stats["students"] += 1
-            elif role == "teacher":
-                stats["teachers"] += 1
-            elif role == "admin":
-                stats["admins"] += 1
+        if group_by:
+            stats["groups"] = {
+                field: {value: results[(field, value)] for value in values}
+                for field, values in group_by.items()
+            }
         return stats
 
     @staticmethod
-    def _doc_to_dict(doc) -> dict:
+    def _doc_to_dict(doc) -> Document:
         """Convert Firestore document to dict with id."""
-        data = doc.to_dict()
-        data["id"] = doc.id
-        return data
+        return Document.from_snapshot(doc)
 
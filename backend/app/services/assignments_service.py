@@ -9,13 +9,19 @@ class AssignmentsService:
     def __init__(self, repository: AssignmentsRepository | None = None) -> None:
         self._repository = repository or AssignmentsRepository()
 
-    def list_assignments(self, course_id: str | None = None) -> list[dict]:
-        """List all assignments, optionally filtered by course_id."""
-        return self._repository.list(course_id)
-
-    def get_assignment(self, assignment_id: str) -> dict | None:
+    def list_assignments(
+        self,
+        course_id: str | None = None,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """List one page of assignments, optionally filtered by course_id."""
+        return self._repository.list(course_id, limit, start_after, fields)
+
+    def get_assignment(self, assignment_id: str, fields: list[str] | None = None) -> dict | None:
         """Get an assignment by ID."""
-        return self._repository.get(assignment_id)
+        return self._repository.get(assignment_id, fields)
 
     def create_assignment(self, assignment_data: dict) -> str:
         """Create a new assignment."""
@@ -29,19 +35,14 @@ class AssignmentsService:
 
     def update_assignment(self, assignment_id: str, updates: dict) -> None:
         """Update an assignment."""
-        # Validate that assignment exists
-        assignment = self._repository.get(assignment_id)
-        if not assignment:
-            raise ValueError(f"Assignment {assignment_id} not found")
-
         # Remove id from updates if present
         updates.pop("id", None)
-        self._repository.update(assignment_id, updates)
+        # The update itself fails on a missing document; no read beforehand.
+        if not self._repository.update(assignment_id, updates):
+            raise ValueError(f"Assignment {assignment_id} not found")
 
     def delete_assignment(self, assignment_id: str) -> None:
         """Delete an assignment."""
-        assignment = self._repository.get(assignment_id)
-        if not assignment:
+        if not self._repository.delete(assignment_id):
             raise ValueError(f"Assignment {assignment_id} not found")
-        self._repository.delete(assignment_id)
 
@@ -1,5 +1,7 @@
 """Courses service implementing business logic."""
 
+from datetime import datetime
+
 from app.repositories.courses_repository import CoursesRepository
 
 
@@ -7,8 +9,27 @@ class CoursesService:
     def __init__(self, repository: CoursesRepository | None = None) -> None:
         self._repository = repository or CoursesRepository()
 
-    def list_courses(self, teacher_id: str | None = None) -> list[dict]:
-        return self._repository.list(teacher_id)
+    def list_courses(
+        self,
+        teacher_id: str | None = None,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self._repository.list(teacher_id, limit, start_after, fields)
+
+    def get_course(self, course_id: str, fields: list[str] | None = None) -> dict | None:
+        return self._repository.get(course_id, fields)
+
+    def update_course(self, course_id: str, updates: dict) -> dict | None:
+        """Apply ``updates``; returns the updated course, or None if it does not exist."""
+        updates = {**updates, "updated_at": datetime.utcnow().isoformat() + "Z"}
+        # The id lives in the document name, not in its data
+        updates.pop("id", None)
+        if not self._repository.update(course_id, updates):
+            return None
+        return self._repository.get(course_id, fresh=True)
 
-    def get_course(self, course_id: str) -> dict | None:
-        return self._repository.get(course_id)
+    def delete_course(self, course_id: str) -> bool:
+        """Delete a course; returns False if it does not exist."""
+        return self._repository.delete(course_id)
@@ -0,0 +1,195 @@
+"""Dashboard service composing enrollments, courses and progress."""
+
+from __future__ import annotations
+
+import json
+from typing import Callable
+
+from app.projection import PROJECTIONS
+from app.repositories.courses_repository import CoursesRepository
+from app.repositories.enrollments_repository import EnrollmentsRepository
+from app.repositories.progress_repository import ProgressRepository
+from app.repositories.users_repository import UsersRepository
+
+# ``sort`` values accepted by the course roster.
+ROSTER_SORTS = ("progress", "-progress")
+
+
+class DashboardService:
+    def __init__(
+        self,
+        enrollments_repository: EnrollmentsRepository | None = None,
+        courses_repository: CoursesRepository | None = None,
+        progress_repository: ProgressRepository | None = None,
+        users_repository: UsersRepository | None = None,
+    ) -> None:
+        self._enrollments_repository = enrollments_repository or EnrollmentsRepository()
+        self._courses_repository = courses_repository or CoursesRepository()
+        self._progress_repository = progress_repository or ProgressRepository()
+        self._users_repository = users_repository or UsersRepository()
+
+    def get_student_dashboard(self, student_id: str) -> dict:
+        """Everything the student home page needs in one payload.
+
+        Enrollments are read with one query; courses and course summaries are
+        then batch-loaded with ``get_all`` instead of one read per course.
+        Enrollments without a ``course_id`` (legacy or malformed documents,
+        e.g. written directly by the frontend) are skipped.
+        """
+        enrollments, _ = self._enrollments_repository.list_by_student(student_id)
+        enrollments = [enrollment for enrollment in enrollments if enrollment.get("course_id")]
+        course_ids = [enrollment["course_id"] for enrollment in enrollments]
+
+        courses = self._courses_repository.get_many(course_ids)
+        summaries = self._progress_repository.get_course_progress_many(
+            [(student_id, course_id) for course_id in course_ids]
+        )
+
+        items = []
+        for enrollment in enrollments:
+            course_id = enrollment["course_id"]
+            items.append(
+                {
+                    "enrollment": enrollment,
+                    "course": courses.get(course_id),
+                    "progress": summaries.get((student_id, course_id))
+                    or self._empty_summary(student_id, course_id),
+                }
+            )
+
+        completed = sum(
+            1
+            for item in items
+            if item["progress"]["total_modules"]
+            and item["progress"]["completed_modules"] >= item["progress"]["total_modules"]
+        )
+        percentages = [item["progress"].get("progress_percentage", 0) for item in items]
+        return {
+            "student_id": student_id,
+            "courses": items,
+            "totals": {
+                "courses": len(items),
+                "completed_courses": completed,
+                "average_progress": round(sum(percentages) / len(percentages)) if percentages else 0,
+            },
+        }
+
+    def get_course_roster(
+        self,
+        course_id: str,
+        limit: int | None = None,
+        start_after: str | None = None,
+        sort: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Enrolled students of a course with profile and progress summary.
+
+        Profiles (``display`` fields only) and summaries are batch-loaded with
+        chunked ``get_all`` calls. Without ``sort`` the roster pages through
+        enrollments in Firestore, so only one page is joined per request.
+        Sorting by progress (``progress`` / ``-progress``) needs every
+        summary: all enrollments and summaries are read, then only the
+        requested page's profiles are fetched. Returns the page and where to
+        resume: the last enrollment id, or with ``sort`` its encoded sort
+        key (see ``_slice_page``). Raises ValueError on a bad ``sort`` or
+        cursor.
+        """
+        if sort is not None and sort not in ROSTER_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(ROSTER_SORTS)}")
+
+        if sort is None:
+            enrollments, next_after = self._enrollments_repository.list_by_course(
+                course_id, limit, start_after
+            )
+            # Malformed enrollments without a student are left out.
+            enrollments = [enrollment for enrollment in enrollments if enrollment.get("student_id")]
+            summaries = self._course_summaries(course_id, enrollments)
+        else:
+            enrollments, _ = self._enrollments_repository.list_by_course(course_id)
+            enrollments = [enrollment for enrollment in enrollments if enrollment.get("student_id")]
+            summaries = self._course_summaries(course_id, enrollments)
+
+            def sort_key(enrollment: dict) -> tuple:
+                return (summaries[enrollment["student_id"]].get("progress_percentage", 0), enrollment["id"])
+
+            descending = sort.startswith("-")
+            enrollments.sort(key=sort_key, reverse=descending)
+            enrollments, next_after = self._slice_page(enrollments, sort_key, descending, limit, start_after)
+
+        users = self._users_repository.get_many(
+            [enrollment["student_id"] for enrollment in enrollments],
+            fields=PROJECTIONS["users"]["presets"]["display"],
+        )
+        roster = [
+            {
+                "enrollment_id": enrollment["id"],
+                "student_id": enrollment["student_id"],
+                "status": enrollment.get("status"),
+                "enrolled_at": enrollment.get("enrolled_at"),
+                "user": users.get(enrollment["student_id"]),
+                "progress": summaries[enrollment["student_id"]],
+            }
+            for enrollment in enrollments
+        ]
+        return roster, next_after
+
+    def _course_summaries(self, course_id: str, enrollments: list[dict]) -> dict[str, dict]:
+        """Course summaries keyed by student id, defaulting to an empty summary."""
+        student_ids = [enrollment["student_id"] for enrollment in enrollments]
+        found = self._progress_repository.get_course_progress_many(
+            [(student_id, course_id) for student_id in student_ids]
+        )
+        return {
+            student_id: found.get((student_id, course_id)) or self._empty_summary(student_id, course_id)
+            for student_id in student_ids
+        }
+
+    @staticmethod
+    def _slice_page(
+        items: list[dict],
+        sort_key: Callable[[dict], tuple],
+        descending: bool,
+        limit: int | None,
+        start_after: str | None,
+    ) -> tuple[list[dict], str | None]:
+        """In-memory equivalent of ``fetch_page`` for a list sorted by ``sort_key``.
+
+        The cursor is the JSON-encoded sort key of the last row served and
+        the page resumes at the first row strictly after it, so rows whose
+        progress changes between requests (or that are unenrolled) do not
+        shift the page boundary.
+        """
+        start = 0
+        if start_after:
+            try:
+                progress, enrollment_id = json.loads(start_after)
+            except (ValueError, TypeError) as err:
+                raise ValueError("Invalid cursor") from err
+            if isinstance(progress, bool) or not isinstance(progress, (int, float)) or not isinstance(enrollment_id, str):
+                raise ValueError("Invalid cursor")
+            after = (progress, enrollment_id)
+            start = next(
+                (
+                    index
+                    for index, item in enumerate(items)
+                    if (sort_key(item) < after if descending else sort_key(item) > after)
+                ),
+                len(items),
+            )
+        if limit is None:
+            return items[start:], None
+
+        page = items[start:start + limit]
+        next_after = None
+        if start + limit < len(items):
+            next_after = json.dumps(list(sort_key(page[-1])), separators=(",", ":"))
+        return page, next_after
+
+    @staticmethod
+    def _empty_summary(user_id: str, course_id: str) -> dict:
+        return {
+            "user_id": user_id,
+            "course_id": course_id,
+            "total_modules": 0,
+            "completed_modules": 0,
+            "progress_percentage": 0,
+        }
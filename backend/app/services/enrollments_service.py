@@ -1,22 +1,81 @@
 """Enrollments service."""
 
+from typing import Iterator
+
 from app.repositories.enrollments_repository import EnrollmentsRepository
 
+# Rows checked and written per round of a bulk enrollment.
+BULK_CHUNK_SIZE = 500
+BULK_STATUSES = ("created", "already_enrolled", "duplicate", "invalid", "failed")
+
 
 class EnrollmentsService:
     def __init__(self, repository: EnrollmentsRepository | None = None) -> None:
         self._repository = repository or EnrollmentsRepository()
 
-    def list_by_student(self, student_id: str) -> list[dict]:
-        return self._repository.list_by_student(student_id)
+    def list_by_student(
+        self,
+        student_id: str,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self._repository.list_by_student(student_id, limit, start_after, fields)
 
-    def list_by_course(self, course_id: str) -> list[dict]:
-        return self._repository.list_by_course(course_id)
+    def list_by_course(
+        self,
+        course_id: str,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        return self._repository.list_by_course(course_id, limit, start_after, fields)
 
     def enroll(self, student_id: str, course_id: str, progress: int = 0) -> str:
-        if self._repository.exists(student_id, course_id):
+        enrollment_id = self._repository.create(student_id, course_id, progress)
+        if enrollment_id is None:
             raise ValueError("Student is already enrolled in this course")
-        return self._repository.create(student_id, course_id, progress)
+        return enrollment_id
+
+    def bulk_enroll(self, course_id: str, student_ids: list, chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[list[dict]]:
+        """Enroll many students in a course, yielding row results chunk by chunk.
+
+        Each result is ``{"row", "student_id", "status"}`` (one of
+        ``BULK_STATUSES``) plus ``enrollment_id`` for created rows or
+        ``error`` for invalid and failed ones. Rows are numbered from 1 in
+        upload order; repeats of a student id within the upload are reported
+        as ``duplicate`` and written once.
+        """
+        seen: set[str] = set()
+        for start in range(0, len(student_ids), chunk_size):
+            results = []
+            new: dict[str, dict] = {}
+            for row, raw in enumerate(student_ids[start:start + chunk_size], start + 1):
+                student_id = raw.strip() if isinstance(raw, str) else ""
+                result = {"row": row, "student_id": student_id or raw}
+                results.append(result)
+                if not student_id or "/" in student_id:
+                    result.update(status="invalid", error="student_id must be a non-empty string without '/'")
+                elif student_id in seen:
+                    result["status"] = "duplicate"
+                else:
+                    seen.add(student_id)
+                    new[student_id] = result
+
+            if new:
+                existing = self._repository.enrolled_students(course_id, list(new))
+                for student_id in existing:
+                    new.pop(student_id)["status"] = "already_enrolled"
+                outcomes = self._repository.create_many(course_id, list(new)) if new else {}
+                for student_id, result in new.items():
+                    outcome = outcomes.get(student_id, "Write was not acknowledged")
+                    if outcome is None:
+                        result.update(status="created", enrollment_id=self._repository.enrollment_id(student_id, course_id))
+                    elif outcome == "already_enrolled":
+                        result["status"] = "already_enrolled"
+                    else:
+                        result.update(status="failed", error=outcome)
+            yield results
 
     def unenroll(self, enrollment_id: str) -> None:
         self._repository.delete(enrollment_id)
@@ -0,0 +1,73 @@
+"""Streaming export of whole collections for the data warehouse."""
+
+from __future__ import annotations
+
+from typing import Callable, Iterator
+
+from app.config import Config
+from app.repositories.export_repository import ExportRepository
+
+
+def _flag(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered not in ("true", "false"):
+        raise ValueError("expected true or false")
+    return lowered == "true"
+
+
+# Exportable collections and the equality filters each accepts, with the
+# parser for the query-string value. Equality filters ordered by document id
+# are served by Firestore's single-field indexes, so no composite index is
+# needed per combination.
+EXPORTS: dict[str, dict[str, Callable[[str], object]]] = {
+    "users": {"role": str, "status": str, "program": str},
+    "enrollments": {"student_id": str, "course_id": str, "status": str},
+    "user_progress": {"user_id": str, "course_id": str, "module_id": str, "completed": _flag},
+    "course_progress": {"user_id": str, "course_id": str},
+}
+
+
+def parse_filters(collection: str, args) -> dict[str, object]:
+    """Pick the collection's filters out of the query string; raises ValueError on bad values."""
+    filters = {}
+    for field, parse in EXPORTS[collection].items():
+        raw = args.get(field)
+        if raw is None or raw == "":
+            continue
+        try:
+            filters[field] = parse(raw)
+        except ValueError as err:
+            raise ValueError(f"Invalid value for {field}: {err}") from err
+    return filters
+
+
+class ExportService:
+    def __init__(self, repository: ExportRepository | None = None) -> None:
+        self._repository = repository or ExportRepository()
+
+    def rows(
+        self,
+        collection: str,
+        filters: dict[str, object],
+        fields: list[str] | None = None,
+        start_after: str | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+    ) -> Iterator[dict]:
+        """Yield matching documents in id order, one Firestore page in memory at a time.
+
+        Stops after ``limit`` rows when given; a later export can resume
+        after the last ``id`` it received.
+        """
+        page_size = page_size or Config.EXPORT_PAGE_SIZE
+        remaining = limit
+        while True:
+            size = page_size if remaining is None else min(page_size, remaining)
+            docs, start_after = self._repository.page(collection, filters, fields, size, start_after)
+            yield from docs
+            if remaining is not None:
+                remaining -= len(docs)
+                if remaining <= 0:
+                    return
+            if start_after is None:
+                return
@@ -0,0 +1,90 @@
+"""Bulk import of users, courses, course modules and assignments."""
+
+from __future__ import annotations
+
+from itertools import islice
+from typing import Iterable, Iterator
+
+from app.config import Config
+from app.importing import Row
+from app.repositories.assignments_repository import assignment_cache
+from app.repositories.courses_repository import course_cache
+from app.repositories.import_repository import ImportRepository
+from app.repositories.modules_repository import module_list_cache
+from app.repositories.users_repository import user_cache
+
+ENTITY_CACHES = {"users": user_cache, "courses": course_cache, "assignments": assignment_cache}
+
+
+def _invalidate_caches(collection: str, rows: Iterable[Row]) -> None:
+    if collection == "course_modules":
+        for course_id in {row.data["course_id"] for row in rows}:
+            module_list_cache.invalidate(course_id)
+    elif collection in ENTITY_CACHES:
+        for row in rows:
+            ENTITY_CACHES[collection].invalidate(row.doc_id)
+
+
+class ImportService:
+    """Runs one import; the repository's BulkWriter is closed when it ends."""
+
+    def __init__(self, repository: ImportRepository | None = None) -> None:
+        self._repository = repository
+
+    def run(
+        self,
+        collection: str,
+        rows: Iterable[Row],
+        mode: str = "create",
+        chunk_size: int | None = None,
+        dry_run: bool = False,
+    ) -> Iterator[dict]:
+        """Validate and write ``rows`` chunk by chunk.
+
+        After each chunk has been written, yields the running counters
+        (``read``, ``valid``, ``written``, ``existing``, ``duplicate``,
+        ``invalid``, ``failed``), ``last_line`` - the line to resume after -
+        and ``errors``, the chunk's rejected rows. Only one chunk is held
+        in memory at a time.
+        """
+        chunk_size = chunk_size or Config.IMPORT_CHUNK_SIZE
+        stats = {key: 0 for key in ("read", "valid", "written", "existing", "duplicate", "invalid", "failed")}
+        stats["last_line"] = None
+        rows = iter(rows)
+        if not dry_run and self._repository is None:
+            self._repository = ImportRepository()
+        try:
+            while chunk := list(islice(rows, chunk_size)):
+                errors = []
+                pending: dict[str, Row] = {}
+                for row in chunk:
+                    stats["read"] += 1
+                    if row.error is not None:
+                        stats["invalid"] += 1
+                        errors.append({"line": row.line, "id": row.doc_id, "error": row.error})
+                    elif row.doc_id in pending:
+                        stats["duplicate"] += 1
+                        errors.append({"line": row.line, "id": row.doc_id, "error": "Duplicate id in the same chunk"})
+                    else:
+                        stats["valid"] += 1
+                        pending[row.doc_id] = row
+
+                if pending and not dry_run:
+                    documents = [(doc_id, row.data) for doc_id, row in pending.items()]
+                    outcomes = self._repository.write(collection, documents, mode)
+                    for doc_id, row in pending.items():
+                        outcome = outcomes.get(doc_id, "Write was not acknowledged")
+                        if outcome is None:
+                            stats["written"] += 1
+                        elif outcome == "already_exists":
+                            stats["existing"] += 1
+                        else:
+                            stats["failed"] += 1
+                            errors.append({"line": row.line, "id": doc_id, "error": outcome})
+                    _invalidate_caches(collection, pending.values())
+
+                stats["last_line"] = chunk[-1].line
+                yield {**stats, "errors": errors}
+        finally:
+            if self._repository is not None:
+                self._repository.close()
@@ -0,0 +1,125 @@
+"""Async progress service for the ASGI request pipeline.
+
+Same rules as ``ProgressService`` (see ``ProgressRules``), but built on the
+Firestore AsyncClient so the independent reads of a request — the module
+count, the stored course summary, the module-progress listing — are issued
+concurrently instead of one after another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.repositories.modules_repository import AsyncModulesRepository
+from app.repositories.progress_repository import AsyncProgressRepository
+from app.services.progress_buffer import ProgressWriteBuffer, module_update_key
+from app.services.progress_service import ProgressRules
+
+
+class AsyncProgressService(ProgressRules):
+    def __init__(
+        self,
+        progress_repository: AsyncProgressRepository | None = None,
+        modules_repository: AsyncModulesRepository | None = None,
+        write_buffer: ProgressWriteBuffer | None = None,
+    ) -> None:
+        self._progress_repository = progress_repository or AsyncProgressRepository()
+        self._modules_repository = modules_repository or AsyncModulesRepository()
+        self._write_buffer = write_buffer
+
+    @property
+    def write_behind(self) -> bool:
+        """True when writes are queued instead of applied synchronously."""
+        return self._write_buffer is not None
+
+    # ------------------------------------------------------------------
+    # Module progress
+    # ------------------------------------------------------------------
+
+    async def save_module_access(
+        self,
+        user_id: str,
+        course_id: str,
+        module_id: str,
+        progress_percentage: int | None = None,
+    ) -> None:
+        update = self._access_update(user_id, course_id, module_id, self._timestamp(), progress_percentage)
+        if self._write_buffer is not None:
+            self._write_buffer.add(update)
+            return
+
+        # The access write and the summary check do not depend on each other.
+        await asyncio.gather(
+            self._progress_repository.record_module_access(
+                user_id, course_id, module_id, update["last_accessed_at"], progress_percentage
+            ),
+            self._update_course_progress(user_id, course_id),
+        )
+
+    async def save_module_progress(
+        self,
+        user_id: str,
+        course_id: str,
+        module_id: str,
+        progress_data: dict,
+    ) -> None:
+        update = self._progress_update(user_id, course_id, module_id, self._timestamp(), progress_data)
+        await self._save_update(update)
+
+    async def mark_module_complete(self, user_id: str, course_id: str, module_id: str) -> None:
+        update = self._completion_update(user_id, course_id, module_id, self._timestamp())
+        await self._save_update(update)
+
+    async def get_module_progress(self, user_id: str, course_id: str, module_id: str) -> dict | None:
+        return await self._progress_repository.get_module_progress(user_id, course_id, module_id)
+
+    async def list_course_module_progress(self, user_id: str, course_id: str) -> list[dict]:
+        return await self._progress_repository.list_module_progress(user_id, course_id)
+
+    # ------------------------------------------------------------------
+    # Course progress
+    # ------------------------------------------------------------------
+
+    async def get_course_progress(self, user_id: str, course_id: str) -> dict | None:
+        return await self._progress_repository.get_course_progress(user_id, course_id)
+
+    async def _update_course_progress(self, user_id: str, course_id: str, completed_delta: int = 0) -> None:
+        """Async ``ProgressService._update_course_progress``."""
+        if completed_delta == 0:
+            total_modules, summary = await asyncio.gather(
+                self._modules_repository.count_by_course(course_id),
+                self._progress_repository.get_course_progress(user_id, course_id),
+            )
+            if summary is not None and summary.get("total_modules") == total_modules:
+                return
+        else:
+            total_modules = await self._modules_repository.count_by_course(course_id)
+
+            def adjust(summary: dict | None) -> dict | None:
+                return self._adjusted_course_progress(summary, total_modules, completed_delta)
+
+            if await self._progress_repository.update_course_progress(user_id, course_id, adjust) is not None:
+                return
+
+        await self._recompute_course_progress(user_id, course_id)
+
+    async def _recompute_course_progress(self, user_id: str, course_id: str) -> None:
+        modules, module_progress = await asyncio.gather(
+            self._modules_repository.list_by_course(course_id),
+            self._progress_repository.list_module_progress(user_id, course_id),
+        )
+        payload = self._recomputed_course_progress(modules, module_progress)
+        await self._progress_repository.save_course_progress(user_id, course_id, payload)
+
+    # ------------------------------------------------------------------
+    # Module updates
+    # ------------------------------------------------------------------
+
+    async def _save_update(self, update: dict) -> None:
+        if self._write_buffer is not None:
+            self._write_buffer.add(update)
+            return
+
+        user_id, course_id, module_id = module_update_key(update)
+        previous = await self._progress_repository.save_module_progress(user_id, course_id, module_id, update)
+        await self._update_course_progress(user_id, course_id, self._completed_delta(previous, update))
@@ -0,0 +1,253 @@
+"""In-process write-behind buffer for progress heartbeats.
+
+Module views fire many access/progress events in quick succession. When
+``Config.PROGRESS_WRITE_BEHIND`` is enabled, ``ProgressService`` hands those
+events to a ``ProgressWriteBuffer`` instead of writing them synchronously.
+Events for the same (user, course, module) are coalesced until the next flush,
+which a background thread runs every ``PROGRESS_FLUSH_INTERVAL`` seconds (or
+sooner once ``PROGRESS_BUFFER_MAX_KEYS`` keys are pending).
+
+Buffered data lives only in this process: a hard crash loses at most one
+flush window of heartbeats. Clean shutdowns drain the buffer via ``atexit``.
+
+A failed flush requeues only the updates that were not written (increments
+must not be applied twice). Course summaries that could not be adjusted
+after a successful write are queued separately and rebuilt on the next
+flush by the ``repair`` callable.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class FlushError(Exception):
+    """A flush that was only partly persisted.
+
+    Attributes:
+        unwritten: Updates that were not written and must be retried.
+        stale_courses: ``(user_id, course_id)`` summaries to rebuild.
+    """
+
+    def __init__(self, unwritten: list[dict], stale_courses: set[tuple[str, str]]) -> None:
+        super().__init__(
+            f"{len(unwritten)} updates not written, {len(stale_courses)} course summaries stale"
+        )
+        self.unwritten = unwritten
+        self.stale_courses = stale_courses
+
+
+def module_update_key(update: dict) -> tuple[str, str, str]:
+    return (update["user_id"], update["course_id"], update["module_id"])
+
+
+def merge_module_update(current: dict, update: dict) -> dict:
+    """Coalesce two updates for the same module.
+
+    Access counts are summed, ``progress_percentage`` keeps its maximum,
+    ``last_accessed_at`` keeps the latest timestamp and any other field takes
+    the value from the most recent update.
+    """
+    merged = {**current, **update}
+    merged["times_accessed"] = current.get("times_accessed", 0) + update.get("times_accessed", 0)
+
+    percentages = [
+        value
+        for value in (current.get("progress_percentage"), update.get("progress_percentage"))
+        if value is not None
+    ]
+    if percentages:
+        merged["progress_percentage"] = max(percentages)
+
+    timestamps = [
+        value
+        for value in (current.get("last_accessed_at"), update.get("last_accessed_at"))
+        if value
+    ]
+    if timestamps:
+        merged["last_accessed_at"] = max(timestamps)
+    return merged
+
+
+class ProgressWriteBuffer:
+    """Coalesces module updates and flushes them on a background thread.
+
+    Args:
+        flush: Callable that persists a list of coalesced updates. It may
+            raise ``FlushError`` to report what still needs doing.
+        flush_interval: Seconds between background flushes.
+        max_keys: Pending key count that triggers an early flush.
+        repair: Callable that rebuilds the given ``(user_id, course_id)``
+            summaries and returns those it could not.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[dict]], None],
+        flush_interval: float = 2.0,
+        max_keys: int = 5000,
+        repair: Callable[[set[tuple[str, str]]], set[tuple[str, str]]] | None = None,
+    ) -> None:
+        self._flush = flush
+        self._repair = repair
+        self._flush_interval = flush_interval
+        self._max_keys = max_keys
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._pending: dict[tuple[str, str, str], dict] = {}
+        self._pending_events = 0
+        self._stale_courses: set[tuple[str, str]] = set()
+        self._stats = {
+            "events_received": 0,
+            "updates_flushed": 0,
+            "flushes": 0,
+            "flush_failures": 0,
+            "summaries_repaired": 0,
+            "last_flush_at": None,
+            "last_flush_ms": None,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="progress-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Stop the background thread and drain everything still pending."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def add(self, update: dict) -> None:
+        """Queue one module update, coalescing it with pending ones."""
+        if self._stopped.is_set():
+            # Shutting down: write through so nothing is lost.
+            self._flush([update])
+            return
+
+        key = module_update_key(update)
+        with self._lock:
+            current = self._pending.get(key)
+            self._pending[key] = update if current is None else merge_module_update(current, update)
+            self._pending_events += 1
+            self._stats["events_received"] += 1
+            should_wake = len(self._pending) >= self._max_keys
+
+        if should_wake:
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Persist all pending updates; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                updates = list(self._pending.values())
+                self._pending = {}
+                self._pending_events = 0
+                stale_courses = self._stale_courses
+                self._stale_courses = set()
+            if stale_courses:
+                self._repair_courses(stale_courses)
+            if not updates:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                self._flush(updates)
+            except FlushError as err:
+                logger.exception(
+                    "Flush of %d buffered progress updates was incomplete", len(updates)
+                )
+                self._requeue(err.unwritten)
+                written = len(updates) - len(err.unwritten)
+                with self._lock:
+                    self._stale_courses |= err.stale_courses
+                    self._stats["flush_failures"] += 1
+                    self._stats["updates_flushed"] += written
+                return written
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error flushing %d buffered progress updates", len(updates))
+                self._requeue(updates)
+                with self._lock:
+                    self._stats["flush_failures"] += 1
+                return 0
+
+            with self._lock:
+                self._stats["flushes"] += 1
+                self._stats["updates_flushed"] += len(updates)
+                self._stats["last_flush_at"] = datetime.now(timezone.utc).isoformat()
+                self._stats["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            return len(updates)
+
+    def _repair_courses(self, stale_courses: set[tuple[str, str]]) -> None:
+        if self._repair is None:
+            logger.error("%d course summaries are stale and no repair is configured", len(stale_courses))
+            return
+        try:
+            remaining = self._repair(stale_courses)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Error rebuilding %d course summaries", len(stale_courses))
+            remaining = stale_courses
+        with self._lock:
+            self._stale_courses |= remaining
+            self._stats["summaries_repaired"] += len(stale_courses) - len(remaining)
+
+    def _requeue(self, updates: list[dict]) -> None:
+        with self._lock:
+            for update in updates:
+                key = module_update_key(update)
+                current = self._pending.get(key)
+                # Older (failed) data goes first so newer fields still win.
+                self._pending[key] = update if current is None else merge_module_update(update, current)
+                self._pending_events += 1
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": len(self._pending),
+                "stale_courses": len(self._stale_courses),
+                "pending_events": self._pending_events,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "flush_interval": self._flush_interval,
+                "max_keys": self._max_keys,
+                **self._stats,
+            }
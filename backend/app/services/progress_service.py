@@ -2,20 +2,161 @@
 
 from __future__ import annotations
 
+import atexit
+import logging
 from datetime import datetime, timezone
+from functools import lru_cache
 
+from app.config import Config
 from app.repositories.modules_repository import ModulesRepository
-from app.repositories.progress_repository import ProgressRepository
+from app.repositories.progress_repository import PartialWriteError, ProgressRepository
+from app.services.progress_buffer import (
+    FlushError,
+    ProgressWriteBuffer,
+    merge_module_update,
+    module_update_key,
+)
 
+logger = logging.getLogger(__name__)
 
-class ProgressService:
+
+@lru_cache()
+def get_write_buffer() -> ProgressWriteBuffer | None:
+    """Return the process-wide write-behind buffer, or None when disabled.
+
+    The buffer is created lazily so each forked worker starts its own
+    flushing thread.
+    """
+    if not Config.PROGRESS_WRITE_BEHIND:
+        return None
+
+    buffer = ProgressWriteBuffer(
+        lambda updates: ProgressService().apply_module_updates(updates),
+        flush_interval=Config.PROGRESS_FLUSH_INTERVAL,
+        max_keys=Config.PROGRESS_BUFFER_MAX_KEYS,
+        repair=lambda course_keys: ProgressService().recompute_course_progress_many(course_keys),
+    )
+    buffer.start()
+    atexit.register(buffer.close)
+    return buffer
+
+
+class ProgressRules:
+    """Pure progress rules shared by the sync and async progress services.
+
+    Builds the module updates written for each event type and the course
+    summary payload; no Firestore access happens here.
+    """
+
+    def _course_progress_payload(self, total_modules: int, completed_modules: int) -> dict:
+        progress_percentage = 0
+        if total_modules > 0:
+            progress_percentage = round((completed_modules / total_modules) * 100)
+
+        return {
+            "total_modules": total_modules,
+            "completed_modules": completed_modules,
+            "progress_percentage": progress_percentage,
+            "updated_at": self._timestamp(),
+        }
+
+    def _adjusted_course_progress(
+        self, summary: dict | None, total_modules: int, completed_delta: int
+    ) -> dict | None:
+        """Apply a completion delta to a summary; None if it must be rebuilt."""
+        if summary is None or summary.get("total_modules") != total_modules:
+            return None
+        completed_modules = summary.get("completed_modules", 0) + completed_delta
+        completed_modules = min(max(completed_modules, 0), total_modules)
+        return self._course_progress_payload(total_modules, completed_modules)
+
+    def _recomputed_course_progress(self, modules: list[dict], module_progress: list[dict]) -> dict:
+        """Build a summary from scratch, counting only modules that still exist."""
+        module_ids = {module["id"] for module in modules}
+        completed_modules = sum(
+            1 for item in module_progress if item.get("completed") and item.get("module_id") in module_ids
+        )
+        return self._course_progress_payload(len(modules), completed_modules)
+
+    @staticmethod
+    def _completed_delta(previous: dict | None, payload: dict) -> int:
+        """Return +1/-1 when a write flips a module's completed flag, else 0."""
+        if "completed" not in payload:
+            return 0
+        was_completed = bool(previous and previous.get("completed"))
+        return int(bool(payload["completed"])) - int(was_completed)
+
+    def _event_update(self, event: dict) -> dict:
+        event_type = event.get("type")
+        keys = (event["user_id"], event["course_id"], event["module_id"])
+        timestamp = event.get("timestamp") or self._timestamp()
+        if event_type == "access":
+            return self._access_update(*keys, timestamp, event.get("progress_percentage"))
+        if event_type == "progress":
+            return self._progress_update(*keys, timestamp, event.get("progress_data") or {})
+        if event_type == "complete":
+            return self._completion_update(*keys, timestamp)
+        raise ValueError(f"Unknown progress event type: {event_type}")
+
+    @staticmethod
+    def _access_update(
+        user_id: str, course_id: str, module_id: str, timestamp: str, progress_percentage: int | None
+    ) -> dict:
+        update = {
+            "user_id": user_id,
+            "course_id": course_id,
+            "module_id": module_id,
+            "last_accessed_at": timestamp,
+            "times_accessed": 1,
+        }
+        if progress_percentage is not None:
+            update["progress_percentage"] = progress_percentage
+        return update
+
+    @staticmethod
+    def _progress_update(
+        user_id: str, course_id: str, module_id: str, timestamp: str, progress_data: dict
+    ) -> dict:
+        return {
+            "last_accessed_at": timestamp,
+            **progress_data,
+            "user_id": user_id,
+            "course_id": course_id,
+            "module_id": module_id,
+        }
+
+    @staticmethod
+    def _completion_update(user_id: str, course_id: str, module_id: str, timestamp: str) -> dict:
+        return {
+            "user_id": user_id,
+            "course_id": course_id,
+            "module_id": module_id,
+            "completed": True,
+            "completed_at": timestamp,
+            "last_accessed_at": timestamp,
+            "progress_percentage": 100,
+        }
+
+    @staticmethod
+    def _timestamp() -> str:
+        return datetime.now(timezone.utc).isoformat()
+
+
+class ProgressService(ProgressRules):
     def __init__(
         self,
         progress_repository: ProgressRepository | None = None,
         modules_repository: ModulesRepository | None = None,
+        write_buffer: ProgressWriteBuffer | None = None,
     ) -> None:
         self._progress_repository = progress_repository or ProgressRepository()
         self._modules_repository = modules_repository or ModulesRepository()
+        self._write_buffer = write_buffer
+
+    @property
+    def write_behind(self) -> bool:
+        """True when writes are queued instead of applied synchronously."""
+        return self._write_buffer is not None
 
     # ------------------------------------------------------------------
     # Module progress
@@ -28,20 +169,14 @@ class ProgressService:
         module_id: str,
         progress_percentage: int | None = None,
     ) -> None:
-        now = self._timestamp()
-        existing = self._progress_repository.get_module_progress(user_id, course_id, module_id)
+        update = self._access_update(user_id, course_id, module_id, self._timestamp(), progress_percentage)
+        if self._write_buffer is not None:
+            self._write_buffer.add(update)
+            return
 
-        payload: dict = {
-            "last_accessed_at": now,
-            "times_accessed": (existing.get("times_accessed", 0) + 1) if existing else 1,
-            "completed": existing.get("completed", False) if existing else False,
-        }
-
-        if progress_percentage is not None:
-            current = existing.get("progress_percentage", 0) if existing else 0
-            payload["progress_percentage"] = max(current, progress_percentage)
-
-        self._progress_repository.save_module_progress(user_id, course_id, module_id, payload)
+        self._progress_repository.record_module_access(
+            user_id, course_id, module_id, update["last_accessed_at"], progress_percentage
+        )
         self._update_course_progress(user_id, course_id)
 
     def save_module_progress(
@@ -51,36 +186,91 @@ class ProgressService:
         module_id: str,
         progress_data: dict,
     ) -> None:
-        existing = self._progress_repository.get_module_progress(user_id, course_id, module_id)
-        now = self._timestamp()
+        update = self._progress_update(user_id, course_id, module_id, self._timestamp(), progress_data)
+        self._save_update(update)
 
-        payload: dict = {
-            "last_accessed_at": now,
-            "completed": existing.get("completed", False) if existing else False,
-            **progress_data,
-        }
+    def mark_module_complete(self, user_id: str, course_id: str, module_id: str) -> None:
+        update = self._completion_update(user_id, course_id, module_id, self._timestamp())
+        self._save_update(update)
 
-        if "progress_percentage" in progress_data and existing:
-            payload["progress_percentage"] = max(
-                existing.get("progress_percentage", 0), progress_data["progress_percentage"]
-            )
+    def ingest_events(self, events: list[dict]) -> int:
+        """Apply a batch of access/progress/complete events.
 
-        if "progress_percentage" not in payload and existing:
-            payload["progress_percentage"] = existing.get("progress_percentage", 0)
+        Each event carries ``type``, ``user_id``, ``course_id``, ``module_id``
+        and optionally ``timestamp`` plus ``progress_percentage`` (access) or
+        ``progress_data`` (progress). Events for the same module are coalesced
+        in order, then written together; returns the number of modules touched.
+        """
+        coalesced: dict[tuple[str, str, str], dict] = {}
+        for event in events:
+            update = self._event_update(event)
+            key = module_update_key(update)
+            current = coalesced.get(key)
+            coalesced[key] = update if current is None else merge_module_update(current, update)
 
-        self._progress_repository.save_module_progress(user_id, course_id, module_id, payload)
-        self._update_course_progress(user_id, course_id)
+        updates = list(coalesced.values())
+        if self._write_buffer is not None:
+            for update in updates:
+                self._write_buffer.add(update)
+        else:
+            try:
+                self.apply_module_updates(updates)
+            except FlushError as err:
+                # Summaries of written updates can be rebuilt right away.
+                if err.unwritten or self.recompute_course_progress_many(err.stale_courses):
+                    raise
+        return len(updates)
 
-    def mark_module_complete(self, user_id: str, course_id: str, module_id: str) -> None:
-        now = self._timestamp()
-        payload = {
-            "completed": True,
-            "completed_at": now,
-            "last_accessed_at": now,
-            "progress_percentage": 100,
-        }
-        self._progress_repository.save_module_progress(user_id, course_id, module_id, payload)
-        self._update_course_progress(user_id, course_id)
+    def apply_module_updates(self, updates: list[dict]) -> None:
+        """Persist coalesced module updates in batches.
+
+        Previous completion flags are fetched with a single ``get_all`` so
+        every affected course summary is adjusted once, after the writes.
+
+        Raises:
+            FlushError: Some batches or summary adjustments failed. Its
+                ``unwritten`` updates were not stored and can be retried; the
+                written ones must not be (their increments already landed).
+                Its ``stale_courses`` must be rebuilt with
+                ``recompute_course_progress_many`` rather than adjusted again.
+        """
+        completion_keys = [module_update_key(update) for update in updates if "completed" in update]
+        previous = self._progress_repository.get_module_progress_many(completion_keys)
+
+        unwritten: list[dict] = []
+        try:
+            self._progress_repository.write_module_updates(updates)
+        except PartialWriteError as err:
+            logger.exception("Module progress write failed after %d of %d updates", err.committed, len(updates))
+            updates, unwritten = updates[:err.committed], updates[err.committed:]
+
+        deltas: dict[tuple[str, str], int] = {}
+        for update in updates:
+            key = module_update_key(update)
+            course_key = (key[0], key[1])
+            deltas[course_key] = deltas.get(course_key, 0) + self._completed_delta(previous.get(key), update)
+
+        stale_courses: set[tuple[str, str]] = set()
+        for (user_id, course_id), completed_delta in deltas.items():
+            try:
+                self._update_course_progress(user_id, course_id, completed_delta)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error updating course progress for %s/%s", user_id, course_id)
+                stale_courses.add((user_id, course_id))
+
+        if unwritten or stale_courses:
+            raise FlushError(unwritten, stale_courses)
+
+    def recompute_course_progress_many(self, course_keys: set[tuple[str, str]]) -> set[tuple[str, str]]:
+        """Rebuild the given course summaries; returns the keys that failed."""
+        failed = set()
+        for user_id, course_id in course_keys:
+            try:
+                self._recompute_course_progress(user_id, course_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error rebuilding course progress for %s/%s", user_id, course_id)
+                failed.add((user_id, course_id))
+        return failed
 
     def get_module_progress(self, user_id: str, course_id: str, module_id: str) -> dict | None:
         return self._progress_repository.get_module_progress(user_id, course_id, module_id)
@@ -95,26 +285,44 @@ class ProgressService:
     def get_course_progress(self, user_id: str, course_id: str) -> dict | None:
         return self._progress_repository.get_course_progress(user_id, course_id)
 
-    def _update_course_progress(self, user_id: str, course_id: str) -> None:
-        modules = self._modules_repository.list_by_course(course_id)
-        total_modules = len(modules)
+    def _update_course_progress(self, user_id: str, course_id: str, completed_delta: int = 0) -> None:
+        """Keep the course summary in step with its modules.
 
-        module_progress = self._progress_repository.list_module_progress(user_id, course_id)
-        completed_modules = sum(1 for item in module_progress if item.get("completed"))
+        A change in a module's ``completed`` flag adjusts ``completed_modules``
+        in a transaction; other writes only check that the summary exists.
+        The summary is rebuilt from scratch only when it is missing or the
+        course's module count no longer matches it.
+        """
+        total_modules = self._modules_repository.count_by_course(course_id)
 
-        progress_percentage = 0
-        if total_modules > 0:
-            progress_percentage = round((completed_modules / total_modules) * 100)
+        if completed_delta == 0:
+            summary = self._progress_repository.get_course_progress(user_id, course_id)
+            if summary is not None and summary.get("total_modules") == total_modules:
+                return
+        else:
+            def adjust(summary: dict | None) -> dict | None:
+                return self._adjusted_course_progress(summary, total_modules, completed_delta)
 
-        payload = {
-            "total_modules": total_modules,
-            "completed_modules": completed_modules,
-            "progress_percentage": progress_percentage,
-            "updated_at": self._timestamp(),
-        }
+            if self._progress_repository.update_course_progress(user_id, course_id, adjust) is not None:
+                return
 
+        self._recompute_course_progress(user_id, course_id)
+
+    def _recompute_course_progress(self, user_id: str, course_id: str) -> None:
+        modules = self._modules_repository.list_by_course(course_id)
+        module_progress = self._progress_repository.list_module_progress(user_id, course_id)
+        payload = self._recomputed_course_progress(modules, module_progress)
         self._progress_repository.save_course_progress(user_id, course_id, payload)
 
-    @staticmethod
-    def _timestamp() -> str:
-        return datetime.now(timezone.utc).isoformat()
+    # ------------------------------------------------------------------
+    # Module updates
+    # ------------------------------------------------------------------
+
+    def _save_update(self, update: dict) -> None:
+        if self._write_buffer is not None:
+            self._write_buffer.add(update)
+            return
+
+        user_id, course_id, module_id = module_update_key(update)
+        previous = self._progress_repository.save_module_progress(user_id, course_id, module_id, update)
+        self._update_course_progress(user_id, course_id, self._completed_delta(previous, update))
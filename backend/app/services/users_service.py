@@ -1,7 +1,20 @@
 """Users service implementing business logic."""
 
+from app.cache import MISSING, TTLCache
+from app.config import Config
 from app.repositories.users_repository import UsersRepository
 
+# Fields allowed in ``group_by`` for user stats, with their known values.
+# Fields mapped to None are open-ended: callers must list the values to count.
+STATS_GROUP_FIELDS = {
+    "status": ("active", "inactive", "suspended", "pending"),
+    "academic_level": ("beginner", "intermediate", "advanced"),
+    "program": None,
+}
+
+# The admin dashboard polls stats, so results are reused for a few seconds.
+stats_cache = TTLCache(maxsize=64, ttl=Config.USER_STATS_CACHE_TTL)
+
 
 class UsersService:
     """Service for user-related operations."""
@@ -9,33 +22,57 @@ class UsersService:
     def __init__(self, repository: UsersRepository | None = None) -> None:
         self._repository = repository or UsersRepository()
 
-    def list_users(self, role: str | None = None) -> list[dict]:
-        """List all users, optionally filtered by role."""
-        return self._repository.list(role)
+    def list_users(
+        self,
+        role: str | None = None,
+        limit: int | None = None,
+        start_after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """List one page of users, optionally filtered by role."""
+        return self._repository.list(role, limit, start_after, fields)
 
-    def get_user(self, user_id: str) -> dict | None:
+    def get_user(self, user_id: str, fields: list[str] | None = None) -> dict | None:
         """Get a user by ID."""
-        return self._repository.get(user_id)
+        return self._repository.get(user_id, fields)
 
     def update_user(self, user_id: str, updates: dict) -> None:
         """Update a user."""
-        # Validate that user exists
-        user = self._repository.get(user_id)
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-
         # Remove id from updates if present
         updates.pop("id", None)
-        self._repository.update(user_id, updates)
+        # The update itself fails on a missing document; no read beforehand.
+        if not self._repository.update(user_id, updates):
+            raise ValueError(f"User {user_id} not found")
 
     def delete_user(self, user_id: str) -> None:
         """Delete a user."""
-        user = self._repository.get(user_id)
-        if not user:
+        if not self._repository.delete(user_id):
             raise ValueError(f"User {user_id} not found")
-        self._repository.delete(user_id)
 
-    def get_user_stats(self) -> dict:
-        """Get user statistics."""
-        return self._repository.get_stats()
+    def get_user_stats(
+        self,
+        group_by: list[str] | None = None,
+        group_values: dict[str, list[str]] | None = None,
+    ) -> dict:
+        """Get user statistics, optionally counted per extra fields.
+
+        ``group_values`` supplies the values for open-ended fields such as
+        ``program`` (and may narrow the known ones).
+        """
+        groups: dict[str, list] = {}
+        for field in group_by or []:
+            if field not in STATS_GROUP_FIELDS:
+                allowed = ", ".join(sorted(STATS_GROUP_FIELDS))
+                raise ValueError(f"Cannot group user stats by {field}; allowed: {allowed}")
+            values = (group_values or {}).get(field) or STATS_GROUP_FIELDS[field]
+            if not values:
+                raise ValueError(f"Values are required to group user stats by {field}")
+            groups[field] = list(values)
+
+        cache_key = tuple((field, tuple(values)) for field, values in sorted(groups.items()))
+        stats = stats_cache.get(cache_key)
+        if stats is MISSING:
+            stats = self._repository.get_stats(groups or None)
+            stats_cache.set(cache_key, stats)
+        return stats
 
@@ -0,0 +1,49 @@
+"""List endpoints end to end: routing, Firestore reads, serialization, ETag."""
+
+import pytest
+from conftest import COURSE_ID, STUDENT_ID
+
+from app import create_app
+from app.repositories.modules_repository import module_list_cache
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = create_app()
+    return app.test_client()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/courses/",
+        "/api/courses/?limit=50",
+        "/api/users/?role=student&limit=100&fields=summary",
+        f"/api/enrollments/?student_id={STUDENT_ID}",
+        f"/api/courses/{COURSE_ID}/roster?limit=50",
+    ],
+)
+def test_list_endpoint(measure, client, path):
+    def call():
+        response = client.get(path)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    measure(call)
+
+
+def test_list_modules(measure, client):
+    def call():
+        response = client.get(f"/api/modules/courses/{COURSE_ID}/modules")
+        assert response.status_code == 200
+
+    measure(call, setup=module_list_cache.clear)
+
+
+def test_list_courses_not_modified(measure, client):
+    etag = client.get("/api/courses/?limit=50").headers["ETag"]
+
+    def call():
+        response = client.get("/api/courses/?limit=50", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    measure(call)
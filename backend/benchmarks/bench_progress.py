@@ -0,0 +1,57 @@
+"""ProgressService: heartbeat writes, batched ingestion and course summaries."""
+
+from conftest import COURSE_ID, MODULES_PER_COURSE, STUDENT_ID
+
+from app.repositories.modules_repository import module_list_cache
+from app.services.progress_service import ProgressService
+
+MODULE_IDS = [f"module-{i:06d}" for i in range(MODULES_PER_COURSE)]
+
+
+def test_save_module_access(measure):
+    service = ProgressService()
+    modules = iter(MODULE_IDS * 1000)
+
+    measure(lambda: service.save_module_access(STUDENT_ID, COURSE_ID, next(modules), 50))
+
+
+def test_save_module_access_cold_cache(measure):
+    service = ProgressService()
+    modules = iter(MODULE_IDS * 1000)
+
+    measure(lambda: service.save_module_access(STUDENT_ID, COURSE_ID, next(modules), 50), setup=module_list_cache.clear)
+
+
+def test_mark_module_complete(measure):
+    service = ProgressService()
+    modules = iter(MODULE_IDS * 1000)
+
+    measure(lambda: service.mark_module_complete(STUDENT_ID, COURSE_ID, next(modules)))
+
+
+def test_ingest_events(measure):
+    service = ProgressService()
+    events = [
+        {
+            "type": "access",
+            "user_id": f"user-{i % 10:05d}",
+            "course_id": COURSE_ID,
+            "module_id": MODULE_IDS[i % MODULES_PER_COURSE],
+            "progress_percentage": i % 100,
+        }
+        for i in range(100)
+    ]
+
+    measure(lambda: service.ingest_events(events))
+
+
+def test_list_course_module_progress(measure):
+    service = ProgressService()
+
+    measure(lambda: service.list_course_module_progress(STUDENT_ID, COURSE_ID))
+
+
+def test_get_course_progress(measure):
+    service = ProgressService()
+
+    measure(lambda: service.get_course_progress(STUDENT_ID, COURSE_ID))
@@ -0,0 +1,22 @@
+"""UsersService.get_user_stats: parallel count() aggregations."""
+
+from app.services.users_service import UsersService, stats_cache
+
+
+def test_get_user_stats(measure):
+    service = UsersService()
+
+    measure(service.get_user_stats, setup=stats_cache.clear)
+
+
+def test_get_user_stats_grouped(measure):
+    service = UsersService()
+
+    measure(lambda: service.get_user_stats(["status"]), setup=stats_cache.clear)
+
+
+def test_get_user_stats_cached(measure):
+    service = UsersService()
+    service.get_user_stats()
+
+    measure(service.get_user_stats)
@@ -0,0 +1,156 @@
+"""Fixtures for the service/endpoint microbenchmarks.
+
+Every benchmark runs against ``MemoryFirestore`` (testing/memory_firestore.py)
+seeded with ``scale`` documents per collection. Scales come from
+``BENCH_SCALES`` (default ``1000,10000,100000``) and the simulated latency of
+each RPC from ``BENCH_RPC_LATENCY_MS`` (default 0, i.e. pure CPU cost).
+
+Besides pytest-benchmark's wall-time statistics each result carries, in
+``extra_info``, the simulated RPCs and billed document reads/writes/deletes
+of one call. The stand-in answers queries by scanning the collection, so
+its wall time grows with the scale where Firestore's indexes would not;
+compare RPC and read counts across scales, wall time across commits.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+
+import firebase_admin
+import pytest
+from firebase_admin import credentials, firestore
+
+from app.repositories.assignments_repository import assignment_cache
+from app.repositories.courses_repository import course_cache
+from app.repositories.modules_repository import module_list_cache
+from app.repositories.users_repository import user_cache
+from app.services.users_service import stats_cache
+from testing.memory_firestore import MemoryFirestore
+
+SCALES = [int(value) for value in os.getenv("BENCH_SCALES", "1000,10000,100000").split(",") if value.strip()]
+RPC_LATENCY = float(os.getenv("BENCH_RPC_LATENCY_MS", "0")) / 1000
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "20"))
+
+# Course every benchmark reads from and the student whose progress is tracked.
+COURSE_ID = "course-00000"
+STUDENT_ID = "user-00000"
+MODULES_PER_COURSE = 20
+ROLES = ["student"] * 45 + ["teacher"] * 4 + ["admin"]
+
+
+def seed(store: MemoryFirestore, scale: int) -> None:
+    """Load ``scale`` documents into each collection the app reads."""
+    rng = random.Random(scale)
+    course_ids = [f"course-{i:05d}" for i in range(scale)]
+    user_ids = [f"user-{i:05d}" for i in range(scale)]
+
+    store.load("users", {
+        user_id: {
+            "name": f"User {i}",
+            "email": f"{user_id}@kampus.test",
+            "role": ROLES[i % len(ROLES)],
+            "status": "active" if i % 10 else "inactive",
+        }
+        for i, user_id in enumerate(user_ids)
+    })
+    store.load("courses", {
+        course_id: {"title": f"Course {i}", "teacher_id": user_ids[(i * 7) % scale], "status": "published"}
+        for i, course_id in enumerate(course_ids)
+    })
+    store.load("course_modules", {
+        f"module-{i:06d}": {
+            "course_id": course_ids[i // MODULES_PER_COURSE],
+            "title": f"Module {i}",
+            "order": i % MODULES_PER_COURSE,
+        }
+        for i in range(scale)
+    })
+    enrollments = {}
+    for i in range(scale):
+        student_id = STUDENT_ID if i < 25 else rng.choice(user_ids)
+        course_id = course_ids[i % len(course_ids)] if i < 25 else rng.choice(course_ids)
+        enrollments[f"{student_id}__{course_id}"] = {
+            "student_id": student_id,
+            "course_id": course_id,
+            "status": "active",
+        }
+    store.load("enrollments", enrollments)
+    progress = {}
+    for i in range(scale):
+        user_id = STUDENT_ID if i < MODULES_PER_COURSE else rng.choice(user_ids)
+        course_id = COURSE_ID if i < MODULES_PER_COURSE else rng.choice(course_ids)
+        module_id = f"module-{i % MODULES_PER_COURSE:06d}"
+        progress[f"{user_id}__{course_id}__{module_id}"] = {
+            "user_id": user_id,
+            "course_id": course_id,
+            "module_id": module_id,
+            "progress_percentage": rng.randint(0, 100),
+            "completed": rng.random() < 0.3,
+        }
+    store.load("user_progress", progress)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def firebase_app():
+    # Satisfies init_firebase() without loading credentials; no client
+    # created from it ever reaches the network (see ``store``).
+    if not firebase_admin._apps:  # type: ignore[attr-defined]
+        firebase_admin.initialize_app(credentials.ApplicationDefault(), {"projectId": "memory"})
+
+
+@pytest.fixture(scope="session")
+def seeded_stores() -> dict[int, MemoryFirestore]:
+    return {}
+
+
+@pytest.fixture(params=SCALES, ids=lambda scale: f"{scale}docs")
+def scale(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def store(scale, seeded_stores, monkeypatch) -> MemoryFirestore:
+    """The seeded stand-in for ``scale``, installed as the Firestore client."""
+    if scale not in seeded_stores:
+        seeded_stores[scale] = MemoryFirestore(latency=RPC_LATENCY)
+        seed(seeded_stores[scale], scale)
+    memory = seeded_stores[scale]
+    monkeypatch.setattr(firestore, "client", lambda app=None: memory)
+    for cache in (module_list_cache, stats_cache, course_cache, user_cache, assignment_cache):
+        cache.clear()
+    memory.reset_stats()
+    return memory
+
+
+@pytest.fixture
+def measure(benchmark, store):
+    """Benchmark ``func`` and attach its per-call simulated Firestore cost.
+
+    ``setup`` (optional) runs before every round, outside the timing, e.g.
+    to clear caches so each round pays for its Firestore reads.
+    """
+
+    def run(func, setup=None, rounds: int = ROUNDS):
+        def prepare():
+            if setup is not None:
+                setup()
+            return (), {}
+
+        store.reset_stats()
+        result = benchmark.pedantic(func, setup=prepare, rounds=rounds, iterations=1, warmup_rounds=0)
+        stats = store.snapshot_stats()
+        benchmark.extra_info.update(
+            {
+                "rpcs_per_call": stats.get("rpcs", 0) / rounds,
+                "reads_per_call": stats.get("documents_read", 0) / rounds,
+                "writes_per_call": stats.get("documents_written", 0) / rounds,
+                "deletes_per_call": stats.get("documents_deleted", 0) / rounds,
+                "rpcs_by_method": {
+                    name.removeprefix("rpc."): count / rounds for name, count in stats.items() if name.startswith("rpc.")
+                },
+            }
+        )
+        return result
+
+    return run
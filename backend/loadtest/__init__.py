@@ -0,0 +1 @@
+"""Load test harness for the Kampus API (see README, "Pruebas de carga")."""
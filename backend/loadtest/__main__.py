@@ -0,0 +1,119 @@
+"""Command line entry point: ``python -m loadtest --help``."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import click
+
+from loadtest import runner
+from loadtest.dataset import Dataset, seed
+from loadtest.scenarios import SCENARIOS
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _in_process_app(memory: bool, latency_ms: float, dataset: Dataset, seed_data: bool):
+    # In-process runs share stdout with the app; keep only slow and failed
+    # requests in its access log unless the caller asked otherwise.
+    os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    from app import create_app
+    from app.firebase import get_db
+
+    if memory:
+        from testing.memory_firestore import MemoryFirestore
+
+        store = MemoryFirestore(latency=latency_ms / 1000)
+        if not firebase_admin._apps:  # type: ignore[attr-defined]
+            firebase_admin.initialize_app(credentials.ApplicationDefault(), {"projectId": "memory"})
+        firestore.client = lambda app=None: store
+        seed(store, dataset)
+        store.reset_stats()
+        return create_app()
+
+    if seed_data:
+        seed(get_db(), dataset)
+    return create_app()
+
+
+@click.command()
+@click.option("--scenario", type=click.Choice(sorted(SCENARIOS)), default="semester-start", show_default=True)
+@click.option(
+    "--target",
+    default="memory",
+    show_default=True,
+    help="'memory' (in-process app on the in-memory stand-in), 'app' (in-process app on the "
+    "configured Firestore, e.g. FIRESTORE_EMULATOR_HOST) or a base URL such as http://localhost:8000.",
+)
+@click.option("--duration", default=30.0, show_default=True, help="Seconds to run.")
+@click.option("--concurrency", default=16, show_default=True, help="Concurrent closed-loop clients.")
+@click.option("--requests", "max_requests", type=int, default=None, help="Stop after this many requests.")
+@click.option("--latency-ms", default=5.0, show_default=True, help="Simulated RPC latency (memory target).")
+@click.option("--students", default=Dataset.students, show_default=True)
+@click.option("--courses", default=Dataset.courses, show_default=True)
+@click.option("--seed/--no-seed", "seed_data", default=False, help="Seed the dataset first ('app' target; memory always is).")
+@click.option("--slo", multiple=True, help="e.g. 'progress.save_access:p95_ms=50,writes=2' or '*:error_rate=0.01'.")
+@click.option("--output", type=click.Path(dir_okay=False), default=None, help="Write the JSON results here.")
+@click.option("--random-seed", default=0, show_default=True, help="Seed for the request generators.")
+def main(scenario, target, duration, concurrency, max_requests, latency_ms, students, courses, seed_data, slo,
+         output, random_seed):
+    """Run a traffic scenario against the API and report latency, throughput and Firestore ops."""
+    try:
+        slos = runner.parse_slos(list(slo))
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="--slo") from err
+
+    dataset = Dataset(students=students, courses=courses)
+    if target in ("memory", "app"):
+        load_target = runner.InProcessTarget(_in_process_app(target == "memory", latency_ms, dataset, seed_data))
+        load_target.description = target
+    else:
+        load_target = runner.HttpTarget(target)
+
+    started_at = datetime.now(timezone.utc)
+    samples, elapsed = runner.run(
+        SCENARIOS[scenario], load_target, dataset, duration, concurrency, max_requests, random_seed
+    )
+    summary = runner.summarize(samples, elapsed)
+    slo_results = runner.check_slos(summary, slos)
+    result = {
+        "scenario": scenario,
+        "description": SCENARIOS[scenario].description,
+        "target": load_target.description,
+        "started_at": started_at.isoformat(),
+        "elapsed_s": round(elapsed, 3),
+        "concurrency": concurrency,
+        "latency_ms": latency_ms if target == "memory" else None,
+        "dataset": asdict(dataset),
+        "revision": _git_revision(),
+        "summary": summary,
+        "slos": slo_results,
+        "passed": all(item["passed"] is not False for item in slo_results),
+    }
+
+    click.echo(runner.format_report(result))
+    if output:
+        with open(output, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+    if not result["passed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,110 @@
+"""Synthetic semester data the load scenarios draw their ids from."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+
+@dataclass(frozen=True)
+class Dataset:
+    students: int = 5000
+    teachers: int = 100
+    admins: int = 5
+    courses: int = 200
+    modules_per_course: int = 12
+    # Enrollments seeded up front; the enrollment spike adds more at run time.
+    courses_per_student: int = 3
+
+    def student_id(self, index: int) -> str:
+        return f"student-{index:06d}"
+
+    def teacher_id(self, index: int) -> str:
+        return f"teacher-{index:04d}"
+
+    def admin_id(self, index: int) -> str:
+        return f"admin-{index:03d}"
+
+    def course_id(self, index: int) -> str:
+        return f"course-{index:05d}"
+
+    def module_id(self, course_index: int, order: int) -> str:
+        return f"module-{course_index:05d}-{order:02d}"
+
+    def teacher_of(self, course_index: int) -> int:
+        return course_index % self.teachers
+
+    def enrolled_courses(self, student_index: int) -> list[int]:
+        """Course indexes a student is enrolled in by the seed data."""
+        rng = random.Random(student_index)
+        count = min(self.courses_per_student, self.courses)
+        return rng.sample(range(self.courses), count)
+
+    def documents(self):
+        """Yield ``(collection, doc_id, data)`` for every seeded document."""
+        now = datetime.now(timezone.utc)
+        for i in range(self.students):
+            yield "users", self.student_id(i), {
+                "name": f"Student {i}",
+                "email": f"{self.student_id(i)}@kampus.test",
+                "role": "student",
+                "status": "active",
+                "created_at": now,
+            }
+        for i in range(self.teachers):
+            yield "users", self.teacher_id(i), {
+                "name": f"Teacher {i}",
+                "email": f"{self.teacher_id(i)}@kampus.test",
+                "role": "teacher",
+                "status": "active",
+                "created_at": now,
+            }
+        for i in range(self.admins):
+            yield "users", self.admin_id(i), {
+                "name": f"Admin {i}",
+                "email": f"{self.admin_id(i)}@kampus.test",
+                "role": "admin",
+                "status": "active",
+                "created_at": now,
+            }
+        for c in range(self.courses):
+            yield "courses", self.course_id(c), {
+                "title": f"Course {c}",
+                "teacher_id": self.teacher_id(self.teacher_of(c)),
+                "status": "published",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for order in range(self.modules_per_course):
+                yield "course_modules", self.module_id(c, order), {
+                    "course_id": self.course_id(c),
+                    "title": f"Module {order + 1}",
+                    "order": order,
+                }
+        for s in range(self.students):
+            for c in self.enrolled_courses(s):
+                yield "enrollments", f"{self.student_id(s)}__{self.course_id(c)}", {
+                    "student_id": self.student_id(s),
+                    "course_id": self.course_id(c),
+                    "progress": 0,
+                    "status": "active",
+                    "enrolled_at": now,
+                }
+
+
+def seed(db, dataset: Dataset, batch_size: int = 500) -> int:
+    """Write ``dataset`` through ``db`` in batches; returns the document count."""
+    batch = db.batch()
+    pending = written = 0
+    for collection, doc_id, data in dataset.documents():
+        batch.set(db.collection(collection).document(doc_id), data)
+        pending += 1
+        written += 1
+        if pending >= batch_size:
+            batch.commit()
+            batch = db.batch()
+            pending = 0
+    if pending:
+        batch.commit()
+    return written
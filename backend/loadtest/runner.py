@@ -0,0 +1,272 @@
+"""Closed-loop load generation, per-endpoint statistics and SLO checks."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from loadtest.dataset import Dataset
+from loadtest.scenarios import Request, Scenario
+
+OPERATIONS = ("reads", "writes", "deletes")
+# Metrics where a larger value is better; SLOs on them are lower bounds.
+MINIMUM_METRICS = {"rps"}
+SLO_METRICS = {"p50_ms", "p95_ms", "p99_ms", "max_ms", "error_rate", "rps", *OPERATIONS}
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    latency_ms: float
+    ops: dict[str, int] | None
+
+
+def parse_ops(header: str | None) -> dict[str, int] | None:
+    """Parse ``X-Firestore-Ops: reads=3, writes=1, deletes=0``."""
+    if not header:
+        return None
+    ops = {}
+    for part in header.split(","):
+        name, _, value = part.strip().partition("=")
+        if name in OPERATIONS:
+            ops[name] = int(value)
+    return ops
+
+
+# ----------------------------------------------------------------------
+# Targets
+# ----------------------------------------------------------------------
+
+
+class InProcessTarget:
+    """Drives a Flask app through its test client (one client per worker)."""
+
+    def __init__(self, app) -> None:
+        self._app = app
+        self.description = "in-process"
+
+    def session(self):
+        client = self._app.test_client()
+
+        def send(request: Request, headers: dict) -> tuple[int, dict]:
+            response = client.open(request.path, method=request.method, json=request.json, headers=headers)
+            response.close()
+            return response.status_code, response.headers
+
+        return send
+
+
+class HttpTarget:
+    """Drives a running server over keep-alive HTTP connections."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0) -> None:
+        parts = urlsplit(base_url)
+        self._https = parts.scheme == "https"
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self.description = base_url
+
+    def session(self):
+        connection_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        connection = connection_class(self._netloc, timeout=self._timeout)
+
+        def send(request: Request, headers: dict) -> tuple[int, dict]:
+            body = None
+            headers = {"Accept-Encoding": "gzip, br", **headers}
+            if request.json is not None:
+                body = json.dumps(request.json)
+                headers["Content-Type"] = "application/json"
+            try:
+                connection.request(request.method, self._prefix + request.path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+            return response.status, {key.title(): value for key, value in response.getheaders()}
+
+        return send
+
+
+# ----------------------------------------------------------------------
+# Running
+# ----------------------------------------------------------------------
+
+
+def run(
+    scenario: Scenario,
+    target,
+    dataset: Dataset,
+    duration: float,
+    concurrency: int,
+    max_requests: int | None = None,
+    seed: int = 0,
+) -> tuple[list[Sample], float]:
+    """Run ``concurrency`` closed-loop workers for ``duration`` seconds.
+
+    Returns the samples and the elapsed wall time.
+    """
+    samples: list[Sample] = []
+    samples_lock = threading.Lock()
+    issued = iter(range(max_requests)) if max_requests else None
+    issued_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed * 10_000 + index)
+        send = target.session()
+        etags: dict[str, str] = {}
+        local: list[Sample] = []
+        while time.perf_counter() < deadline:
+            if issued is not None:
+                with issued_lock:
+                    if next(issued, None) is None:
+                        break
+            request = scenario.next_request(rng, dataset)
+            headers = {}
+            if request.conditional and request.path in etags:
+                headers["If-None-Match"] = etags[request.path]
+            started = time.perf_counter()
+            try:
+                status, response_headers = send(request, headers)
+            except Exception:  # pylint: disable=broad-except
+                status, response_headers = 0, {}
+            latency_ms = (time.perf_counter() - started) * 1000
+            if request.conditional and response_headers.get("ETag"):
+                etags[request.path] = response_headers["ETag"]
+            local.append(Sample(request.endpoint, status, latency_ms, parse_ops(response_headers.get("X-Firestore-Ops"))))
+        with samples_lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+# ----------------------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------------------
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _summarize(samples: list[Sample], elapsed: float) -> dict:
+    latencies = sorted(sample.latency_ms for sample in samples)
+    errors = sum(1 for sample in samples if sample.status == 0 or sample.status >= 500)
+    statuses: dict[str, int] = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample.status)] += 1
+    with_ops = [sample.ops for sample in samples if sample.ops is not None]
+    summary = {
+        "requests": len(samples),
+        "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+    for operation in OPERATIONS:
+        # Mean Firestore operations per request, from X-Firestore-Ops.
+        summary[operation] = (
+            round(sum(ops.get(operation, 0) for ops in with_ops) / len(with_ops), 2) if with_ops else None
+        )
+    return summary
+
+
+def summarize(samples: list[Sample], elapsed: float) -> dict:
+    by_endpoint: dict[str, list[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+    return {
+        "total": _summarize(samples, elapsed),
+        "endpoints": {name: _summarize(group, elapsed) for name, group in sorted(by_endpoint.items())},
+    }
+
+
+def parse_slos(specs: list[str]) -> list[tuple[str, str, float]]:
+    """Parse ``"progress.save_access:p95_ms=50,writes=2"`` style specs.
+
+    ``*`` targets every endpoint and ``total`` the aggregate. ``rps`` is a
+    lower bound, every other metric an upper bound.
+    """
+    slos = []
+    for spec in specs:
+        endpoint, _, limits = spec.partition(":")
+        for limit in (part.strip() for part in limits.split(",")):
+            if not limit:
+                continue
+            metric, _, value = limit.partition("=")
+            if metric not in SLO_METRICS:
+                raise ValueError(f"Unknown SLO metric {metric!r}; expected one of {', '.join(sorted(SLO_METRICS))}")
+            slos.append((endpoint.strip(), metric, float(value)))
+    return slos
+
+
+def check_slos(summary: dict, slos: list[tuple[str, str, float]]) -> list[dict]:
+    results = []
+    for endpoint, metric, limit in slos:
+        if endpoint == "total":
+            targets = {"total": summary["total"]}
+        elif endpoint == "*":
+            targets = summary["endpoints"]
+        else:
+            targets = {endpoint: summary["endpoints"].get(endpoint)}
+        for name, stats in targets.items():
+            actual = stats.get(metric) if stats else None
+            if actual is None:
+                passed = None
+            elif metric in MINIMUM_METRICS:
+                passed = actual >= limit
+            else:
+                passed = actual <= limit
+            results.append({"endpoint": name, "metric": metric, "limit": limit, "actual": actual, "passed": passed})
+    return results
+
+
+def format_report(result: dict) -> str:
+    lines = [
+        f"scenario {result['scenario']} against {result['target']}: "
+        f"{result['summary']['total']['requests']} requests in {result['elapsed_s']:.1f}s "
+        f"({result['summary']['total']['rps']} req/s, concurrency {result['concurrency']})",
+        "",
+        f"{'endpoint':<34}{'reqs':>8}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}"
+        f"{'reads':>8}{'writes':>8}{'dels':>6}",
+    ]
+    rows = [*result["summary"]["endpoints"].items(), ("total", result["summary"]["total"])]
+    for name, stats in rows:
+
+        def ops(operation: str) -> str:
+            return "-" if stats[operation] is None else f"{stats[operation]:g}"
+
+        lines.append(
+            f"{name:<34}{stats['requests']:>8}{stats['rps']:>9.1f}{stats['error_rate'] * 100:>7.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+            f"{ops('reads'):>8}{ops('writes'):>8}{ops('deletes'):>6}"
+        )
+    if result["slos"]:
+        lines.append("")
+        for slo in result["slos"]:
+            verdict = {True: "PASS", False: "FAIL", None: "n/a "}[slo["passed"]]
+            lines.append(f"{verdict} {slo['endpoint']} {slo['metric']} {slo['actual']} (limit {slo['limit']:g})")
+    return "\n".join(lines)
@@ -0,0 +1,155 @@
+"""Weighted request mixes modelled on semester-start traffic.
+
+Each request is labelled with the Flask endpoint it hits (the same names
+``FIRESTORE_BUDGETS`` and ``LOG_ROUTE_SAMPLE_RATES`` use), so results, SLOs
+and server-side budgets line up.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Callable
+
+from loadtest.dataset import Dataset
+
+
+@dataclass
+class Request:
+    endpoint: str
+    method: str
+    path: str
+    json: dict | None = None
+    # Revalidate with the ETag of the previous response for the same path,
+    # as polling clients do.
+    conditional: bool = False
+
+
+RequestFactory = Callable[[random.Random, Dataset], Request]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    mix: list[tuple[float, RequestFactory]] = field(default_factory=list)
+
+    def next_request(self, rng: random.Random, dataset: Dataset) -> Request:
+        weights = [weight for weight, _ in self.mix]
+        (_, factory), = rng.choices(self.mix, weights=weights)
+        return factory(rng, dataset)
+
+
+def _student(rng: random.Random, dataset: Dataset) -> int:
+    # A few students generate most of the traffic.
+    return min(int(rng.paretovariate(1.2)) - 1, dataset.students - 1)
+
+
+def enroll(rng: random.Random, dataset: Dataset) -> Request:
+    return Request(
+        "enrollments.create_enrollment",
+        "POST",
+        "/api/enrollments/",
+        {
+            "student_id": dataset.student_id(rng.randrange(dataset.students)),
+            "course_id": dataset.course_id(rng.randrange(dataset.courses)),
+        },
+    )
+
+
+def dashboard(rng: random.Random, dataset: Dataset) -> Request:
+    student = dataset.student_id(_student(rng, dataset))
+    return Request("students.get_dashboard", "GET", f"/api/students/{student}/dashboard", conditional=True)
+
+
+def browse_courses(rng: random.Random, dataset: Dataset) -> Request:
+    return Request("courses.list_courses", "GET", "/api/courses/?limit=50&fields=summary", conditional=True)
+
+
+def module_access(rng: random.Random, dataset: Dataset) -> Request:
+    student = _student(rng, dataset)
+    course = rng.choice(dataset.enrolled_courses(student))
+    return Request(
+        "progress.save_access",
+        "POST",
+        "/api/progress/access",
+        {
+            "user_id": dataset.student_id(student),
+            "course_id": dataset.course_id(course),
+            "module_id": dataset.module_id(course, rng.randrange(dataset.modules_per_course)),
+            "progress_percentage": rng.randint(1, 100),
+        },
+    )
+
+
+def module_list(rng: random.Random, dataset: Dataset) -> Request:
+    course = dataset.course_id(rng.randrange(dataset.courses))
+    return Request("modules.list_modules", "GET", f"/api/modules/courses/{course}/modules", conditional=True)
+
+
+def course_summary(rng: random.Random, dataset: Dataset) -> Request:
+    student = _student(rng, dataset)
+    course = rng.choice(dataset.enrolled_courses(student))
+    return Request(
+        "progress.get_course_summary",
+        "GET",
+        f"/api/progress/course/{dataset.student_id(student)}/{dataset.course_id(course)}/summary",
+    )
+
+
+def roster(rng: random.Random, dataset: Dataset) -> Request:
+    # Teachers poll the first page of one of their courses.
+    course = dataset.course_id(rng.randrange(dataset.courses))
+    return Request("courses.get_course_roster", "GET", f"/api/courses/{course}/roster?limit=50", conditional=True)
+
+
+def users_list(rng: random.Random, dataset: Dataset) -> Request:
+    role = rng.choice([None, "student", "teacher"])
+    query = "limit=100&fields=summary" + (f"&role={role}" if role else "")
+    return Request("users.list_users", "GET", f"/api/users/?{query}", conditional=True)
+
+
+def user_stats(rng: random.Random, dataset: Dataset) -> Request:
+    return Request("users.get_user_stats", "GET", "/api/users/stats")
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario(
+            "enrollment-spike",
+            "Registration opens: students enroll, then check their dashboard.",
+            [(0.6, enroll), (0.25, dashboard), (0.15, browse_courses)],
+        ),
+        Scenario(
+            "module-viewing",
+            "Heartbeat-heavy module viewing through /api/progress/access.",
+            [(0.85, module_access), (0.1, course_summary), (0.05, module_list)],
+        ),
+        Scenario(
+            "roster-polling",
+            "Teachers keep their course rosters open and poll them.",
+            [(0.8, roster), (0.2, module_access)],
+        ),
+        Scenario(
+            "admin-users",
+            "Administrators page through the users list and stats.",
+            [(0.8, users_list), (0.2, user_stats)],
+        ),
+        Scenario(
+            "semester-start",
+            "All of the above at once, weighted like the first week of term.",
+            [
+                (0.15, enroll),
+                (0.1, dashboard),
+                (0.05, browse_courses),
+                (0.45, module_access),
+                (0.05, course_summary),
+                (0.05, module_list),
+                (0.1, roster),
+                (0.04, users_list),
+                (0.01, user_stats),
+            ],
+        ),
+    ]
+}
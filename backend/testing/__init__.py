@@ -0,0 +1 @@
+"""Test support shared by tests/, benchmarks/ and loadtest/ (not shipped with the app)."""
@@ -0,0 +1,910 @@
+"""In-memory stand-in for the subset of ``google.cloud.firestore.Client``
+used by the repositories.
+
+It is meant for tests, benchmarks, load tests and local experiments without
+a live project: data lives in process memory, every RPC can be delayed by an
+injectable latency and is counted so callers can report how many round trips
+and document reads/writes a code path costs.
+
+Covered: collection / document references, ``where`` (field and composite
+AND filters), ``order_by``, ``limit``, ``offset``, ``select``, cursors,
+``stream`` / ``get``, ``count`` / ``sum`` / ``avg`` aggregations, ``get_all``,
+``set`` / ``create`` / ``update`` / ``delete`` with field transforms, write
+batches, ``BulkWriter``, transactions (usable with
+``firestore.transactional``) and ``on_snapshot`` listeners. Not covered:
+subcollections, collection groups, OR filters and the async client.
+
+To run the app against it, initialise Firebase without loading credentials
+and replace the Admin SDK client factory::
+
+    from testing.memory_firestore import MemoryFirestore
+
+    firebase_admin.initialize_app(credentials.ApplicationDefault(), {"projectId": "memory"})
+    store = MemoryFirestore(latency=0.005)
+    monkeypatch.setattr(firebase_admin.firestore, "client", lambda app=None: store)
+
+``get_db()`` keeps wrapping the client, so per-request operation counting
+(see app/firestore_ops.py) still applies.
+"""
+
+from __future__ import annotations
+
+import copy
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Union
+
+from google.api_core import exceptions
+from google.cloud.firestore_v1 import transforms
+from google.cloud.firestore_v1._helpers import ExistsOption
+from google.cloud.firestore_v1.base_client import BaseClient
+from google.cloud.firestore_v1.base_query import BaseCompositeFilter, FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
+
+_ids = itertools.count(1)
+
+# Seconds per RPC, or a function of the RPC name (e.g. "run_query", "commit").
+Latency = Union[float, Callable[[str], float]]
+
+
+def _auto_id() -> str:
+    return f"auto{next(_ids):016d}"
+
+
+def _path_key(field_path) -> str:
+    if isinstance(field_path, FieldPath):
+        return field_path.to_api_repr()
+    return field_path
+
+
+def _get_nested(data: dict, field_path: str) -> tuple[bool, Any]:
+    value: Any = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return False, None
+        value = value[part]
+    return True, value
+
+
+def _set_nested(data: dict, field_path: str, value: Any) -> None:
+    parts = field_path.split(".")
+    target = data
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+def _delete_nested(data: dict, field_path: str) -> None:
+    parts = field_path.split(".")
+    target = data
+    for part in parts[:-1]:
+        target = target.get(part)
+        if not isinstance(target, dict):
+            return
+    target.pop(parts[-1], None)
+
+
+def _sort_key(value: Any):
+    """Order values roughly the way Firestore orders mixed types."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value.timestamp())
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, MemoryDocumentReference):
+        return (5, value.path)
+    return (6, repr(value))
+
+
+class MemoryDocumentSnapshot:
+    def __init__(self, reference, data, create_time=None, update_time=None) -> None:
+        self.reference = reference
+        self._data = data
+        self.create_time = create_time
+        self.update_time = update_time
+        self.read_time = datetime.now(timezone.utc)
+
+    @property
+    def id(self) -> str:
+        return self.reference.id
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict | None:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str) -> Any:
+        found, value = _get_nested(self._data or {}, field_path)
+        if not found:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class MemoryWriteResult:
+    def __init__(self, update_time) -> None:
+        self.update_time = update_time
+
+
+class MemoryDocumentReference:
+    def __init__(self, client: "MemoryFirestore", collection_name: str, doc_id: str) -> None:
+        self._client = client
+        self._collection_name = collection_name
+        self.id = doc_id
+
+    @property
+    def path(self) -> str:
+        return f"{self._collection_name}/{self.id}"
+
+    @property
+    def parent(self) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self._client, self._collection_name)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MemoryDocumentReference) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __deepcopy__(self, memo) -> "MemoryDocumentReference":
+        # References are immutable handles; copies share the client.
+        return self
+
+    def get(self, field_paths=None, transaction=None, **_kwargs) -> MemoryDocumentSnapshot:
+        self._client._rpc("get")
+        return self._client._snapshot(self, field_paths, count_read=True)
+
+    def set(self, document_data: dict, merge: bool = False, **_kwargs) -> MemoryWriteResult:
+        self._client._rpc("commit")
+        return self._client._apply([("set", self, document_data, merge)])[0]
+
+    def create(self, document_data: dict, **_kwargs) -> MemoryWriteResult:
+        self._client._rpc("commit")
+        return self._client._apply([("create", self, document_data, False)])[0]
+
+    def update(self, field_updates: dict, **_kwargs) -> MemoryWriteResult:
+        self._client._rpc("commit")
+        return self._client._apply([("update", self, field_updates, False)])[0]
+
+    def delete(self, option=None, **_kwargs) -> MemoryWriteResult:
+        self._client._rpc("commit")
+        return self._client._apply([("delete", self, option, False)])[0]
+
+    def on_snapshot(self, callback: Callable) -> "MemoryWatch":
+        return self._client._watch(self._collection_name, callback, doc_id=self.id)
+
+
+class MemoryAggregationQuery:
+    def __init__(self, query: "MemoryQuery", kind: str, alias: str | None, field=None) -> None:
+        self._query = query
+        self._aggregations = [(kind, alias or "field_1", field)]
+
+    def count(self, alias: str | None = None) -> "MemoryAggregationQuery":
+        self._aggregations.append(("count", alias or f"field_{len(self._aggregations) + 1}", None))
+        return self
+
+    def get(self, transaction=None, **_kwargs) -> list:
+        from google.cloud.firestore_v1.base_aggregation import AggregationResult
+
+        self._query._client._rpc("run_aggregation_query")
+        docs = self._query._matching()
+        # Firestore bills one read per batch of up to 1000 index entries.
+        self._query._client._count("documents_read", max(1, -(-len(docs) // 1000)))
+        results = []
+        for kind, alias, field in self._aggregations:
+            if kind == "count":
+                value: float = len(docs)
+            else:
+                values = [v for _, d in docs for found, v in [_get_nested(d, field)] if found]
+                value = sum(values) if kind == "sum" else (sum(values) / len(values) if values else None)
+            results.append(AggregationResult(alias=alias, value=value))
+        return [results]
+
+    def stream(self, transaction=None, **_kwargs):
+        yield from self.get(transaction=transaction)
+
+
+class MemoryQuery:
+    def __init__(self, client: "MemoryFirestore", collection_name: str) -> None:
+        self._client = client
+        self._collection_name = collection_name
+        self._filters: list[tuple[str, str, Any]] = []
+        self._orders: list[tuple[str, str]] = []
+        self._limit: int | None = None
+        self._offset = 0
+        self._projection: list[str] | None = None
+        self._start: tuple[dict | list, bool] | None = None
+        self._end: tuple[dict | list, bool] | None = None
+
+    def _copy(self) -> "MemoryQuery":
+        clone = copy.copy(self)
+        clone._filters = list(self._filters)
+        clone._orders = list(self._orders)
+        return clone
+
+    # --- Query builders ---
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None) -> "MemoryQuery":
+        clone = self._copy()
+        if filter is not None:
+            clone._filters.extend(self._flatten_filter(filter))
+        else:
+            clone._filters.append((_path_key(field_path), op_string, value))
+        return clone
+
+    @staticmethod
+    def _flatten_filter(filter_) -> list[tuple[str, str, Any]]:
+        if isinstance(filter_, FieldFilter):
+            return [(filter_.field_path, filter_.op_string, filter_.value)]
+        if isinstance(filter_, BaseCompositeFilter):
+            if filter_.operator != "AND" and getattr(filter_.operator, "name", "") != "AND":
+                raise NotImplementedError("Only AND composite filters are supported")
+            return [item for sub in filter_.filters for item in MemoryQuery._flatten_filter(sub)]
+        raise TypeError(f"Unsupported filter {filter_!r}")
+
+    def order_by(self, field_path, direction: str = "ASCENDING") -> "MemoryQuery":
+        clone = self._copy()
+        clone._orders.append((_path_key(field_path), direction))
+        return clone
+
+    def limit(self, count: int) -> "MemoryQuery":
+        clone = self._copy()
+        clone._limit = count
+        return clone
+
+    def offset(self, num_to_skip: int) -> "MemoryQuery":
+        clone = self._copy()
+        clone._offset = num_to_skip
+        return clone
+
+    def select(self, field_paths: Iterable[str]) -> "MemoryQuery":
+        clone = self._copy()
+        clone._projection = [_path_key(path) for path in field_paths]
+        return clone
+
+    def start_after(self, document_fields) -> "MemoryQuery":
+        clone = self._copy()
+        clone._start = (document_fields, False)
+        return clone
+
+    def start_at(self, document_fields) -> "MemoryQuery":
+        clone = self._copy()
+        clone._start = (document_fields, True)
+        return clone
+
+    def end_before(self, document_fields) -> "MemoryQuery":
+        clone = self._copy()
+        clone._end = (document_fields, False)
+        return clone
+
+    def end_at(self, document_fields) -> "MemoryQuery":
+        clone = self._copy()
+        clone._end = (document_fields, True)
+        return clone
+
+    def count(self, alias: str | None = None) -> MemoryAggregationQuery:
+        return MemoryAggregationQuery(self, "count", alias)
+
+    def sum(self, field_ref, alias: str | None = None) -> MemoryAggregationQuery:
+        return MemoryAggregationQuery(self, "sum", alias, _path_key(field_ref))
+
+    def avg(self, field_ref, alias: str | None = None) -> MemoryAggregationQuery:
+        return MemoryAggregationQuery(self, "avg", alias, _path_key(field_ref))
+
+    # --- Execution ---
+
+    def stream(self, transaction=None, **_kwargs):
+        self._client._rpc("run_query")
+        window = self._offset + self._limit if self._limit is not None else None
+        docs = self._matching(window)
+        docs = docs[self._offset:]
+        if self._limit is not None:
+            docs = docs[: self._limit]
+        # An empty result is still billed as one read.
+        self._client._count("documents_read", len(docs) or 1)
+        for doc_id, _ in docs:
+            ref = MemoryDocumentReference(self._client, self._collection_name, doc_id)
+            yield self._client._snapshot(ref, self._projection, count_read=False)
+
+    def get(self, transaction=None, **_kwargs) -> list:
+        return list(self.stream(transaction=transaction))
+
+    def on_snapshot(self, callback: Callable) -> "MemoryWatch":
+        return self._client._watch(self._collection_name, callback, query=self)
+
+    def _value(self, doc_id: str, data: dict, field: str) -> tuple[bool, Any]:
+        if field == "__name__":
+            return True, doc_id
+        return _get_nested(data, field)
+
+    def _matches(self, doc_id: str, data: dict) -> bool:
+        for field, op, expected in self._filters:
+            found, value = self._value(doc_id, data, field)
+            if isinstance(expected, MemoryDocumentReference):
+                expected = expected.id
+            if op == "==":
+                ok = found and value == expected
+            elif op == "!=":
+                ok = found and value != expected
+            elif op == "in":
+                expected_ids = [e.id if isinstance(e, MemoryDocumentReference) else e for e in expected]
+                ok = found and value in expected_ids
+            elif op == "not-in":
+                ok = found and value not in expected
+            elif op == "array_contains" or op == "array-contains":
+                ok = found and isinstance(value, list) and expected in value
+            elif op in ("array_contains_any", "array-contains-any"):
+                ok = found and isinstance(value, list) and any(e in value for e in expected)
+            elif op in ("<", "<=", ">", ">="):
+                if not found or value is None:
+                    ok = False
+                else:
+                    left, right = _sort_key(value), _sort_key(expected)
+                    ok = {
+                        "<": left < right,
+                        "<=": left <= right,
+                        ">": left > right,
+                        ">=": left >= right,
+                    }[op]
+            else:
+                raise NotImplementedError(f"Unsupported operator {op}")
+            if not ok:
+                return False
+        # Ordering on a field excludes documents that lack it, as in Firestore.
+        for field, _ in self._orders:
+            if field != "__name__" and not self._value(doc_id, data, field)[0]:
+                return False
+        return True
+
+    def _order_tuple(self, doc_id: str, data: dict) -> list:
+        return [_sort_key(self._value(doc_id, data, field)[1]) for field, _ in self._effective_orders()]
+
+    def _effective_orders(self) -> list[tuple[str, str]]:
+        orders = list(self._orders)
+        if not any(field == "__name__" for field, _ in orders):
+            direction = orders[-1][1] if orders else "ASCENDING"
+            orders.append(("__name__", direction))
+        return orders
+
+    def _cursor_values(self, cursor) -> list:
+        values, _ = cursor
+        if isinstance(values, MemoryDocumentSnapshot):
+            data = values.to_dict() or {}
+            return [self._value(values.id, data, field)[1] for field, _ in self._effective_orders()]
+        if isinstance(values, dict):
+            result = []
+            for field, _ in self._effective_orders():
+                if field not in values:
+                    break
+                value = values[field]
+                result.append(value.id if isinstance(value, MemoryDocumentReference) else value)
+            return result
+        return list(values)
+
+    def _compare_cursor(self, doc_id: str, data: dict, cursor) -> int:
+        values = self._cursor_values(cursor)
+        for (field, direction), expected in zip(self._effective_orders(), values):
+            left = _sort_key(self._value(doc_id, data, field)[1])
+            right = _sort_key(expected)
+            if left != right:
+                result = -1 if left < right else 1
+                return -result if direction == "DESCENDING" else result
+        return 0
+
+    def _matching(self, window: int | None = None) -> list[tuple[str, dict]]:
+        """Matching ``(id, data)`` pairs in query order.
+
+        ``window`` bounds how many leading results the caller needs, which
+        lets single-direction orderings use a partial sort. ``data`` is the
+        stored dict itself (not a copy), so callers must not mutate it;
+        snapshots copy what they hand out.
+        """
+        orders = self._effective_orders()
+        with self._client._lock:
+            collection = self._client._data.get(self._collection_name, {})
+            docs = [
+                (doc_id, data) for doc_id, data in collection.items()
+                if self._matches(doc_id, data) and self._within_cursors(doc_id, data)
+            ]
+
+            directions = {direction for _, direction in orders}
+            if len(directions) == 1:
+                if len(orders) == 1:  # only the implicit order by document id
+                    def key(item):
+                        return item[0]
+                else:
+                    def key(item):
+                        return [_sort_key(self._value(item[0], item[1], field)[1]) for field, _ in orders]
+
+                descending = directions == {"DESCENDING"}
+                if window is not None and window < len(docs):
+                    select = heapq.nlargest if descending else heapq.nsmallest
+                    return select(window, docs, key=key)
+                docs.sort(key=key, reverse=descending)
+                return docs
+
+            for field, direction in reversed(orders):
+                docs.sort(
+                    key=lambda item, f=field: _sort_key(self._value(item[0], item[1], f)[1]),
+                    reverse=direction == "DESCENDING",
+                )
+        return docs[:window] if window is not None else docs
+
+    def _within_cursors(self, doc_id: str, data: dict) -> bool:
+        if self._start is not None:
+            cmp = self._compare_cursor(doc_id, data, self._start)
+            if cmp < 0 or (cmp == 0 and not self._start[1]):
+                return False
+        if self._end is not None:
+            cmp = self._compare_cursor(doc_id, data, self._end)
+            if cmp > 0 or (cmp == 0 and not self._end[1]):
+                return False
+        return True
+
+
+class MemoryCollectionReference(MemoryQuery):
+    @property
+    def id(self) -> str:
+        return self._collection_name
+
+    def document(self, document_id: str | None = None) -> MemoryDocumentReference:
+        return MemoryDocumentReference(self._client, self._collection_name, document_id or _auto_id())
+
+    def add(self, document_data: dict, document_id: str | None = None):
+        ref = self.document(document_id)
+        result = ref.create(document_data)
+        return result.update_time, ref
+
+    def list_documents(self, page_size: int | None = None):
+        with self._client._lock:
+            ids = list(self._client._data.get(self._collection_name, {}))
+        return [self.document(doc_id) for doc_id in ids]
+
+
+class MemoryWriteBatch:
+    """Collects writes and applies them atomically on ``commit``."""
+
+    MAX_WRITES = 500
+
+    def __init__(self, client: "MemoryFirestore") -> None:
+        self._client = client
+        self._writes: list[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def _add(self, write: tuple) -> None:
+        if len(self._writes) >= self.MAX_WRITES:
+            raise exceptions.InvalidArgument("maximum 500 writes allowed per request")
+        self._writes.append(write)
+
+    def set(self, reference, document_data: dict, merge: bool = False) -> None:
+        self._add(("set", reference, document_data, merge))
+
+    def create(self, reference, document_data: dict) -> None:
+        self._add(("create", reference, document_data, False))
+
+    def update(self, reference, field_updates: dict, **_kwargs) -> None:
+        self._add(("update", reference, field_updates, False))
+
+    def delete(self, reference, option=None, **_kwargs) -> None:
+        self._add(("delete", reference, option, False))
+
+    def commit(self, **_kwargs) -> list[MemoryWriteResult]:
+        self._client._rpc("commit")
+        writes, self._writes = self._writes, []
+        return self._client._apply(writes)
+
+    def __enter__(self) -> "MemoryWriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+
+
+class MemoryTransaction(MemoryWriteBatch):
+    """Serialisable transaction compatible with ``firestore.transactional``.
+
+    Reads take the client-wide transaction lock, which is held until commit or
+    rollback, so concurrent transactions on the stand-in never interleave.
+    """
+
+    def __init__(self, client: "MemoryFirestore", max_attempts: int = 5, read_only: bool = False) -> None:
+        super().__init__(client)
+        self._max_attempts = max_attempts
+        self._read_only = read_only
+        self._id: bytes | None = None
+        self._locked = False
+
+    @property
+    def in_progress(self) -> bool:
+        return self._id is not None
+
+    @property
+    def id(self) -> bytes | None:
+        return self._id
+
+    def _clean_up(self) -> None:
+        self._writes = []
+        self._id = None
+        if self._locked:
+            self._locked = False
+            self._client._txn_lock.release()
+
+    def _begin(self, retry_id=None) -> None:
+        self._client._rpc("begin_transaction")
+        self._client._txn_lock.acquire()
+        self._locked = True
+        self._id = _auto_id().encode()
+
+    def _rollback(self) -> None:
+        if self._id is not None:
+            self._client._rpc("rollback")
+        self._clean_up()
+
+    def _commit(self) -> list[MemoryWriteResult]:
+        self._client._rpc("commit")
+        writes, self._writes = self._writes, []
+        try:
+            return self._client._apply(writes)
+        finally:
+            self._clean_up()
+
+    def commit(self, **_kwargs) -> list[MemoryWriteResult]:
+        return self._commit()
+
+    def get(self, ref_or_query, **_kwargs):
+        if isinstance(ref_or_query, MemoryDocumentReference):
+            return iter([ref_or_query.get()])
+        if isinstance(ref_or_query, MemoryAggregationQuery):
+            return ref_or_query.get()
+        return ref_or_query.stream()
+
+    def get_all(self, references, **_kwargs):
+        return self._client.get_all(references)
+
+
+class MemoryBulkWriter:
+    """Sequential ``BulkWriter`` stand-in with the same callback hooks."""
+
+    def __init__(self, client: "MemoryFirestore", options=None) -> None:
+        self._client = client
+        self._success_callback: Callable | None = None
+        self._error_callback: Callable | None = None
+        self._pending: list[tuple] = []
+        self._closed = False
+
+    def on_write_result(self, callback: Callable) -> None:
+        self._success_callback = callback
+
+    def on_write_error(self, callback: Callable) -> None:
+        self._error_callback = callback
+
+    def on_batch_result(self, callback: Callable) -> None:
+        pass
+
+    def _enqueue(self, write: tuple) -> None:
+        if self._closed:
+            raise RuntimeError("BulkWriter is closed")
+        self._pending.append(write)
+        if len(self._pending) >= 20:
+            self.flush()
+
+    def create(self, reference, document_data: dict, attempts: int = 0) -> None:
+        self._enqueue(("create", reference, document_data, False))
+
+    def set(self, reference, document_data: dict, merge: bool = False, attempts: int = 0) -> None:
+        self._enqueue(("set", reference, document_data, merge))
+
+    def update(self, reference, field_updates: dict, attempts: int = 0, **_kwargs) -> None:
+        self._enqueue(("update", reference, field_updates, False))
+
+    def delete(self, reference, attempts: int = 0, **_kwargs) -> None:
+        self._enqueue(("delete", reference, None, False))
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self._client._rpc("batch_write")
+        for write in pending:
+            attempts = 0
+            while True:
+                try:
+                    result = self._client._apply([write])[0]
+                except exceptions.GoogleAPICallError as exc:
+                    failure = _BulkWriteFailure(write[1], exc, attempts)
+                    attempts += 1
+                    if self._error_callback is not None and self._error_callback(failure, self):
+                        continue
+                    break
+                if self._success_callback is not None:
+                    self._success_callback(write[1], result, self)
+                break
+
+    def close(self) -> None:
+        self.flush()
+        self._closed = True
+
+
+class _BulkWriteOperation:
+    def __init__(self, reference, attempts: int) -> None:
+        self.reference = reference
+        self.attempts = attempts
+
+
+class _BulkWriteFailure:
+    """Shaped like ``bulk_writer.BulkWriteFailure`` (``code`` is the numeric gRPC code)."""
+
+    def __init__(self, reference, exc, attempts: int) -> None:
+        self.operation = _BulkWriteOperation(reference, attempts)
+        code = getattr(exc, "grpc_status_code", None)
+        self.code = code.value[0] if code is not None else None
+        self.message = str(exc)
+
+    @property
+    def attempts(self) -> int:
+        return self.operation.attempts
+
+
+class MemoryWatch:
+    def __init__(self, client: "MemoryFirestore", entry) -> None:
+        self._client = client
+        self._entry = entry
+
+    def unsubscribe(self) -> None:
+        with self._client._lock:
+            if self._entry in self._client._watchers:
+                self._client._watchers.remove(self._entry)
+
+
+class MemoryFirestore:
+    """A ``firestore.Client`` stand-in backed by dictionaries.
+
+    ``stats`` counts RPCs (``rpcs`` and ``rpc.<name>``) and billed document
+    reads, writes and deletes.
+
+    Args:
+        latency: Seconds to sleep on every simulated RPC, or a function
+            returning them for an RPC name.
+    """
+
+    def __init__(self, latency: Latency = 0.0, project: str = "memory") -> None:
+        self.project = project
+        self.latency = latency
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+        self._data: dict[str, dict[str, dict]] = {}
+        self._times: dict[str, tuple[datetime, datetime]] = {}
+        self._lock = threading.RLock()
+        self._txn_lock = threading.RLock()
+        self._watchers: list[tuple] = []
+
+    # --- Client API ---
+
+    def collection(self, collection_id: str) -> MemoryCollectionReference:
+        return MemoryCollectionReference(self, collection_id)
+
+    def document(self, document_path: str) -> MemoryDocumentReference:
+        collection_name, doc_id = document_path.split("/", 1)
+        return MemoryDocumentReference(self, collection_name, doc_id)
+
+    def get_all(self, references, field_paths=None, transaction=None, **_kwargs):
+        references = list(references)
+        self._rpc("batch_get_documents")
+        for ref in references:
+            yield self._snapshot(ref, field_paths, count_read=True)
+
+    write_option = staticmethod(BaseClient.write_option)
+
+    def batch(self) -> MemoryWriteBatch:
+        return MemoryWriteBatch(self)
+
+    def transaction(self, max_attempts: int = 5, read_only: bool = False) -> MemoryTransaction:
+        return MemoryTransaction(self, max_attempts=max_attempts, read_only=read_only)
+
+    def bulk_writer(self, options=None) -> MemoryBulkWriter:
+        return MemoryBulkWriter(self, options)
+
+    def collections(self) -> list[MemoryCollectionReference]:
+        with self._lock:
+            return [self.collection(name) for name in self._data]
+
+    def close(self) -> None:
+        pass
+
+    # --- Helpers for callers ---
+
+    def load(self, collection_name: str, documents: dict[str, dict]) -> None:
+        """Seed documents without counting RPCs."""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            collection = self._data.setdefault(collection_name, {})
+            for doc_id, data in documents.items():
+                collection[doc_id] = copy.deepcopy(data)
+                self._times[f"{collection_name}/{doc_id}"] = (now, now)
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.stats.clear()
+
+    def snapshot_stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    # --- Internals ---
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _rpc(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats["rpcs"] += 1
+            self.stats[f"rpc.{name}"] += 1
+        delay = self.latency(name) if callable(self.latency) else self.latency
+        if delay:
+            time.sleep(delay)
+
+    def _snapshot(self, ref: MemoryDocumentReference, field_paths, count_read: bool) -> MemoryDocumentSnapshot:
+        with self._lock:
+            data = self._data.get(ref._collection_name, {}).get(ref.id)
+            data = copy.deepcopy(data)
+            times = self._times.get(ref.path, (None, None))
+        if count_read:
+            self._count("documents_read")
+        if data is not None and field_paths is not None:
+            projected: dict = {}
+            for path in field_paths:
+                found, value = _get_nested(data, _path_key(path))
+                if found:
+                    _set_nested(projected, _path_key(path), value)
+            data = projected
+        return MemoryDocumentSnapshot(ref, data, *times)
+
+    @staticmethod
+    def _resolve(current: dict, field_path: str, value: Any, now: datetime) -> None:
+        if value is transforms.DELETE_FIELD:
+            _delete_nested(current, field_path)
+            return
+        if value is transforms.SERVER_TIMESTAMP:
+            _set_nested(current, field_path, now)
+            return
+        found, existing = _get_nested(current, field_path)
+        if isinstance(value, transforms.Increment):
+            base = existing if found and isinstance(existing, (int, float)) else 0
+            _set_nested(current, field_path, base + value.value)
+        elif isinstance(value, transforms.Maximum):
+            base = existing if found and isinstance(existing, (int, float)) else None
+            _set_nested(current, field_path, value.value if base is None else max(base, value.value))
+        elif isinstance(value, transforms.Minimum):
+            base = existing if found and isinstance(existing, (int, float)) else None
+            _set_nested(current, field_path, value.value if base is None else min(base, value.value))
+        elif isinstance(value, transforms.ArrayUnion):
+            items = list(existing) if found and isinstance(existing, list) else []
+            items.extend(item for item in value.values if item not in items)
+            _set_nested(current, field_path, items)
+        elif isinstance(value, transforms.ArrayRemove):
+            items = list(existing) if found and isinstance(existing, list) else []
+            _set_nested(current, field_path, [item for item in items if item not in value.values])
+        elif isinstance(value, dict) and "." not in field_path and found and isinstance(existing, dict):
+            for key, nested in value.items():
+                MemoryFirestore._resolve(current, f"{field_path}.{key}", nested, now)
+        else:
+            _set_nested(current, field_path, copy.deepcopy(value))
+
+    def _apply(self, writes: list[tuple]) -> list[MemoryWriteResult]:
+        now = datetime.now(timezone.utc)
+        changes = []
+        with self._lock:
+            staged = {}
+            # Validate every precondition before mutating anything.
+            for kind, ref, payload, merge in writes:
+                key = (ref._collection_name, ref.id)
+                if key in staged:
+                    exists = staged[key] is not None
+                else:
+                    exists = ref.id in self._data.get(ref._collection_name, {})
+                if kind == "create" and exists:
+                    raise exceptions.AlreadyExists(f"Document already exists: {ref.path}")
+                if kind == "update" and not exists:
+                    raise exceptions.NotFound(f"No document to update: {ref.path}")
+                if kind == "delete":
+                    if isinstance(payload, ExistsOption) and payload._exists != exists:
+                        raise exceptions.NotFound(f"No document to delete: {ref.path}")
+                    staged[key] = None
+                    continue
+                if kind == "set" and not merge or kind == "create":
+                    current: dict = {}
+                else:
+                    base = staged.get(key) if key in staged else self._data.get(ref._collection_name, {}).get(ref.id)
+                    current = copy.deepcopy(base) if base else {}
+                if kind == "update":
+                    for field_path, value in payload.items():
+                        self._resolve(current, _path_key(field_path), value, now)
+                else:
+                    for field, value in payload.items():
+                        if merge and isinstance(value, dict) and isinstance(current.get(field), dict):
+                            for nested_key, nested_value in value.items():
+                                self._resolve(current, f"{field}.{nested_key}", nested_value, now)
+                        else:
+                            self._resolve(current, field, value, now)
+                staged[key] = current
+
+            for (collection_name, doc_id), data in staged.items():
+                collection = self._data.setdefault(collection_name, {})
+                path = f"{collection_name}/{doc_id}"
+                if data is None:
+                    if collection.pop(doc_id, None) is not None:
+                        changes.append(("REMOVED", collection_name, doc_id, None))
+                        self._count("documents_deleted")
+                    self._times.pop(path, None)
+                else:
+                    change_type = "MODIFIED" if doc_id in collection else "ADDED"
+                    collection[doc_id] = data
+                    created = self._times.get(path, (now, now))[0]
+                    self._times[path] = (created, now)
+                    changes.append((change_type, collection_name, doc_id, copy.deepcopy(data)))
+                    self._count("documents_written")
+
+        self._notify(changes, now)
+        return [MemoryWriteResult(now) for _ in writes]
+
+    # --- Snapshot listeners ---
+
+    def _watch(self, collection_name: str, callback: Callable, doc_id=None, query=None) -> MemoryWatch:
+        entry = (collection_name, callback, doc_id, query)
+        with self._lock:
+            self._watchers.append(entry)
+            if doc_id is not None:
+                ref = MemoryDocumentReference(self, collection_name, doc_id)
+                initial = [self._snapshot(ref, None, count_read=False)]
+            else:
+                matching = (query or self.collection(collection_name))._matching()
+                initial = [
+                    self._snapshot(MemoryDocumentReference(self, collection_name, item_id), None, count_read=False)
+                    for item_id, _ in matching
+                ]
+        now = datetime.now(timezone.utc)
+        changes = [_MemoryChange("ADDED", snap) for snap in initial if snap.exists]
+        callback(initial, changes, now)
+        return MemoryWatch(self, entry)
+
+    def _notify(self, changes: list[tuple], read_time: datetime) -> None:
+        if not changes or not self._watchers:
+            return
+        with self._lock:
+            watchers = list(self._watchers)
+        for collection_name, callback, doc_id, query in watchers:
+            relevant = []
+            for change_type, changed_collection, changed_id, data in changes:
+                if changed_collection != collection_name or (doc_id is not None and changed_id != doc_id):
+                    continue
+                if query is not None and data is not None and not query._matches(changed_id, data):
+                    continue
+                ref = MemoryDocumentReference(self, changed_collection, changed_id)
+                relevant.append(_MemoryChange(change_type, MemoryDocumentSnapshot(ref, data)))
+            if relevant:
+                callback([change.document for change in relevant], relevant, read_time)
+
+
+class _ChangeType:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class _MemoryChange:
+    def __init__(self, change_type: str, document: MemoryDocumentSnapshot) -> None:
+        self.type = _ChangeType(change_type)
+        self.document = document
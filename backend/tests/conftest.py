@@ -0,0 +1,31 @@
+"""Shared fixtures: every test runs against an empty ``MemoryFirestore``."""
+
+from __future__ import annotations
+
+import firebase_admin
+import pytest
+from firebase_admin import credentials, firestore
+
+from app.repositories.assignments_repository import assignment_cache
+from app.repositories.courses_repository import course_cache
+from app.repositories.modules_repository import module_list_cache
+from app.repositories.users_repository import user_cache
+from testing.memory_firestore import MemoryFirestore
+
+
+@pytest.fixture(scope="session", autouse=True)
+def firebase_app():
+    # Satisfies init_firebase() without loading credentials; no client
+    # created from it ever reaches the network (see ``store``).
+    if not firebase_admin._apps:  # type: ignore[attr-defined]
+        firebase_admin.initialize_app(credentials.ApplicationDefault(), {"projectId": "memory"})
+
+
+@pytest.fixture
+def store(monkeypatch) -> MemoryFirestore:
+    """An empty stand-in, installed as the Firestore client."""
+    memory = MemoryFirestore()
+    monkeypatch.setattr(firestore, "client", lambda app=None: memory)
+    for cache in (module_list_cache, course_cache, user_cache, assignment_cache):
+        cache.clear()
+    return memory
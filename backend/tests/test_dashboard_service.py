@@ -0,0 +1,97 @@
+"""Course roster paging and the student dashboard (services/dashboard_service.py)."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.repositories.enrollments_repository import EnrollmentsRepository
+from app.repositories.progress_repository import ProgressRepository
+from app.services.dashboard_service import DashboardService
+from testing.memory_firestore import MemoryFirestore
+
+COURSE_ID = "course-1"
+STUDENTS = {"s0": 10, "s1": 20, "s2": 30, "s3": 40, "s4": 50}
+
+
+@pytest.fixture(autouse=True)
+def roster(store: MemoryFirestore) -> None:
+    store.load("courses", {COURSE_ID: {"title": "Course", "teacher_id": "t1"}})
+    store.load("users", {student_id: {"name": student_id, "role": "student"} for student_id in STUDENTS})
+    store.load(
+        "enrollments",
+        {
+            EnrollmentsRepository.enrollment_id(student_id, COURSE_ID): {
+                "student_id": student_id,
+                "course_id": COURSE_ID,
+                "status": "active",
+            }
+            for student_id in STUDENTS
+        },
+    )
+    for student_id, progress in STUDENTS.items():
+        set_progress(store, student_id, progress)
+
+
+def set_progress(store: MemoryFirestore, student_id: str, progress: int) -> None:
+    doc_id = ProgressRepository.course_progress_id(student_id, COURSE_ID)
+    store.load(
+        "course_progress",
+        {
+            doc_id: {
+                "user_id": student_id,
+                "course_id": COURSE_ID,
+                "total_modules": 10,
+                "completed_modules": progress // 10,
+                "progress_percentage": progress,
+            }
+        },
+    )
+
+
+def student_ids(page: list[dict]) -> list[str]:
+    return [row["student_id"] for row in page]
+
+
+def test_progress_changes_between_pages_do_not_skip_or_repeat_rows(store):
+    service = DashboardService()
+    first, cursor = service.get_course_roster(COURSE_ID, limit=2, sort="-progress")
+    assert student_ids(first) == ["s4", "s3"]
+
+    # The last row served drops to the end; resuming after its position
+    # instead of its sort key would skip s2, s1 and s0.
+    set_progress(store, "s3", 5)
+    second, _ = service.get_course_roster(COURSE_ID, limit=2, start_after=cursor, sort="-progress")
+    assert student_ids(second) == ["s2", "s1"]
+
+
+def test_cursor_survives_its_student_being_unenrolled(store):
+    service = DashboardService()
+    first, cursor = service.get_course_roster(COURSE_ID, limit=2, sort="progress")
+    assert student_ids(first) == ["s0", "s1"]
+
+    store.collection("enrollments").document(EnrollmentsRepository.enrollment_id("s1", COURSE_ID)).delete()
+    second, _ = service.get_course_roster(COURSE_ID, limit=2, start_after=cursor, sort="progress")
+    assert student_ids(second) == ["s2", "s3"]
+
+
+def test_malformed_sort_cursor_is_rejected():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        DashboardService().get_course_roster(COURSE_ID, limit=2, start_after="s1", sort="progress")
+
+
+def test_dashboard_skips_enrollments_without_a_course(store):
+    store.load("enrollments", {"legacy": {"student_id": "s1", "status": "active"}})
+
+    dashboard = DashboardService().get_student_dashboard("s1")
+
+    assert [item["enrollment"]["course_id"] for item in dashboard["courses"]] == [COURSE_ID]
+    assert dashboard["totals"]["courses"] == 1
+
+
+def test_roster_skips_enrollments_without_a_student(store):
+    store.load("enrollments", {"legacy": {"course_id": COURSE_ID, "status": "active"}})
+    service = DashboardService()
+
+    for sort in (None, "progress"):
+        roster, _ = service.get_course_roster(COURSE_ID, sort=sort)
+        assert sorted(student_ids(roster)) == sorted(STUDENTS)
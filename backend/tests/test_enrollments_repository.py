@@ -0,0 +1,54 @@
+"""Bulk enrollment writes (repositories/enrollments_repository.py)."""
+
+from __future__ import annotations
+
+from google.api_core import exceptions
+
+from app.repositories.enrollments_repository import BULK_MAX_ATTEMPTS, EnrollmentsRepository
+
+COURSE_ID = "course-1"
+
+
+def fail_writes_for(monkeypatch, store, doc_id: str, error: exceptions.GoogleAPICallError) -> list:
+    """Make every write of ``doc_id`` raise ``error``; returns the attempts made."""
+    attempts = []
+    apply = store._apply
+
+    def failing(writes):
+        if writes[0][1].id == doc_id:
+            attempts.append(doc_id)
+            raise error
+        return apply(writes)
+
+    monkeypatch.setattr(store, "_apply", failing)
+    return attempts
+
+
+def test_permanent_errors_are_reported_without_retrying(store, monkeypatch):
+    doc_id = EnrollmentsRepository.enrollment_id("s1", COURSE_ID)
+    attempts = fail_writes_for(monkeypatch, store, doc_id, exceptions.PermissionDenied("denied"))
+
+    results = EnrollmentsRepository().create_many(COURSE_ID, ["s0", "s1"])
+
+    assert results["s0"] is None
+    assert "denied" in results["s1"]
+    assert len(attempts) == 1
+
+
+def test_transient_errors_are_retried(store, monkeypatch):
+    doc_id = EnrollmentsRepository.enrollment_id("s1", COURSE_ID)
+    attempts = fail_writes_for(monkeypatch, store, doc_id, exceptions.ServiceUnavailable("busy"))
+
+    results = EnrollmentsRepository().create_many(COURSE_ID, ["s1"])
+
+    assert "busy" in results["s1"]
+    assert len(attempts) == BULK_MAX_ATTEMPTS
+
+
+def test_existing_enrollments_are_reported_as_already_enrolled(store):
+    EnrollmentsRepository().create_many(COURSE_ID, ["s1"])
+
+    assert EnrollmentsRepository().create_many(COURSE_ID, ["s1", "s2"]) == {
+        "s1": "already_enrolled",
+        "s2": None,
+    }
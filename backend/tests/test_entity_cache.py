@@ -0,0 +1,91 @@
+"""Read-through races of ``EntityCache`` (app/cache.py)."""
+
+from __future__ import annotations
+
+from app.cache import MISSING, EntityCache
+from app.documents import Document
+from testing.memory_firestore import MemoryFirestore
+
+
+def make_cache(maxsize: int = 100) -> EntityCache:
+    return EntityCache("courses", maxsize=maxsize, ttl=60, negative_ttl=5)
+
+
+def test_read_started_before_an_invalidation_is_not_cached():
+    cache = make_cache()
+    generation = cache.generation  # request A misses and reads v1
+    cache.invalidate("c1")  # request B writes v2
+    cache.set("c1", Document({"title": "v1"}), generation)
+
+    assert cache.get("c1") is MISSING
+
+
+def test_read_started_after_an_invalidation_is_cached():
+    cache = make_cache()
+    cache.invalidate("c1")
+    generation = cache.generation
+    cache.set("c1", Document({"title": "v2"}), generation)
+
+    assert cache.get("c1") == {"title": "v2"}
+
+
+def test_other_documents_are_not_affected():
+    cache = make_cache()
+    generation = cache.generation
+    cache.invalidate("c2")
+    cache.set("c1", Document({"title": "v1"}), generation)
+
+    assert cache.get("c1") == {"title": "v1"}
+
+
+def test_forgotten_invalidations_still_reject_older_reads():
+    cache = make_cache(maxsize=2)
+    generation = cache.generation
+    for doc_id in ("c1", "c2", "c3"):
+        cache.invalidate(doc_id)
+    cache.set("c1", Document({"title": "v1"}), generation)
+
+    assert cache.get("c1") is MISSING
+
+
+def test_clear_rejects_reads_started_before_it():
+    cache = make_cache()
+    generation = cache.generation
+    cache.clear()
+    cache.set("c1", None, generation)
+
+    assert cache.get("c1") is MISSING
+
+
+class BrokenFirestore:
+    def collection(self, _name):
+        raise RuntimeError("unavailable")
+
+
+def test_listener_bound_cache_is_bypassed_until_its_listener_runs():
+    cache = EntityCache("users", maxsize=100, ttl=60, negative_ttl=5, requires_listener=True)
+    cache.set("u1", Document({"name": "v1"}), cache.generation)
+    assert cache.get("u1") is MISSING
+
+    cache.watch(BrokenFirestore())  # logged, not raised
+    assert not cache.listening
+
+    cache.watch(MemoryFirestore())
+    cache.set("u1", Document({"name": "v1"}), cache.generation)
+    assert cache.get("u1") == {"name": "v1"}
+
+
+def test_dead_listener_bypasses_the_cache_until_restarted():
+    store = MemoryFirestore()
+    cache = EntityCache("users", maxsize=100, ttl=60, negative_ttl=5, requires_listener=True)
+    cache.watch(store)
+    cache.set("u1", Document({"name": "v1"}), cache.generation)
+
+    dead = cache._listener["watch"]
+    dead.is_active = False
+    assert cache.get("u1") is MISSING
+
+    cache.watch(store)
+    assert cache._listener["watch"] is not dead
+    # Entries from before the outage are gone; invalidations were missed.
+    assert cache.get("u1") is MISSING
@@ -0,0 +1,99 @@
+"""Retries of the progress write-behind buffer after partial failures.
+
+Runs against ``MemoryFirestore``: ``python -m pytest tests`` from backend/.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.repositories import progress_repository
+from app.services.progress_buffer import ProgressWriteBuffer
+from app.services.progress_service import ProgressService
+from testing.memory_firestore import MemoryFirestore, MemoryWriteBatch
+
+USER_ID = "user-1"
+COURSE_ID = "course-1"
+MODULE_IDS = ["module-1", "module-2"]
+
+
+@pytest.fixture(autouse=True)
+def modules(store: MemoryFirestore) -> None:
+    store.load(
+        "course_modules",
+        {
+            module_id: {"course_id": COURSE_ID, "title": module_id, "order": order}
+            for order, module_id in enumerate(MODULE_IDS)
+        },
+    )
+
+
+def completion(module_id: str) -> dict:
+    return {
+        "user_id": USER_ID,
+        "course_id": COURSE_ID,
+        "module_id": module_id,
+        "times_accessed": 1,
+        "progress_percentage": 100,
+        "completed": True,
+    }
+
+
+def make_buffer(service: ProgressService) -> ProgressWriteBuffer:
+    return ProgressWriteBuffer(
+        service.apply_module_updates, repair=service.recompute_course_progress_many
+    )
+
+
+def fail_once(monkeypatch, owner, name: str, call: int = 1) -> None:
+    """Make the ``call``-th call of ``owner.name`` raise; later calls pass."""
+    original = getattr(owner, name)
+    calls = {"count": 0}
+
+    def flaky(*args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == call:
+            raise RuntimeError("unavailable")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(owner, name, flaky)
+
+
+def test_summary_failure_does_not_rewrite_increments(monkeypatch):
+    service = ProgressService()
+    buffer = make_buffer(service)
+    fail_once(monkeypatch, service, "_update_course_progress")
+
+    buffer.add(completion("module-1"))
+    assert buffer.flush() == 1
+    assert buffer.stats()["stale_courses"] == 1
+
+    buffer.flush()
+
+    module = service.get_module_progress(USER_ID, COURSE_ID, "module-1")
+    summary = service.get_course_progress(USER_ID, COURSE_ID)
+    assert module["times_accessed"] == 1
+    assert summary["completed_modules"] == 1
+    assert summary["total_modules"] == 2
+    assert buffer.stats()["stale_courses"] == 0
+    assert buffer.stats()["summaries_repaired"] == 1
+
+
+def test_failed_batch_requeues_only_unwritten_updates(monkeypatch):
+    monkeypatch.setattr(progress_repository, "BATCH_WRITE_LIMIT", 1)
+    fail_once(monkeypatch, MemoryWriteBatch, "commit", call=2)
+    service = ProgressService()
+    buffer = make_buffer(service)
+
+    for module_id in MODULE_IDS:
+        buffer.add(completion(module_id))
+    assert buffer.flush() == 1
+    assert buffer.stats()["queue_depth"] == 1
+
+    assert buffer.flush() == 1
+
+    for module_id in MODULE_IDS:
+        module = service.get_module_progress(USER_ID, COURSE_ID, module_id)
+        assert module["times_accessed"] == 1
+    summary = service.get_course_progress(USER_ID, COURSE_ID)
+    assert summary["completed_modules"] == 2
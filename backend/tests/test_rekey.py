@@ -0,0 +1,131 @@
+"""Re-keying migrations (migrations/rekey.py, migrations/enrollment_ids.py)."""
+
+from __future__ import annotations
+
+import json
+
+from app.migrations import enrollment_ids
+from app.migrations.rekey import rekey_collection
+from testing.memory_firestore import MemoryFirestore
+
+COURSE_ID = "course-1"
+
+
+def enrollments(store: MemoryFirestore) -> dict[str, dict]:
+    return {snapshot.id: snapshot.to_dict() for snapshot in store.collection("enrollments").stream()}
+
+
+def migrate(**kwargs) -> dict:
+    return enrollment_ids.migrate(log=lambda _message: None, **kwargs)
+
+
+def test_duplicates_are_folded_into_one_enrollment(store):
+    store.load(
+        "enrollments",
+        {
+            "a": {"student_id": "s1", "course_id": COURSE_ID, "progress": 40, "status": "dropped",
+                  "enrolled_at": "2024-02-01"},
+            "b": {"student_id": "s1", "course_id": COURSE_ID, "progress": 10, "status": "active",
+                  "enrolled_at": "2024-01-01"},
+            "c": {"student_id": "s2", "course_id": COURSE_ID, "progress": 5, "status": "active"},
+        },
+    )
+
+    stats = migrate()
+
+    assert enrollments(store) == {
+        f"s1__{COURSE_ID}": {"student_id": "s1", "course_id": COURSE_ID, "progress": 40, "status": "active",
+                             "enrolled_at": "2024-01-01"},
+        f"s2__{COURSE_ID}": {"student_id": "s2", "course_id": COURSE_ID, "progress": 5, "status": "active"},
+    }
+    assert stats["migrated"] == 3
+    assert stats["merged"] == 1
+
+
+def test_legacy_duplicate_of_a_migrated_enrollment_is_folded_in(store):
+    store.load(
+        "enrollments",
+        {
+            f"s1__{COURSE_ID}": {"student_id": "s1", "course_id": COURSE_ID, "progress": 10, "status": "dropped"},
+            "legacy": {"student_id": "s1", "course_id": COURSE_ID, "progress": 70, "status": "active"},
+        },
+    )
+
+    migrate()
+
+    assert enrollments(store) == {
+        f"s1__{COURSE_ID}": {"student_id": "s1", "course_id": COURSE_ID, "progress": 70, "status": "active"},
+    }
+
+
+def test_second_run_changes_nothing(store):
+    store.load(
+        "enrollments",
+        {
+            "a": {"student_id": "s1", "course_id": COURSE_ID, "progress": 40},
+            "b": {"student_id": "s1", "course_id": COURSE_ID, "progress": 10},
+        },
+    )
+    migrate()
+    before = enrollments(store)
+
+    stats = migrate()
+
+    assert enrollments(store) == before
+    assert stats["migrated"] == 0
+    assert stats["skipped"] == 1
+
+
+def test_rows_without_a_target_id_stay_put(store):
+    store.load("enrollments", {"orphan": {"student_id": "s1", "progress": 10}})
+
+    stats = migrate()
+
+    assert enrollments(store) == {"orphan": {"student_id": "s1", "progress": 10}}
+    assert stats["invalid"] == 1
+
+
+def test_run_resumes_from_its_checkpoint(store, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    store.load(
+        "enrollments",
+        {f"legacy-{index}": {"student_id": f"s{index}", "course_id": COURSE_ID} for index in range(4)},
+    )
+    # A previous run stopped after the first two legacy documents.
+    checkpoint.write_text(json.dumps({"enrollments": "legacy-1"}))
+
+    stats = migrate(batch_size=2, checkpoint_path=str(checkpoint))
+
+    assert sorted(enrollments(store)) == ["legacy-0", "legacy-1", f"s2__{COURSE_ID}", f"s3__{COURSE_ID}"]
+    # The re-keyed documents sort after the legacy ids and are scanned too.
+    assert (stats["migrated"], stats["skipped"]) == (2, 2)
+    assert json.loads(checkpoint.read_text())["enrollments"] == f"s3__{COURSE_ID}"
+
+
+def test_target_created_during_the_batch_is_folded_in_not_overwritten(store, monkeypatch):
+    store.load("enrollments", {"legacy": {"student_id": "s1", "course_id": COURSE_ID, "progress": 10}})
+    get_all = store.get_all
+    raced = []
+
+    def racing_get_all(references, *args, **kwargs):
+        snapshots = list(get_all(references, *args, **kwargs))
+        if not raced:
+            # The live create() path enrolls the student between the read and the commit.
+            raced.append(True)
+            store.collection("enrollments").document(f"s1__{COURSE_ID}").create(
+                {"student_id": "s1", "course_id": COURSE_ID, "progress": 60, "status": "active"}
+            )
+        return snapshots
+
+    monkeypatch.setattr(store, "get_all", racing_get_all)
+
+    rekey_collection(
+        "enrollments",
+        enrollment_ids._target_id,
+        enrollment_ids._merge_enrollments,
+        log=lambda _message: None,
+    )
+
+    assert enrollments(store) == {
+        f"s1__{COURSE_ID}": {"student_id": "s1", "course_id": COURSE_ID, "progress": 60, "status": "active"},
+    }
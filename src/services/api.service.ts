@@ -2,11 +2,31 @@ import { apiClient } from '../api/client';
 import { API_ENDPOINTS } from '../api/endpoints';
 import { User, Course } from './firestore.service';
 
+// Tamaño de página pedido a los listados paginados (máximo del backend: API_MAX_PAGE_SIZE)
+const PAGE_SIZE = 500;
+
 /**
  * Servicio API que reemplaza las llamadas directas a Firestore
  * Todas las operaciones ahora pasan por el backend
  */
 export class ApiService {
+  /**
+   * Recorre todas las páginas de un listado paginado siguiendo `next_cursor`.
+   * Sin `limit` el backend devuelve solo la primera página.
+   */
+  private static async getAllPages<T>(url: string, params: Record<string, string> = {}): Promise<T[]> {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+      const response = await apiClient.get(url, {
+        params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) }
+      });
+      items.push(...response.data.items);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return items;
+  }
+
   // ========== USERS ==========
   
   static async getUser(userId: string): Promise<User | null> {
@@ -23,9 +43,8 @@ export class ApiService {
 
   static async getAllUsers(role?: string): Promise<User[]> {
     try {
-      const params = role ? { role } : {};
-      const response = await apiClient.get(API_ENDPOINTS.USERS, { params });
-      return response.data;
+      const params: Record<string, string> = role ? { role } : {};
+      return await this.getAllPages<User>(API_ENDPOINTS.USERS, params);
     } catch (error) {
       throw error;
     }
@@ -52,9 +71,8 @@ export class ApiService {
   
   static async getAllCourses(teacherId?: string): Promise<Course[]> {
     try {
-      const params = teacherId ? { teacher_id: teacherId } : {};
-      const response = await apiClient.get(API_ENDPOINTS.COURSES, { params });
-      return response.data;
+      const params: Record<string, string> = teacherId ? { teacher_id: teacherId } : {};
+      return await this.getAllPages<Course>(API_ENDPOINTS.COURSES, params);
     } catch (error) {
       throw error;
     }
@@ -208,10 +226,7 @@ export class ApiService {
   
   static async getEnrollmentsByStudent(studentId: string): Promise<any[]> {
     try {
-      const response = await apiClient.get(API_ENDPOINTS.ENROLLMENTS, {
-        params: { student_id: studentId }
-      });
-      return response.data;
+      return await this.getAllPages(API_ENDPOINTS.ENROLLMENTS, { student_id: studentId });
     } catch (error) {
       throw error;
     }
@@ -219,10 +234,7 @@ export class ApiService {
 
   static async getEnrollmentsByCourse(courseId: string): Promise<any[]> {
     try {
-      const response = await apiClient.get(API_ENDPOINTS.ENROLLMENTS, {
-        params: { course_id: courseId }
-      });
-      return response.data;
+      return await this.getAllPages(API_ENDPOINTS.ENROLLMENTS, { course_id: courseId });
     } catch (error) {
       throw error;
     }
@@ -230,8 +242,7 @@ export class ApiService {
 
   static async getAllEnrollments(): Promise<any[]> {
     try {
-      const response = await apiClient.get(API_ENDPOINTS.ENROLLMENTS);
-      return response.data || [];
+      return await this.getAllPages(API_ENDPOINTS.ENROLLMENTS);
     } catch (error) {
       return [];
     }
@@ -258,8 +269,7 @@ export class ApiService {
   
   static async getAssignmentsByCourse(courseId: string): Promise<any[]> {
     try {
-      const response = await apiClient.get(API_ENDPOINTS.ASSIGNMENTS_BY_COURSE(courseId));
-      return response.data;
+      return await this.getAllPages(API_ENDPOINTS.ASSIGNMENTS, { course_id: courseId });
     } catch (error) {
       throw error;
     }
@@ -267,8 +277,7 @@ export class ApiService {
 
   static async getAllAssignments(): Promise<any[]> {
     try {
-      const response = await apiClient.get(API_ENDPOINTS.ASSIGNMENTS);
-      return response.data || [];
+      return await this.getAllPages(API_ENDPOINTS.ASSIGNMENTS);
     } catch (error) {
       return [];
     }